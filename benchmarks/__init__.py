@@ -0,0 +1,3 @@
+"""
+Benchmarks of the framework's own overhead, run against a bundled local fixture app.
+"""
@@ -0,0 +1,96 @@
+"""
+Run the framework benchmarks and compare them with a stored baseline.
+
+    python -m benchmarks run                                  # writes reports/benchmarks/<timestamp>.json
+    python -m benchmarks run --save-baseline v1               # also stores benchmarks/baselines/v1.json
+    python -m benchmarks compare benchmarks/baselines/v1.json reports/benchmarks/latest.json
+    python -m benchmarks run --compare-to benchmarks/baselines/v1.json --threshold 10
+
+compare (and run --compare-to) exits with status 1 when a benchmark is slower than the
+baseline by more than the threshold and the difference is statistically significant.
+A benchmark that raises is recorded as an error, the others still run, and the exit
+status is 1. --save-baseline refuses to store a run in which any benchmark was skipped
+or failed, so record baselines on a machine with Chrome.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from benchmarks import suite  # noqa: F401  (registers the benchmarks)
+from benchmarks.harness import BENCHMARKS, compare, print_comparison, run_benchmarks
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write(document, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=1)
+
+
+def _compare(baseline, current, args):
+    rows = compare(baseline, current, threshold=args.threshold / 100, alpha=args.alpha)
+    print_comparison(rows)
+    regressions = [row.name for row in rows if row.status == 'regression']
+    errors = [row.name for row in rows if row.status == 'error']
+    if regressions:
+        print(f"Regressions beyond {args.threshold}%: {', '.join(regressions)}")
+    if errors:
+        print(f"Benchmarks that failed to run: {', '.join(errors)}")
+    return 1 if regressions or errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Framework overhead benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run benchmarks and write a result file")
+    run.add_argument('--only', nargs='+', metavar='NAME', help=f"subset of: {', '.join(BENCHMARKS)}")
+    run.add_argument('--repeat', type=int, default=None, help="samples per benchmark (default: per benchmark)")
+    run.add_argument('--output-dir', default='reports/benchmarks')
+    run.add_argument('--save-baseline', metavar='VERSION', help="also store the result as baselines/VERSION.json")
+    run.add_argument('--compare-to', metavar='BASELINE', help="compare with a baseline file after running")
+
+    check = commands.add_parser('compare', help="compare a result file with a baseline")
+    check.add_argument('baseline')
+    check.add_argument('current')
+
+    for command in (run, check):
+        command.add_argument('--threshold', type=float, default=10, help="regression threshold in percent")
+        command.add_argument('--alpha', type=float, default=0.05, help="significance level")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return _compare(_load(args.baseline), _load(args.current), args)
+
+    # Read the baseline first: it may be the latest.json this run replaces
+    baseline = _load(args.compare_to) if args.compare_to else None
+    document = run_benchmarks(args.only, args.repeat)
+    output = os.path.join(args.output_dir, f"benchmarks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    _write(document, output)
+    shutil.copyfile(output, os.path.join(args.output_dir, 'latest.json'))
+    print(f"Results written to {output}")
+    if args.save_baseline:
+        # A baseline without a benchmark's samples would make the gate skip that benchmark for good
+        incomplete = [name for name, result in document['benchmarks'].items() if 'samples' not in result]
+        if incomplete:
+            print(f"Baseline {args.save_baseline} not stored, these benchmarks did not run: {', '.join(incomplete)}")
+            return 1
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        _write(document, path)
+        print(f"Baseline stored as {path}")
+    if baseline is not None:
+        return _compare(baseline, document, args)
+    return 1 if any('error' in result for result in document['benchmarks'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
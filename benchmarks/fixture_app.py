@@ -0,0 +1,56 @@
+"""
+Local fixture app for benchmarks: the Contact List stand-in plus static pages.
+
+/static/contactList?rows=N serves the contact table already rendered with N rows, so
+ContactListPage can be measured on large tables without creating contacts first.
+"""
+from urllib.parse import parse_qs, urlsplit
+from utils.stub_pages import render
+from utils.stub_server import ContactListHandler, ContactListStub
+
+ROW_TEMPLATE = (
+    "<tr class=\"contactTableBodyRow\"><td>First{i} Last{i}</td><td>1990-01-01</td>"
+    "<td>contact{i}@example.com</td><td>5550100{i}</td><td>{i} Main St</td>"
+    "<td>Springfield IL 62701</td><td>USA</td></tr>"
+)
+
+TABLE_TEMPLATE = """
+<button id="logout" type="button">Logout</button>
+<button id="add-contact" type="button">Add a New Contact</button>
+<table id="myTable" class="contactTable">
+    <tr>
+        <th>Name</th><th>Birthdate</th><th>Email</th><th>Phone</th>
+        <th>Address</th><th>City, State/Province, Postal Code</th><th>Country</th>
+    </tr>
+{rows}
+</table>
+"""
+
+_tables = {}
+
+
+def contact_table_page(rows):
+    """Static contact list page with the given number of rows (cached)"""
+    if rows not in _tables:
+        body = "\n".join(ROW_TEMPLATE.format(i=i) for i in range(rows))
+        _tables[rows] = render('Contact List', TABLE_TEMPLATE.format(rows=body), '')
+    return _tables[rows]
+
+
+class FixtureHandler(ContactListHandler):
+    """Stand-in handler with the static benchmark pages added"""
+
+    def _dispatch(self, method):
+        split = urlsplit(self.path)
+        if method == 'GET' and split.path == '/static/contactList':
+            rows = int(parse_qs(split.query).get('rows', ['100'])[0])
+            self.send_body(200, contact_table_page(rows), content_type='text/html; charset=utf-8')
+            return
+        super()._dispatch(method)
+
+
+class FixtureApp(ContactListStub):
+    """Runs the fixture app on a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__(host, port, handler=FixtureHandler)
@@ -0,0 +1,242 @@
+"""
+Benchmark registry, runner, result files and the regression comparison.
+"""
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+from config.webdriver_config import WebDriverConfig, get_driver_profile
+from benchmarks.fixture_app import FixtureApp
+
+# Bump when the result file layout changes; compare refuses files of another version
+SCHEMA_VERSION = 1
+
+Benchmark = namedtuple('Benchmark', ['name', 'func', 'repeat', 'warmup', 'description'])
+Comparison = namedtuple('Comparison', ['name', 'baseline_ms', 'current_ms', 'change', 'p_value', 'status'])
+
+BENCHMARKS = {}
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark that cannot run in this environment (e.g. no Chrome)"""
+
+
+def benchmark(name, repeat=20, warmup=2):
+    """Register a benchmark
+
+    The decorated function receives a BenchmarkContext and yields the callable to
+    time, or a (callable, after) pair where after(result) runs untimed after every
+    sample. Code after the yield is cleanup.
+    """
+    def register(func):
+        BENCHMARKS[name] = Benchmark(name, func, repeat, warmup, (func.__doc__ or '').strip())
+        return func
+    return register
+
+
+class BenchmarkContext:
+    """Shared resources: the fixture app and one browser, both started on first use"""
+
+    def __init__(self):
+        self._app = None
+        self._driver = None
+        self._driver_error = None
+
+    @property
+    def app(self):
+        if self._app is None:
+            self._app = FixtureApp().start()
+            # Page objects build their URLs from BASE_URL
+            os.environ['BASE_URL'] = self._app.url
+        return self._app
+
+    def driver(self):
+        """Return the shared browser, or skip the benchmark if Chrome cannot start"""
+        if self._driver is None and self._driver_error is None:
+            self.app
+            try:
+                self._driver = WebDriverConfig.get_chrome_driver()
+            except WebDriverException as e:
+                self._driver_error = (e.msg or str(e)).splitlines()[0]
+        if self._driver_error is not None:
+            raise SkipBenchmark(f"browser unavailable: {self._driver_error}")
+        return self._driver
+
+    def close(self):
+        if self._driver is not None:
+            self._driver.quit()
+        if self._app is not None:
+            self._app.stop()
+
+
+def summarize(samples):
+    return {
+        'n': len(samples),
+        'median': round(statistics.median(samples), 4),
+        'mean': round(statistics.fmean(samples), 4),
+        'stdev': round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        'min': round(min(samples), 4),
+        'max': round(max(samples), 4)
+    }
+
+
+def run_benchmark(bench, context, repeat=None):
+    """
+    Time one benchmark
+    :return: result dict with the samples in milliseconds, or a skip record
+    """
+    generator = bench.func(context)
+    try:
+        target = next(generator)
+    except SkipBenchmark as e:
+        return {'skipped': str(e)}
+    run, after = target if isinstance(target, tuple) else (target, None)
+
+    samples = []
+    try:
+        for i in range(bench.warmup + (repeat or bench.repeat)):
+            start = time.perf_counter()
+            result = run()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if after is not None:
+                after(result)
+            if i >= bench.warmup:
+                samples.append(elapsed_ms)
+    finally:
+        generator.close()
+    return {'unit': 'ms', 'samples': [round(sample, 4) for sample in samples], **summarize(samples)}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names=None, repeat=None, log=print):
+    """
+    Run the registered benchmarks (all, or the given names)
+    :return: result document ready to be written as JSON
+    """
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    context = BenchmarkContext()
+    results = {}
+    try:
+        for name, bench in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            try:
+                results[name] = run_benchmark(bench, context, repeat)
+            except Exception as e:
+                # A broken benchmark is recorded as such; the others still run
+                results[name] = {'error': f"{type(e).__name__}: {e}"}
+            if 'error' in results[name]:
+                log(f"{name:>28}: error ({results[name]['error']})")
+            elif 'skipped' in results[name]:
+                log(f"{name:>28}: skipped ({results[name]['skipped']})")
+            else:
+                log(f"{name:>28}: median {results[name]['median']:.3f} ms over {results[name]['n']} runs")
+    finally:
+        context.close()
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'driver_profile': get_driver_profile().name,
+        'benchmarks': results
+    }
+
+
+def mann_whitney_p(a, b):
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation with tie correction)"""
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    values = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(values)
+    tie_term = 0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+def compare(baseline, current, threshold=0.10, alpha=0.05):
+    """
+    Compare two result documents benchmark by benchmark
+    :param threshold: relative median slowdown that counts as a regression (0.10 = 10%)
+    :param alpha: significance level of the Mann-Whitney U test
+    :return: list of Comparison; status is regression, improvement, ok, new, missing, skipped or error
+    """
+    for document in (baseline, current):
+        if document.get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(
+                f"Result file has schema version {document.get('schema_version')}, expected {SCHEMA_VERSION}"
+            )
+
+    rows = []
+    names = list(baseline['benchmarks']) + [name for name in current['benchmarks'] if name not in baseline['benchmarks']]
+    for name in names:
+        before = baseline['benchmarks'].get(name)
+        after = current['benchmarks'].get(name)
+        if before is None:
+            rows.append(Comparison(name, None, after.get('median'), None, None, 'new'))
+            continue
+        if after is None:
+            rows.append(Comparison(name, before.get('median'), None, None, None, 'missing'))
+            continue
+        if 'error' in after:
+            rows.append(Comparison(name, before.get('median'), None, None, None, 'error'))
+            continue
+        if 'skipped' in before or 'skipped' in after or 'error' in before:
+            rows.append(Comparison(name, before.get('median'), after.get('median'), None, None, 'skipped'))
+            continue
+
+        change = (after['median'] - before['median']) / before['median'] if before['median'] else 0.0
+        p_value = mann_whitney_p(before['samples'], after['samples'])
+        status = 'ok'
+        if p_value < alpha and change > threshold:
+            status = 'regression'
+        elif p_value < alpha and change < -threshold:
+            status = 'improvement'
+        rows.append(Comparison(name, before['median'], after['median'], round(change, 4), round(p_value, 4), status))
+    return rows
+
+
+def print_comparison(rows):
+    for row in rows:
+        if row.change is None:
+            print(f"{row.name:>28}: {row.status}")
+            continue
+        print(
+            f"{row.name:>28}: {row.baseline_ms:.3f} -> {row.current_ms:.3f} ms "
+            f"({row.change:+.1%}, p={row.p_value:.4f}) {row.status.upper() if row.status == 'regression' else row.status}"
+        )
@@ -0,0 +1,136 @@
+"""
+The framework overhead benchmarks. Each measures one cost a test pays.
+"""
+import json
+import logging
+from types import SimpleNamespace
+import requests
+from config.api_config import APIClient
+from config.webdriver_config import WebDriverConfig, get_driver_profile
+from pages.add_user_page import AddUserPage
+from pages.contact_list_page import ContactListPage
+from utils.user_database import UserDatabase, generate_seed_users
+from benchmarks.harness import benchmark
+
+USER = {
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "email": "bench.mark@example.com",
+    "password": "Bench123!"
+}
+
+
+@benchmark('driver_creation', repeat=5, warmup=0)
+def driver_creation(ctx):
+    """WebDriverConfig.get_chrome_driver with the active driver profile (quit is not timed)"""
+    ctx.driver()
+    profile = get_driver_profile()
+    yield lambda: WebDriverConfig.get_chrome_driver(profile), lambda driver: driver.quit()
+
+
+@benchmark('db_session_setup', repeat=50, warmup=5)
+def db_session_setup(ctx):
+    """user_database fixture: schema and seed rows created, then dropped"""
+    rows = generate_seed_users(5)
+
+    def run():
+        database = UserDatabase(mode='memory', name='bench_session').create(rows)
+        database.close()
+
+    yield run
+
+
+@benchmark('db_connection', repeat=500, warmup=20)
+def db_connection(ctx):
+    """db_connection fixture: savepoint connection opened, queried and rolled back"""
+    database = UserDatabase(mode='memory', name='bench_connection').create(generate_seed_users(5))
+
+    def run():
+        conn = database.open_savepoint()
+        conn.execute('SELECT first_name, last_name, email, password FROM test_users LIMIT 1').fetchone()
+        database.rollback(conn)
+
+    yield run
+    database.close()
+
+
+@benchmark('add_user_fill_read', repeat=30, warmup=3)
+def add_user_fill_read(ctx):
+    """AddUserPage.fill_form followed by read_form on the fixture signup page"""
+    page = AddUserPage(ctx.driver())
+    page.navigate_to()
+    page.wait_for_element(AddUserPage.FIRST_NAME_INPUT)
+
+    def run():
+        page.fill_form(USER)
+        return page.read_form()
+
+    yield run
+
+
+def contact_count(rows):
+    def bench(ctx):
+        driver = ctx.driver()
+        driver.get(f"{ctx.app.url}/static/contactList?rows={rows}")
+        page = ContactListPage(driver)
+        page.wait_for_element(ContactListPage.CONTACT_LIST_TABLE)
+        yield page.get_contact_count
+    bench.__doc__ = f"ContactListPage.get_contact_count on a table of {rows} rows"
+    return bench
+
+
+benchmark('contact_count_100', repeat=20, warmup=2)(contact_count(100))
+benchmark('contact_count_5000', repeat=10, warmup=1)(contact_count(5000))
+
+
+@benchmark('report_hook', repeat=300, warmup=20)
+def report_hook(ctx):
+    """pytest_runtest_makereport for setup, call and teardown of an API test with 20 log lines per phase"""
+    from tests import conftest
+
+    logger = logging.getLogger('benchmark_report_hook')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(conftest.log_capture)
+
+    response = requests.Response()
+    response.status_code = 400
+    response.url = f"{ctx.app.url}/users"
+    response._content = json.dumps({"message": "User validation failed", "errors": {"email": {}}}).encode()
+    response.request = requests.Request('POST', response.url, headers={'Content-Type': 'application/json'}).prepare()
+
+    # pytest-html is active, as in a normal run, so the hook renders its HTML extras
+    config = SimpleNamespace(pluginmanager=SimpleNamespace(hasplugin=lambda name: name == "html"))
+    nodeid = "tests/test_api.py::TestAPI::test_report_hook"
+
+    def run():
+        item = SimpleNamespace(api_response=response, config=config, nodeid=nodeid, funcargs={})
+        for when in ('setup', 'call', 'teardown'):
+            for i in range(20):
+                logger.info(f"{when} step {i}")
+            report = SimpleNamespace(
+                when=when, nodeid=nodeid, outcome='passed', passed=True, failed=False, skipped=False,
+                extras=[], user_properties=[]
+            )
+            hook = conftest.pytest_runtest_makereport(item, SimpleNamespace(when=when))
+            next(hook)
+            try:
+                hook.send(SimpleNamespace(get_result=lambda: report))
+            except StopIteration:
+                pass
+
+    yield run
+    logger.removeHandler(conftest.log_capture)
+
+
+@benchmark('api_client_latency', repeat=300, warmup=20)
+def api_client_latency(ctx):
+    """APIClient.post /users/login round trip against the fixture app"""
+    client = APIClient(base_url=ctx.app.url, retries=0)
+    payload = {"firstName": USER["first_name"], "lastName": USER["last_name"],
+               "email": USER["email"], "password": USER["password"]}
+    client.post('/users', json=payload)
+    credentials = {"email": USER["email"], "password": USER["password"]}
+
+    yield lambda: client.post('/users/login', json=credentials)
+    client.close()
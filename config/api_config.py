@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger('test_logger')
+
+
+class APIConfig:
+    """API settings read from .env"""
+
+    @staticmethod
+    def get_base_url():
+        """
+        Return the base URL of the Contact List app
+        :return: base URL without trailing slash
+        """
+        return os.getenv('BASE_URL', '').rstrip('/')
+
+    @staticmethod
+    def get_retry_count():
+        """
+        Return how many times a failed request is retried
+        :return: retry count
+        """
+        return int(os.getenv('RETRY_COUNT', 2))
+
+    @staticmethod
+    def get_default_headers():
+        """
+        Return the headers sent with every API request, matching what the browser sends
+        :return: headers dict
+        """
+        base_url = APIConfig.get_base_url()
+        return {
+            'Accept': '*/*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Content-Type': 'application/json',
+            'Origin': base_url,
+            'Referer': f"{base_url}/addUser",
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36'
+        }
+
+
+class APIClient:
+    """API client on one shared requests.Session with a keep-alive pool and retries
+
+    Requests are retried with exponential backoff on connection errors. Idempotent
+    methods are also retried on read timeouts and 5xx responses; POST and PATCH are
+    not, because the first attempt may already have taken effect (a replayed signup
+    would fail with "Email address is already in use"). A failed connect never
+    reached the server, so it is retried for every method.
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, base_url=None, headers=None, retries=None, pool_size=10, backoff_factor=0.3, timeout=30,
+                 trust_env=True):
+        """
+        :param base_url: prefix for relative paths (default: BASE_URL)
+        :param headers: default headers (default: APIConfig.get_default_headers())
+        :param retries: retry count (default: RETRY_COUNT)
+        :param pool_size: keep-alive connections kept per host
+        :param timeout: default request timeout in seconds
+        :param trust_env: False resolves proxies and the CA bundle from the environment once, here, instead of
+            on every request; needed when requests run in threads while pytest rewrites os.environ
+        """
+        self.base_url = (base_url or APIConfig.get_base_url()).rstrip('/')
+        self.timeout = timeout
+        self.timings = deque(maxlen=1000)
+
+        retry = Retry(
+            total=APIConfig.get_retry_count() if retries is None else retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            # Read errors and status retries only apply to these; connect errors to every method
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.mount(self.adapter)
+        self.session.headers.update(headers or APIConfig.get_default_headers())
+        if not trust_env:
+            self.session.trust_env = False
+            self.session.proxies.update(requests.utils.get_environ_proxies(self.base_url))
+            self.session.verify = os.getenv('REQUESTS_CA_BUNDLE') or os.getenv('CURL_CA_BUNDLE') or True
+
+    def mount(self, adapter):
+        """Route http and https requests through a transport adapter"""
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def url(self, path):
+        """Resolve a path such as '/users' against the base URL; absolute URLs are kept as-is"""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}{path}"
+
+    def request(self, method, path, **kwargs):
+        """
+        Send a request and record its wall time
+        :return: requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        response = self.session.request(method, self.url(path), **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.timings.append({
+            'method': method,
+            'url': response.url,
+            'status': response.status_code,
+            'elapsed_ms': round(elapsed_ms, 2)
+        })
+        logger.debug(f"{method} {response.url} -> {response.status_code} in {elapsed_ms:.0f} ms")
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_api_client():
+    """Return the process-wide API client (one per xdist worker)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = APIClient()
+        return _client
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+from selenium.common.exceptions import WebDriverException
+from config.webdriver_config import WebDriverConfig
+from utils.command_timing import time_driver_start
+from utils.failure_bundle import record_command_history
+from utils.network_capture import discard_network_log
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger('test_logger')
+
+
+class DriverPool:
+    """Pool of warm WebDriver instances that are reset between tests
+
+    Every pytest-xdist worker runs in its own process, so a session-scoped
+    pool is also a per-worker pool: drivers are never shared across workers.
+    """
+
+    def __init__(self, factory=None, max_size=None, max_uses=None):
+        """
+        Initialize the pool
+        :param factory: callable returning a new WebDriver instance
+        :param max_size: number of idle drivers kept warm (0 disables pooling)
+        :param max_uses: number of tests a driver serves before it is recycled
+        """
+        self.factory = factory or WebDriverConfig.get_chrome_driver
+        self.max_size = max_size if max_size is not None else int(os.getenv('DRIVER_POOL_SIZE', 1))
+        self.max_uses = max_uses if max_uses is not None else int(os.getenv('DRIVER_MAX_USES', 50))
+        self.worker_id = os.getenv('PYTEST_XDIST_WORKER', 'master')
+        self._idle = []
+        self._in_use = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Hand out a healthy, already-running driver, creating one if needed
+        :return: WebDriver instance
+        """
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = self._create()
+                break
+            if self.is_healthy(driver):
+                break
+            logger.info(f"[{self.worker_id}] Recycling unhealthy driver")
+            self._discard(driver)
+
+        with self._lock:
+            self._in_use.append(driver)
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver):
+        """Reset a driver and return it to the pool, or quit it if it cannot be reused"""
+        with self._lock:
+            if driver in self._in_use:
+                self._in_use.remove(driver)
+            worn_out = self._uses.get(id(driver), 0) >= self.max_uses
+            pool_full = len(self._idle) >= self.max_size
+
+        if worn_out or pool_full or not self.reset(driver):
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def reset(self, driver):
+        """
+        Bring a driver back to a blank state: single window, no cookies, no storage, about:blank
+        :return: True if the driver was reset and can be reused
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                # Pages such as about:blank or data: URLs have no storage to clear
+                pass
+            driver.delete_all_cookies()
+            try:
+                # delete_all_cookies only covers the current domain
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except (AttributeError, WebDriverException):
+                pass
+
+            driver.get('about:blank')
+            # The next test must not see this test's requests
+            discard_network_log(driver)
+            return True
+        except WebDriverException as e:
+            logger.warning(f"[{self.worker_id}] Driver reset failed: {e.msg}")
+            return False
+
+    def is_healthy(self, driver):
+        """Check that the browser behind a driver still responds and has not leaked windows"""
+        try:
+            return len(driver.window_handles) == 1
+        except WebDriverException:
+            return False
+
+    def shutdown(self):
+        """Quit every driver owned by the pool, including ones that were never released"""
+        with self._lock:
+            drivers = self._idle + self._in_use
+            self._idle = []
+            self._in_use = []
+        for driver in drivers:
+            self._discard(driver)
+
+    def _create(self):
+        """Start a new browser"""
+        logger.info(f"[{self.worker_id}] Starting new WebDriver instance")
+        return record_command_history(time_driver_start(self.factory))
+
+    def _discard(self, driver):
+        """Quit a driver and forget about it"""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
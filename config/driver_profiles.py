@@ -0,0 +1,61 @@
+"""
+Browser profiles, kept free of Selenium imports so that runs which never start a
+browser (the API fast lane) can read them without loading the driver stack.
+
+Profiles have no implicit wait: every lookup goes through the explicit waits of
+pages/waits.py, which keep the implicit wait at 0 so a failed lookup never stalls.
+"""
+from collections import namedtuple
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DriverProfile = namedtuple('DriverProfile', [
+    'name',
+    'headless',
+    'page_load_strategy',  # normal, eager or none
+    'block_resources',
+    'disable_gpu',
+    'disable_extensions',
+    'explicit_wait'
+])
+
+PROFILES = {
+    # Fastest feedback: no window, DOM-ready navigation, nothing decorative downloaded
+    'fast-ci': DriverProfile('fast-ci', headless=True, page_load_strategy='eager', block_resources=True,
+                             disable_gpu=True, disable_extensions=True, explicit_wait=10),
+    # Visible browser and long waits for stepping through a test
+    'debug': DriverProfile('debug', headless=False, page_load_strategy='normal', block_resources=False,
+                           disable_gpu=False, disable_extensions=False, explicit_wait=60),
+    # Full page loads with every resource, as a user would see the app
+    'realistic': DriverProfile('realistic', headless=True, page_load_strategy='normal', block_resources=False,
+                               disable_gpu=False, disable_extensions=False, explicit_wait=20),
+}
+
+
+def _env_profile():
+    """The default profile, built from HEADLESS and EXPLICIT_WAIT"""
+    return DriverProfile(
+        'default',
+        headless=os.getenv('HEADLESS', 'False').lower() == 'true',
+        page_load_strategy='normal',
+        block_resources=False,
+        disable_gpu=False,
+        disable_extensions=False,
+        explicit_wait=int(os.getenv('EXPLICIT_WAIT', 10))
+    )
+
+
+def get_driver_profile(name=None):
+    """
+    Return a driver profile by name
+    :param name: profile name (default: DRIVER_PROFILE, or the settings from .env)
+    :return: DriverProfile
+    """
+    name = name or os.getenv('DRIVER_PROFILE', 'default')
+    if name == 'default':
+        return _env_profile()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown driver profile: {name} (expected default or one of {', '.join(PROFILES)})")
+    return PROFILES[name]
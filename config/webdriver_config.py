@@ -1,26 +1,69 @@
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+from config.driver_profiles import get_driver_profile
+from utils.network_capture import network_capture_enabled
+import logging
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger('test_logger')
+
+# URL patterns blocked through CDP by profiles that skip images, fonts and analytics
+BLOCKED_RESOURCES = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*hotjar.com*'
+]
+
+
 class WebDriverConfig:
     @staticmethod
-    def get_chrome_driver():
+    def get_chrome_options(profile=None):
         """
-        Initialize and return a Chrome WebDriver instance
-        :return: Chrome WebDriver instance
+        Build Chrome options for a driver profile
+        :param profile: DriverProfile (default: the active profile)
+        :return: Options instance
         """
+        profile = profile or get_driver_profile()
         chrome_options = Options()
-        # chrome_options.add_argument('--headless=new')  # Commented out to see the browser
-        
+        if profile.headless:
+            chrome_options.add_argument('--headless=new')
+        if profile.disable_gpu:
+            chrome_options.add_argument('--disable-gpu')
+        if profile.disable_extensions:
+            chrome_options.add_argument('--disable-extensions')
+        chrome_options.page_load_strategy = profile.page_load_strategy
+        # Console messages are collected into failure bundles
+        logging_prefs = {'browser': 'ALL'}
+        if network_capture_enabled():
+            # Network events only, read by utils.network_capture
+            logging_prefs['performance'] = 'ALL'
+            chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        chrome_options.set_capability('goog:loggingPrefs', logging_prefs)
+
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--window-size=1920,1080')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(20)  # Increased wait time to 20 seconds
-        
-        return driver 
\ No newline at end of file
+        return chrome_options
+
+    @staticmethod
+    def get_chrome_driver(profile=None):
+        """
+        Initialize and return a Chrome WebDriver instance
+        :param profile: DriverProfile (default: the active profile)
+        :return: Chrome WebDriver instance
+        """
+        profile = profile or get_driver_profile()
+        driver = webdriver.Chrome(options=WebDriverConfig.get_chrome_options(profile))
+
+        if profile.block_resources:
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCES})
+            except WebDriverException as e:
+                logger.warning(f"Could not block resources for profile {profile.name}: {e.msg}")
+
+        return driver
@@ -15,6 +15,16 @@ class AddUserPage(BasePage):
     CANCEL_BUTTON = (By.ID, "cancel")
     ERROR_MESSAGE = (By.ID, "error")
 
+    # Where the app goes after a successful signup
+    SUCCESS_URL = "/contactList"
+
+    FORM_FIELDS = {
+        "first_name": FIRST_NAME_INPUT,
+        "last_name": LAST_NAME_INPUT,
+        "email": EMAIL_INPUT,
+        "password": PASSWORD_INPUT
+    }
+
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{self.base_url}/addUser"
@@ -26,7 +36,7 @@ class AddUserPage(BasePage):
 
     def navigate_to(self):
         """Navigate to the Add User page"""
-        self.driver.get("https://thinking-tester-contact-list.herokuapp.com/addUser")
+        self.driver.get(self.url)
 
     def fill_first_name(self, first_name):
         """Fill in the first name field"""
@@ -44,10 +54,26 @@ class AddUserPage(BasePage):
         """Fill in the password field"""
         self.input_text(self.PASSWORD_INPUT, password)
 
-    def submit_form(self):
-        """Submit the add user form"""
+    def submit_form(self, timeout=None):
+        """
+        Submit the add user form and wait for the app's answer
+        :return: 'success' when the app opens the contact list, 'error' when it shows an error message
+        """
         self.click(self.SUBMIT_BUTTON)
-        return self
+        return self.wait_for_first({
+            'success': ('url_contains', None, self.SUCCESS_URL),
+            # The error span is in the page from the start, empty until the server answers
+            'error': ('has_text', self.ERROR_MESSAGE)
+        }, timeout).name
+
+    def submit_form_and_capture(self, timeout=None):
+        """
+        Submit the add user form and return its outcome and the POST /users request the browser sent
+        :return: ('success' or 'error', NetworkExchange)
+        """
+        self.network.mark()
+        outcome = self.submit_form(timeout)
+        return outcome, self.wait_for_request('POST', '/users', timeout=timeout)
 
     def click_cancel(self):
         """Click the cancel button"""
@@ -64,10 +90,8 @@ class AddUserPage(BasePage):
 
     def clear_form(self):
         """Clear all form fields"""
-        self.driver.find_element(*self.FIRST_NAME_INPUT).clear()
-        self.driver.find_element(*self.LAST_NAME_INPUT).clear()
-        self.driver.find_element(*self.EMAIL_INPUT).clear()
-        self.driver.find_element(*self.PASSWORD_INPUT).clear()
+        for locator in self.FORM_FIELDS.values():
+            self.clear_text(locator)
 
     def get_error_message(self):
         """Get error message if present"""
@@ -79,12 +103,12 @@ class AddUserPage(BasePage):
 
     def get_first_name(self):
         """Get the value of the first name field"""
-        return self.driver.find_element(*self.FIRST_NAME_INPUT).get_attribute('value')
+        return self.get_element_value(self.FIRST_NAME_INPUT)
     
     def get_last_name(self):
         """Get the value of the last name field"""
-        return self.driver.find_element(*self.LAST_NAME_INPUT).get_attribute('value')
+        return self.get_element_value(self.LAST_NAME_INPUT)
     
     def get_email(self):
         """Get the value of the email field"""
-        return self.driver.find_element(*self.EMAIL_INPUT).get_attribute('value') 
\ No newline at end of file
+        return self.get_element_value(self.EMAIL_INPUT) 
\ No newline at end of file
@@ -1,75 +1,166 @@
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException,
+    ElementNotInteractableException, ElementClickInterceptedException
+)
+from pages.waits import DomWaiter, FIND_ELEMENT_JS, SUPPORTED_LOCATORS
+from pages.element_cache import ElementCache, CONDITION_RANK
+from config.webdriver_config import get_driver_profile
+from utils.command_timing import timed_step
+from utils.network_capture import get_network_capture
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Sets (when a value is given) and reads back a batch of form fields in one round trip.
+# The native value setter is used so frameworks that track input values notice the change.
+FORM_SCRIPT = FIND_ELEMENT_JS + """
+var fields = arguments[0];
+var values = {}, missing = [];
+for (var i = 0; i < fields.length; i++) {
+    var name = fields[i][0], el = findElement(fields[i][1], fields[i][2]), value = fields[i][3];
+    if (!el) {
+        missing.push(name);
+        continue;
+    }
+    if (value !== null) {
+        var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+            : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    values[name] = el.value;
+}
+return {values: values, missing: missing};
+"""
+
 class BasePage:
     """Base class for all page objects"""
+
+    # Form field name -> locator, used by fill_form and read_form
+    FORM_FIELDS = {}
+
+    # Raised when a cached reference no longer points at a usable element
+    CACHE_MISS_ERRORS = (
+        StaleElementReferenceException, ElementNotInteractableException, ElementClickInterceptedException
+    )
     
     def __init__(self, driver):
         """Initialize the base page"""
         self.driver = driver
         self.base_url = os.getenv('BASE_URL')
-        self.wait = WebDriverWait(driver, 10)
+        # Default timeout of every wait, from the active driver profile
+        self.timeout = get_driver_profile().explicit_wait
+        self.wait = WebDriverWait(driver, self.timeout)
+        self.waiter = DomWaiter(driver)
+        self.element_cache = ElementCache(driver)
+        self.network = get_network_capture(driver)
 
-    def wait_for_element(self, locator, timeout=10):
+    @timed_step
+    def wait_for_element(self, locator, timeout=None):
         """Wait for an element to be present"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
+            element = self.waiter.until('presence', locator, timeout=timeout)
         except TimeoutException:
             raise TimeoutException(f"Element {locator} not found after waiting {timeout} seconds")
+        self.element_cache.put(locator, 'presence', element)
+        return element
 
-    def wait_for_element_clickable(self, locator, timeout=10):
+    @timed_step
+    def wait_for_element_clickable(self, locator, timeout=None):
         """Wait for an element to be clickable"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
+            element = self.waiter.until('clickable', locator, timeout=timeout)
         except TimeoutException:
             raise TimeoutException(f"Element {locator} not clickable after waiting {timeout} seconds")
+        self.element_cache.put(locator, 'clickable', element)
+        return element
 
-    def wait_for_element_visible(self, locator, timeout=10):
+    @timed_step
+    def wait_for_element_visible(self, locator, timeout=None):
         """Wait for an element to be visible"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            element = self.waiter.until('visible', locator, timeout=timeout)
         except TimeoutException:
             raise TimeoutException(f"Element {locator} not visible after waiting {timeout} seconds")
+        self.element_cache.put(locator, 'visible', element)
+        return element
 
-    def wait_for_element_invisible(self, locator, timeout=10):
+    @timed_step
+    def wait_for_element_invisible(self, locator, timeout=None):
         """Wait for an element to be invisible"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located(locator)
-            )
+            return self.waiter.until('invisible', locator, timeout=timeout)
         except TimeoutException:
             raise TimeoutException(f"Element {locator} still visible after waiting {timeout} seconds")
 
-    def wait_for_url_contains(self, text, timeout=10):
-        """Wait for URL to contain specific text"""
+    @timed_step
+    def wait_for_url_contains(self, partial_url: str, timeout: int = None) -> bool:
+        """Wait for URL to contain specific text; False if it does not within the timeout"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.url_contains(text)
+            return self.waiter.until(
+                'url_contains', expected=partial_url, timeout=self.timeout if timeout is None else timeout
             )
         except TimeoutException:
-            raise TimeoutException(f"URL does not contain '{text}' after waiting {timeout} seconds")
+            return False
 
-    def wait_for_url_to_be(self, url, timeout=10):
+    @timed_step
+    def wait_for_url_to_be(self, url, timeout=None):
         """Wait for URL to be exactly as specified"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.url_to_be(url)
-            )
+            return self.waiter.until('url_to_be', expected=url, timeout=timeout)
         except TimeoutException:
             raise TimeoutException(f"URL is not '{url}' after waiting {timeout} seconds")
 
+    @timed_step
+    def wait_for_first(self, outcomes, timeout=None):
+        """
+        Wait for whichever of several outcomes happens first, checking them all in one wait
+        :param outcomes: outcome name -> (condition, locator) or (condition, locator, expected), e.g.
+            {'error': ('has_text', ERROR_MESSAGE), 'success': ('url_contains', None, '/contactList')}
+        :return: Outcome(name, value) of the outcome that happened
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            outcome = self.waiter.until_any(outcomes, timeout=timeout)
+        except TimeoutException:
+            raise TimeoutException(f"None of {list(outcomes)} happened after waiting {timeout} seconds")
+        condition, locator = outcomes[outcome.name][:2]
+        if condition in CONDITION_RANK:
+            self.element_cache.put(locator, condition, outcome.value)
+        return outcome
+
+    @timed_step
+    def wait_for_all(self, conditions, timeout=None):
+        """
+        Wait until several conditions hold at the same time, checking them all in one wait
+        :param conditions: list of (condition, locator) or (condition, locator, expected)
+        :return: list of the conditions' values
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return self.waiter.until_all(conditions, timeout=timeout)
+        except TimeoutException:
+            raise TimeoutException(f"Conditions {conditions} not met together after waiting {timeout} seconds")
+
+    @timed_step
+    def wait_for_request(self, method, path, timeout=None):
+        """
+        Wait for a request the browser sent since the last self.network.mark()
+        :param path: URL path (/users) or full URL
+        :return: NetworkExchange with URL, method, bodies, status and duration
+        """
+        return self.network.wait_for(method, path, timeout=self.timeout if timeout is None else timeout)
+
     def is_element_present(self, locator):
         """Check if an element is present on the page"""
         try:
@@ -78,21 +169,57 @@ class BasePage:
         except NoSuchElementException:
             return False
 
+    def _resolve(self, locator, condition):
+        """Wait for an element under a condition (presence, visible or clickable); the result is cached"""
+        if condition == 'presence':
+            return self.wait_for_element(locator)
+        if condition == 'visible':
+            return self.wait_for_element_visible(locator)
+        return self.wait_for_element_clickable(locator)
+
+    def with_element(self, locator, action, condition='visible'):
+        """
+        Run action(element), reusing the cached element for the locator when there is one
+        :param condition: what the element must satisfy when it has to be looked up
+        :return: the action's result
+        """
+        element = self.element_cache.get(locator, condition)
+        if element is None:
+            return action(self._resolve(locator, condition))
+        try:
+            return action(element)
+        except self.CACHE_MISS_ERRORS:
+            # The page changed under the cached reference: look the element up once more
+            self.element_cache.discard(locator)
+            return action(self._resolve(locator, condition))
+
+    @timed_step
     def get_element_text(self, locator):
         """Get text of an element"""
-        element = self.wait_for_element_visible(locator)
-        return element.text
+        return self.with_element(locator, lambda element: element.text)
 
+    @timed_step
+    def get_element_value(self, locator):
+        """Get the value of an input element"""
+        return self.with_element(locator, lambda element: element.get_attribute('value'), condition='presence')
+
+    @timed_step
+    def clear_text(self, locator):
+        """Clear an input element"""
+        self.with_element(locator, lambda element: element.clear())
+
+    @timed_step
     def input_text(self, locator, text):
         """Input text into an element"""
-        element = self.wait_for_element_visible(locator)
-        element.clear()
-        element.send_keys(text)
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+        self.with_element(locator, type_text)
 
+    @timed_step
     def click(self, locator):
         """Click an element"""
-        element = self.wait_for_element_clickable(locator)
-        element.click()
+        self.with_element(locator, lambda element: element.click(), condition='clickable')
 
     def get_current_url(self):
         """Get the current URL"""
@@ -104,21 +231,62 @@ class BasePage:
 
     def find_elements(self, locator: tuple):
         """Find elements with explicit wait"""
-        return self.wait_for_element(locator)
+        self.wait_for_element(locator)
+        return self.driver.find_elements(*locator)
 
     def is_element_visible(self, locator: tuple, timeout: int = None) -> bool:
         """Check if element is visible"""
         try:
-            wait = WebDriverWait(self.driver, timeout or 10)
-            wait.until(EC.visibility_of_element_located(locator))
+            self.waiter.until('visible', locator, timeout=self.timeout if timeout is None else timeout)
             return True
         except TimeoutException:
-            return False
+            return False 
 
-    def wait_for_url_contains(self, partial_url: str, timeout: int = None) -> bool:
-        """Wait for URL to contain specific text"""
-        try:
-            wait = WebDriverWait(self.driver, timeout or 10)
-            return wait.until(EC.url_contains(partial_url))
-        except TimeoutException:
-            return False 
\ No newline at end of file
+    @timed_step
+    def fill_form(self, data: dict, realistic_typing: bool = None) -> dict:
+        """
+        Fill form fields with a single execute_script call that sets the values and fires input/change events
+        :param data: field name (see FORM_FIELDS) -> value
+        :param realistic_typing: type every field with clear() and send_keys() instead (default: TYPING_MODE=realistic)
+        :return: values of all FORM_FIELDS after filling
+        """
+        unknown = set(data) - set(self.FORM_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown form fields for {type(self).__name__}: {sorted(unknown)}")
+        if realistic_typing is None:
+            realistic_typing = os.getenv('TYPING_MODE', 'fast').lower() == 'realistic'
+
+        if realistic_typing or not self._form_supports_script():
+            for name, value in data.items():
+                self.input_text(self.FORM_FIELDS[name], value)
+            return self.read_form()
+        return self._run_form_script(data)
+
+    @timed_step
+    def read_form(self) -> dict:
+        """Read the values of all FORM_FIELDS in one round trip"""
+        if not self._form_supports_script():
+            return {
+                name: self.wait_for_element(locator).get_attribute('value')
+                for name, locator in self.FORM_FIELDS.items()
+            }
+        return self._run_form_script({})
+
+    def _form_supports_script(self):
+        """Check that every form locator can be resolved by the in-browser script"""
+        return all(locator[0] in SUPPORTED_LOCATORS for locator in self.FORM_FIELDS.values())
+
+    def _run_form_script(self, data):
+        """Run FORM_SCRIPT, waiting for fields that are not in the DOM yet"""
+        fields = [
+            [name, by, value, None if data.get(name) is None else str(data[name])]
+            for name, (by, value) in self.FORM_FIELDS.items()
+        ]
+        result = self.driver.execute_script(FORM_SCRIPT, fields)
+        if result['missing']:
+            for name in result['missing']:
+                self.wait_for_element(self.FORM_FIELDS[name])
+            result = self.driver.execute_script(FORM_SCRIPT, fields)
+        if result['missing']:
+            raise NoSuchElementException(f"Form fields not found: {result['missing']}")
+        return result['values']
@@ -10,13 +10,24 @@ class ContactListPage(BasePage):
     CONTACT_LIST_TABLE = (By.ID, "myTable")
     ADD_CONTACT_BUTTON = (By.ID, "add-contact")
     LOGOUT_BUTTON = (By.ID, "logout")
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.url = f"{self.base_url}/contactList"
+
+    def open(self):
+        """Open Contact List page directly (the browser must already hold a login token)"""
+        self.driver.get(self.url)
+        return self
     
-    def is_displayed(self, timeout=10):
+    def is_displayed(self, timeout=None):
         """Check if the Contact List page is displayed"""
         try:
-            # Wait for both the URL and the table to be present
-            self.wait_for_url_contains("/contactList", timeout)
-            self.wait_for_element(self.CONTACT_LIST_TABLE, timeout)
+            # Wait for the URL and the table together, not one after the other
+            self.wait_for_all([
+                ('url_contains', None, "/contactList"),
+                ('presence', self.CONTACT_LIST_TABLE)
+            ], timeout)
             return True
         except:
             return False
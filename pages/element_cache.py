@@ -0,0 +1,94 @@
+import weakref
+from utils.command_listeners import add_command_listener
+
+# WebDriver commands after which the previous document's elements can no longer be trusted
+NAVIGATION_COMMANDS = {
+    'get', 'goBack', 'goForward', 'refresh', 'newWindow', 'close',
+    'switchToWindow', 'switchToFrame', 'switchToParentFrame'
+}
+
+# A cached element satisfies a lookup for its own condition and every weaker one
+CONDITION_RANK = {'presence': 0, 'visible': 1, 'clickable': 2}
+
+# Driver -> number of navigations seen so far (the identity of the current document)
+_documents = weakref.WeakKeyDictionary()
+
+
+def _track_navigation(driver):
+    """Count navigation commands sent through the driver; registered once per driver"""
+    if driver in _documents:
+        return
+    _documents[driver] = 0
+    driver_ref = weakref.ref(driver)
+
+    def count_navigation(driver_command, params, status, elapsed_ms):
+        if driver_command in NAVIGATION_COMMANDS:
+            tracked = driver_ref()
+            if tracked is not None:
+                _documents[tracked] += 1
+
+    add_command_listener(driver, count_navigation)
+
+
+def document_generation(driver):
+    return _documents.get(driver, 0)
+
+
+class ElementCache:
+    """Locator -> WebElement references of one page object
+
+    Entries belong to the document they were found in: any navigation through the
+    driver (get, back, forward, refresh, window or frame switch) empties the cache.
+    Navigations the driver does not see, such as a click that submits a form, leave
+    stale references behind; BasePage drops those on StaleElementReferenceException
+    and resolves the locator again.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        _track_navigation(driver)
+        self._generation = document_generation(driver)
+
+    def _check_document(self):
+        generation = document_generation(self.driver)
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, locator, condition='presence'):
+        """
+        Return the cached element if it was found under an equal or stronger condition
+        :return: WebElement, or None on a miss
+        """
+        self._check_document()
+        entry = self._entries.get(locator)
+        if entry is not None and CONDITION_RANK[entry[1]] >= CONDITION_RANK[condition]:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, locator, condition, element):
+        self._check_document()
+        entry = self._entries.get(locator)
+        if entry is not None and entry[0] == element and CONDITION_RANK[entry[1]] >= CONDITION_RANK[condition]:
+            return
+        self._entries[locator] = (element, condition)
+
+    def discard(self, locator):
+        self._entries.pop(locator, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
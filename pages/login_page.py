@@ -1,6 +1,4 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
 
 class LoginPage(BasePage):
@@ -11,39 +9,45 @@ class LoginPage(BasePage):
     PASSWORD_INPUT = (By.ID, "password")
     LOGIN_BUTTON = (By.ID, "submit")
     ADD_USER_LINK = (By.ID, "signup")
-    
+
+    FORM_FIELDS = {
+        "email": EMAIL_INPUT,
+        "password": PASSWORD_INPUT
+    }
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.url = f"{self.base_url}/login"
+
     def navigate_to(self):
         """Navigate to the login page"""
-        self.driver.get("https://thinking-tester-contact-list.herokuapp.com/login")
+        self.driver.get(self.url)
     
-    def login(self, email, password):
+    def login(self, email, password, realistic_typing=None):
         """Login with the given credentials"""
-        self.fill_email(email)
-        self.fill_password(password)
+        self.fill_form({"email": email, "password": password}, realistic_typing)
         self.click_login()
     
     def fill_email(self, email):
         """Fill in the email field"""
-        self.driver.find_element(*self.EMAIL_INPUT).send_keys(email)
+        self.input_text(self.EMAIL_INPUT, email)
     
     def fill_password(self, password):
         """Fill in the password field"""
-        self.driver.find_element(*self.PASSWORD_INPUT).send_keys(password)
+        self.input_text(self.PASSWORD_INPUT, password)
     
     def click_login(self):
         """Click the login button"""
-        self.driver.find_element(*self.LOGIN_BUTTON).click()
+        self.click(self.LOGIN_BUTTON)
     
     def click_add_user(self):
         """Click the Add User link"""
-        self.driver.find_element(*self.ADD_USER_LINK).click()
+        self.click(self.ADD_USER_LINK)
     
     def is_displayed(self):
         """Check if the login page is displayed"""
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self.LOGIN_BUTTON)
-            )
+            self.wait_for_element(self.LOGIN_BUTTON)
             return True
         except:
             return False 
\ No newline at end of file
@@ -0,0 +1,285 @@
+import os
+import time
+import weakref
+from collections import namedtuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, StaleElementReferenceException, NoSuchElementException
+)
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Shared by every in-browser script that resolves Selenium (By, value) locators
+FIND_ELEMENT_JS = """
+function findElement(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'css selector': return document.querySelector(value);
+        case 'xpath':
+            return document.evaluate(value, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'link text':
+        case 'partial link text':
+            var links = document.getElementsByTagName('a');
+            for (var i = 0; i < links.length; i++) {
+                var text = (links[i].innerText || '').trim();
+                if (by === 'link text' ? text === value : text.indexOf(value) !== -1) return links[i];
+            }
+            return null;
+    }
+    return null;
+}
+"""
+
+# Resolves as soon as the conditions hold: the first one that does ('any'), or all of them ('all').
+# A MutationObserver re-checks them on every DOM change; a slow interval covers changes
+# that produce no mutation (CSS, pushState).
+OBSERVER_SCRIPT = FIND_ELEMENT_JS + """
+var conditions = arguments[0], mode = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function visible(el) {
+    if (!el || !el.isConnected) return false;
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none' || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rects = el.getClientRects();
+    // Both dimensions, like Selenium's isDisplayed: an empty inline element still has a line height
+    return rects.length > 0 && rects[0].width > 0 && rects[0].height > 0;
+}
+
+function checkOne(by, value, condition, expected) {
+    if (condition === 'url_contains') return location.href.indexOf(expected) !== -1 ? true : null;
+    if (condition === 'url_to_be') return location.href === expected ? true : null;
+    if (condition === 'url_changes') return location.href !== expected ? true : null;
+    var el = findElement(by, value);
+    switch (condition) {
+        case 'presence': return el;
+        case 'visible': return visible(el) ? el : null;
+        case 'clickable': return visible(el) && !el.disabled ? el : null;
+        case 'invisible': return visible(el) ? null : true;
+        case 'text': return el && (el.innerText || el.textContent || '').indexOf(expected) !== -1 ? el : null;
+        case 'has_text': return visible(el) && (el.innerText || el.textContent || '').trim() ? el : null;
+    }
+    return null;
+}
+
+function check() {
+    var values = [];
+    for (var i = 0; i < conditions.length; i++) {
+        var c = conditions[i], result = checkOne(c[0], c[1], c[2], c[3]);
+        if (result && mode === 'any') return {index: i, value: result};
+        if (!result && mode === 'all') return null;
+        values.push(result);
+    }
+    return mode === 'all' ? {index: null, value: values} : null;
+}
+
+var result = check();
+if (result) {
+    done({status: 'ok', index: result.index, value: result.value});
+    return;
+}
+
+var finished = false, observer, safety, timer;
+function finish(status, result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(safety);
+    clearTimeout(timer);
+    window.removeEventListener('hashchange', onChange);
+    window.removeEventListener('popstate', onChange);
+    done({status: status, index: result && result.index, value: result && result.value});
+}
+function onChange() {
+    var r = check();
+    if (r) finish('ok', r);
+}
+
+observer = new MutationObserver(onChange);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+window.addEventListener('hashchange', onChange);
+window.addEventListener('popstate', onChange);
+safety = setInterval(onChange, 100);
+timer = setTimeout(function () { finish('timeout', null); }, timeout);
+"""
+
+SUPPORTED_LOCATORS = {
+    By.ID, By.CSS_SELECTOR, By.XPATH, By.NAME, By.CLASS_NAME, By.TAG_NAME, By.LINK_TEXT, By.PARTIAL_LINK_TEXT
+}
+
+# Drivers whose implicit wait has already been switched off
+_prepared_drivers = weakref.WeakSet()
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _text_in_element(locator, text):
+    """Polling counterpart of the 'text' condition that returns the element instead of a bool"""
+    def _predicate(driver):
+        element = driver.find_element(*locator)
+        return element if text in element.text else False
+    return _predicate
+
+
+def _element_has_text(locator, expected):
+    """Polling counterpart of the 'has_text' condition: displayed and with non-blank text"""
+    def _predicate(driver):
+        element = driver.find_element(*locator)
+        return element if element.is_displayed() and element.text.strip() else False
+    return _predicate
+
+
+POLL_CONDITIONS = {
+    'presence': lambda locator, expected: EC.presence_of_element_located(locator),
+    'visible': lambda locator, expected: EC.visibility_of_element_located(locator),
+    'clickable': lambda locator, expected: EC.element_to_be_clickable(locator),
+    'invisible': lambda locator, expected: EC.invisibility_of_element_located(locator),
+    'text': _text_in_element,
+    'has_text': _element_has_text,
+    'url_contains': lambda locator, expected: EC.url_contains(expected),
+    'url_to_be': lambda locator, expected: EC.url_to_be(expected),
+    'url_changes': lambda locator, expected: EC.url_changes(expected),
+}
+
+# The outcome of DomWaiter.until_any: its name and the element (or True) it produced
+Outcome = namedtuple('Outcome', ['name', 'value'])
+
+
+class DomWaiter:
+    """Event-driven waits that resolve the moment the DOM satisfies a condition
+
+    Conditions are evaluated inside the browser with a MutationObserver through
+    execute_async_script, so a wait costs a single WebDriver round trip instead of
+    one per 0.5 s poll. Implicit waits are switched off for every driver the waiter
+    is attached to, otherwise each failed lookup would stall for the implicit timeout.
+    If the observer cannot be used (unsupported locator, WAIT_STRATEGY=poll, or the
+    page keeps navigating away) the wait falls back to tight polling.
+    """
+
+    POLL_FREQUENCY = 0.05
+    MAX_OBSERVER_ATTEMPTS = 3
+
+    def __init__(self, driver, use_observer=None):
+        self.driver = driver
+        if use_observer is None:
+            use_observer = os.getenv('WAIT_STRATEGY', 'observer').lower() != 'poll'
+        self.use_observer = use_observer
+        if driver not in _prepared_drivers:
+            driver.implicitly_wait(0)
+            _prepared_drivers.add(driver)
+
+    def until(self, condition, locator=None, expected=None, timeout=10):
+        """
+        Wait for a condition
+        :param condition: presence, visible, clickable, invisible, text, has_text (displayed with non-blank text),
+            url_contains, url_to_be or url_changes
+        :param locator: (By, value) tuple for element conditions
+        :param expected: text or URL for the text and url conditions (the old URL for url_changes)
+        :param timeout: seconds to wait
+        :return: the element for element conditions, True otherwise
+        :raises TimeoutException: if the condition is not met in time
+        """
+        return self._wait([(condition, locator, expected)], 'any', timeout)['value']
+
+    def until_any(self, outcomes, timeout=10):
+        """
+        Wait for the first of several conditions, checked together in one wait
+        :param outcomes: outcome name -> (condition, locator) or (condition, locator, expected);
+            when several hold at the same moment the first one listed wins
+        :return: Outcome(name, value) of the condition that was met
+        :raises TimeoutException: if none of them is met in time
+        """
+        names = list(outcomes)
+        result = self._wait([self._spec(outcomes[name]) for name in names], 'any', timeout)
+        return Outcome(names[result['index']], result['value'])
+
+    def until_all(self, conditions, timeout=10):
+        """
+        Wait until several conditions hold at the same time, checked together in one wait
+        :param conditions: list of (condition, locator) or (condition, locator, expected)
+        :return: list of the conditions' values
+        :raises TimeoutException: if they do not all hold in time
+        """
+        return self._wait([self._spec(spec) for spec in conditions], 'all', timeout)['value']
+
+    @staticmethod
+    def _spec(spec):
+        condition, locator, expected = (tuple(spec) + (None, None))[:3]
+        return condition, locator, expected
+
+    def _wait(self, conditions, mode, timeout):
+        """Wait for (condition, locator, expected) specs; mode is 'any' or 'all'"""
+        for condition, _, _ in conditions:
+            if condition not in POLL_CONDITIONS:
+                raise ValueError(f"Unknown wait condition: {condition}")
+        deadline = time.monotonic() + timeout
+        names = ", ".join(f"'{condition}'" for condition, _, _ in conditions)
+        if len(conditions) == 1:
+            failure = f"Condition {names} not met"
+        else:
+            failure = f"{'None' if mode == 'any' else 'Not all'} of the conditions {names} met"
+
+        supported = all(locator is None or locator[0] in SUPPORTED_LOCATORS for _, locator, _ in conditions)
+        if self.use_observer and supported:
+            for _ in range(self.MAX_OBSERVER_ATTEMPTS):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    result = self._observe(conditions, mode, remaining)
+                except WebDriverException:
+                    # The document was replaced while waiting (navigation); try again on the new page
+                    continue
+                if result['status'] == 'ok':
+                    return result
+                raise TimeoutException(f"{failure} after waiting {timeout} seconds")
+
+        return self._poll(conditions, mode, max(deadline - time.monotonic(), 0), failure)
+
+    def _observe(self, conditions, mode, remaining):
+        """Run the observer script for the remaining time"""
+        script_timeout = _script_timeouts.get(self.driver, 30)
+        if remaining + 1 > script_timeout:
+            script_timeout = int(remaining) + 5
+            self.driver.set_script_timeout(script_timeout)
+            _script_timeouts[self.driver] = script_timeout
+
+        specs = [
+            [locator[0] if locator else None, locator[1] if locator else None, condition, expected]
+            for condition, locator, expected in conditions
+        ]
+        return self.driver.execute_async_script(OBSERVER_SCRIPT, specs, mode, int(remaining * 1000))
+
+    def _poll(self, conditions, mode, remaining, failure=''):
+        """Fallback: check the conditions from the client side every POLL_FREQUENCY seconds"""
+        predicates = [POLL_CONDITIONS[condition](locator, expected) for condition, locator, expected in conditions]
+
+        def check(driver):
+            values = []
+            for index, predicate in enumerate(predicates):
+                try:
+                    value = predicate(driver)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    value = False
+                if value and mode == 'any':
+                    return {'index': index, 'value': value}
+                if not value and mode == 'all':
+                    return False
+                values.append(value)
+            return {'index': None, 'value': values} if mode == 'all' else False
+
+        wait = WebDriverWait(
+            self.driver,
+            remaining,
+            poll_frequency=self.POLL_FREQUENCY,
+            ignored_exceptions=[StaleElementReferenceException]
+        )
+        return wait.until(check, failure)
@@ -1,13 +1,11 @@
 import pytest
-import requests
 import logging
-from config.webdriver_config import WebDriverConfig
 
 class BaseTest:
     """Base class for all test classes"""
     
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, request, api_client):
         """Setup test environment before each test"""
         # Configure logging
         logging.basicConfig(
@@ -16,11 +14,13 @@ class BaseTest:
         )
         self.logger = logging.getLogger('test_logger')
         
-        # Initialize WebDriver using WebDriverConfig
-        self.driver = WebDriverConfig.get_chrome_driver()
+        # The WebDriver is taken from the session pool on first use of self.driver,
+        # so tests that only call the API never start a browser
+        self._request = request
+        self._driver = None
         
-        # Initialize requests session
-        self.session = requests.Session()
+        # Shared API client with a keep-alive connection pool
+        self.api_client = api_client
         
         # Setup complete
         self.logger.info("Test setup completed")
@@ -28,9 +28,14 @@ class BaseTest:
         yield
         
         # Cleanup after test
-        if self.driver:
-            self.driver.quit()
-        if self.session:
-            self.session.close()
+        if self._driver:
+            request.getfixturevalue("driver_pool").release(self._driver)
         
-        self.logger.info("Test cleanup completed") 
\ No newline at end of file
+        self.logger.info("Test cleanup completed")
+
+    @property
+    def driver(self):
+        """Warm WebDriver from the session pool, acquired on first use"""
+        if self._driver is None:
+            self._driver = self._request.getfixturevalue("driver_pool").acquire()
+        return self._driver
@@ -1,15 +1,62 @@
+import time
+
+# Taken before any other import so the fast lane can report what loading conftest costs
+CONFTEST_LOAD_STARTED = time.perf_counter()
+
 import pytest
-from config.webdriver_config import WebDriverConfig
-from faker import Faker
+from config.driver_profiles import PROFILES, get_driver_profile
+from config.api_config import APIConfig, get_api_client
+from utils.auth_session import AuthSession
+from utils.log_capture import PhaseLogCapture, LOG_FORMAT
+from utils.screenshots import shutdown_screenshot_service
+from utils.user_database import UserDatabase, log_table_summary
+from utils.identity_corpus import IdentityCorpus, build_corpus, get_run_namespace
+from utils.stub_server import ContactListStub
+from utils.cassette import CassetteAdapter, CassetteLibrary, mask_headers, mask_secrets
+from utils.command_timing import TimingReport, enable_command_timing, get_command_timer
+from utils.stream_report import StreamingReporter, api_payload, slugify_nodeid
+from utils.duration_history import DurationReport
+from utils.fast_lane import StartupTimer, has_api_tests, is_fast_lane
+from utils.sql_rows import SELECTIONS, RowOutcomes, RowSource
+from utils.worker_namespace import get_worker_id, worker_file, merge_worker_dirs, merge_worker_files
 import json
 import os
+import shutil
 import logging
 from datetime import datetime
-from py.xml import html
 from dotenv import load_dotenv
 
+# Browser modules (config.driver_pool, utils.failure_bundle), Faker, py.xml and the
+# xdist scheduler are imported inside the fixtures and hooks that use them, so the
+# API fast lane never loads them
+
 load_dotenv()
 
+# In-memory capture of the records emitted during each test phase, attached to the HTML report
+log_capture = PhaseLogCapture(
+    max_records=int(os.getenv('LOG_CAPTURE_MAX_RECORDS', 500)),
+    max_chars=int(os.getenv('LOG_CAPTURE_MAX_CHARS', 20000))
+)
+
+# Command and step timings of every finished test (filled only with --command-timing)
+timing_report = TimingReport()
+
+# Streaming JSON report of this process (set in pytest_configure with --stream-report)
+stream_report = None
+
+# Test durations of this run (controller only), recorded to the duration history
+duration_report = None
+
+# Outcomes of sql_rows test items (controller only), written back to their rows
+row_outcomes = None
+
+REPORT_TITLE = "Contact List App - Test Automation Report"
+
+FAILURE_DIR = os.getenv('FAILURE_DIR', 'reports/failures')
+
+startup_timer = StartupTimer(CONFTEST_LOAD_STARTED)
+startup_timer.mark("conftest_imported")
+
 # Configure logging
 @pytest.fixture(scope='session', autouse=True)
 def setup_logging():
@@ -19,10 +66,11 @@ def setup_logging():
     
     # Create handlers
     console_handler = logging.StreamHandler()
-    file_handler = logging.FileHandler('reports/test.log')
+    # Every xdist worker logs to its own file; the controller merges them at session end
+    file_handler = logging.FileHandler(worker_file('reports/test.log'))
     
     # Create formatters and add it to handlers
-    log_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    log_format = logging.Formatter(LOG_FORMAT)
     console_handler.setFormatter(log_format)
     file_handler.setFormatter(log_format)
     
@@ -32,18 +80,386 @@ def setup_logging():
     
     return logger
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local-app",
+        action="store_true",
+        default=False,
+        help="run against an in-process stand-in of the Contact List app instead of BASE_URL"
+    )
+    parser.addoption(
+        "--cassette-mode",
+        choices=["off", "record", "replay", "strict"],
+        default=None,
+        help="record API traffic of api tests to cassettes, or replay it from them (default: CASSETTE_MODE)"
+    )
+    parser.addoption(
+        "--driver-profile",
+        choices=["default"] + list(PROFILES),
+        default=None,
+        help="browser profile: headless mode, page load strategy, resource blocking and waits (default: DRIVER_PROFILE)"
+    )
+    parser.addoption(
+        "--command-timing",
+        action="store_true",
+        default=False,
+        help="time WebDriver commands and page object steps (or COMMAND_TIMING=True)"
+    )
+    parser.addoption(
+        "--stream-report",
+        action="store_true",
+        default=False,
+        help="stream one JSON record per test to STREAM_REPORT_DIR, with logs and payloads as linked files"
+    )
+
+    parser.addoption(
+        "--api-only",
+        action="store_true",
+        default=False,
+        help="browser-free fast lane: run only api tests without loading Selenium or page objects (same as -m api)"
+    )
+    parser.addoption(
+        "--startup-budget",
+        type=float,
+        default=None,
+        help="fail the run when getting from conftest load to the first test takes longer (seconds)"
+    )
+    parser.addoption(
+        "--no-duration-scheduling",
+        action="store_true",
+        default=False,
+        help="under xdist, keep the default load scheduling instead of handing out tests longest-first"
+    )
+    parser.addoption(
+        "--durations-report",
+        action="store_true",
+        default=False,
+        help="show predicted vs actual makespan from the duration history"
+    )
+    parser.addoption(
+        "--sql-rows",
+        choices=SELECTIONS,
+        default="all",
+        help="rows of sql_rows tests to run: all, failed (failed last time) or pending (not passed yet)"
+    )
+    parser.addoption(
+        "--sql-rows-limit",
+        type=int,
+        default=None,
+        help="run sql_rows tests over at most this many rows"
+    )
+
+def use_local_app(config):
+    return config.getoption("--local-app") or os.getenv('LOCAL_APP', 'False').lower() == 'true'
+
+@pytest.fixture(scope="session", autouse=True)
+def local_app(request):
+    """
+    Start the local Contact List stand-in and point BASE_URL at it (with --local-app or LOCAL_APP=True)
+    """
+    if not use_local_app(request.config):
+        yield None
+        return
+    
+    stub = ContactListStub().start()
+    previous_base_url = os.environ.get('BASE_URL')
+    os.environ['BASE_URL'] = stub.url
+    logging.getLogger('test_logger').info(f"Local Contact List app running at {stub.url}")
+    yield stub
+    
+    stub.stop()
+    if previous_base_url is None:
+        os.environ.pop('BASE_URL', None)
+    else:
+        os.environ['BASE_URL'] = previous_base_url
+
+def cassette_mode(config):
+    return config.getoption("--cassette-mode") or os.getenv('CASSETTE_MODE', 'off').lower()
+
+def use_command_timing(config):
+    return config.getoption("--command-timing") or os.getenv('COMMAND_TIMING', 'False').lower() == 'true'
+
+def use_stream_report(config):
+    return config.getoption("--stream-report") or os.getenv('STREAM_REPORT', 'False').lower() == 'true'
+
+def use_duration_scheduling(config):
+    return not config.getoption("--no-duration-scheduling") and os.getenv('DURATION_SCHEDULING', 'True').lower() == 'true'
+
+def worker_count(config):
+    return getattr(config.option, "numprocesses", None) or 1
+
+def _row_shards(config):
+    # Only xdist workers collect under xdist, and they know how many of them there are
+    return config.workerinput.get("workercount", 1) if hasattr(config, "workerinput") else 1
+
+def _sql_rows_table(marker):
+    return marker.args[0] if marker.args else "test_users"
+
+@pytest.hookimpl(optionalhook=True)
 def pytest_html_report_title(report):
-    report.title = "Contact List App - Test Automation Report"
+    report.title = REPORT_TITLE
 
 def pytest_configure(config):
+    if config.getoption("--api-only") and not config.option.markexpr:
+        config.option.markexpr = "api"
+    
+    # Page objects and the driver factory read the profile from the environment
+    if config.getoption("--driver-profile"):
+        os.environ['DRIVER_PROFILE'] = config.getoption("--driver-profile")
+    
     config._metadata = {
         'Project Name': 'Contact List App',
-        'Test Environment': os.getenv('BASE_URL'),
+        'Test Environment': 'local stand-in' if use_local_app(config) else os.getenv('BASE_URL'),
         'Browser': os.getenv('BROWSER', 'Chrome'),
+        'Driver Profile': get_driver_profile().name,
         'Platform': 'macOS',
         'Python Version': '3.12'
     }
 
+    logger = logging.getLogger('test_logger')
+    logger.setLevel(logging.INFO)
+    logger.addHandler(log_capture)
+    
+    config.cassettes = CassetteLibrary(
+        directory=os.getenv('CASSETTE_DIR', 'cassettes'),
+        mode=cassette_mode(config),
+        namespace=get_run_namespace()
+    )
+    
+    if use_command_timing(config):
+        enable_command_timing()
+    
+    global stream_report
+    if use_stream_report(config):
+        worker_id = get_worker_id()
+        # With xdist the workers write the records; the controller only writes the manifest
+        workers = [f"gw{i}" for i in range(getattr(config.option, "numprocesses", None) or 0)] or ["master"]
+        controller = not hasattr(config, "workerinput")
+        stream_report = StreamingReporter(
+            directory=os.getenv('STREAM_REPORT_DIR', 'reports/stream'),
+            worker_id=worker_id,
+            write_records=not (controller and workers != ["master"])
+        )
+        if controller:
+            stream_report.start(REPORT_TITLE, config._metadata, workers)
+    
+    # Failure bundles of the previous run are dropped before any worker starts
+    if not hasattr(config, "workerinput"):
+        shutil.rmtree(FAILURE_DIR, ignore_errors=True)
+    
+    # The controller sees every test's report, so it keeps the duration history
+    global duration_report
+    if not hasattr(config, "workerinput") and not config.getoption("collectonly"):
+        duration_report = DurationReport()
+    
+    # Data-driven tests read their rows from SQL_ROWS_DB; the controller writes the outcomes back
+    global row_outcomes
+    config.sql_rows = RowSource()
+    if not hasattr(config, "workerinput") and not config.getoption("collectonly") and config.sql_rows.exists():
+        config.sql_rows.prepare()
+        row_outcomes = RowOutcomes(config.sql_rows)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Hand tests (and under --dist loadgroup, whole xdist_groups) to xdist workers longest-first"""
+    if duration_report is None or not use_duration_scheduling(config) or config.getvalue("dist") not in ("load", "loadgroup"):
+        return None
+    from utils.duration_scheduler import DurationScheduling
+    return DurationScheduling(config, log, known=duration_report.known)
+
+def pytest_generate_tests(metafunc):
+    """One test item per row of the table named by @pytest.mark.sql_rows, for tests taking sql_row"""
+    marker = metafunc.definition.get_closest_marker("sql_rows")
+    if marker is None or "sql_row" not in metafunc.fixturenames:
+        return
+    config = metafunc.config
+    table = _sql_rows_table(marker)
+    shards = _row_shards(config)
+    params = []
+    # Only the row ids are collected; each item loads its row in the sql_row fixture
+    for position, row_id in enumerate(config.sql_rows.row_ids(
+        table, config.getoption("--sql-rows"), config.getoption("--sql-rows-limit")
+    )):
+        # Dealt round-robin, so --dist loadgroup gives every worker an equal share of the rows
+        marks = [pytest.mark.xdist_group(f"{table}-{position % shards}")] if shards > 1 else []
+        params.append(pytest.param(row_id, id=f"row{row_id}", marks=marks))
+    metafunc.parametrize("sql_row", params, indirect=True)
+
+def pytest_ignore_collect(collection_path, config):
+    # In the fast lane a test module without api tests is not even imported
+    if is_fast_lane(config) and collection_path.suffix == ".py" and collection_path.name.startswith("test_"):
+        return not has_api_tests(collection_path)
+    return None
+
+def pytest_collection(session):
+    startup_timer.mark("collection_started")
+
+def pytest_collection_finish(session):
+    startup_timer.mark("collection_finished")
+    startup_timer.collected = len(session.items)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, config, items):
+    # Collection order is identical on every xdist worker, so it gives each test a stable, unique index
+    for index, item in enumerate(items):
+        item.test_index = index
+        # Reports carry the row of a data-driven item, so the controller can record its outcome
+        marker = item.get_closest_marker("sql_rows")
+        callspec = getattr(item, "callspec", None)
+        # With no rows pytest still collects one skipped item, whose param is not a row id
+        if marker is not None and callspec is not None and isinstance(callspec.params.get("sql_row"), int):
+            item.user_properties.append(("sql_row", (_sql_rows_table(marker), callspec.params["sql_row"])))
+
+def pytest_sessionfinish(session, exitstatus):
+    # Barrier: every queued screenshot must be on disk before the session ends
+    shutdown_screenshot_service()
+    
+    if _startup_over_budget(session.config) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    session.config.cassettes.save_all()
+    
+    if stream_report is not None:
+        stream_report.close()
+        if not hasattr(session.config, "workerinput"):
+            stream_report.finish(exitstatus)
+    
+    # Merge step: fold the per-worker log files and artifact directories back together
+    if not hasattr(session.config, "workerinput"):
+        merge_worker_files('reports/test.log')
+        merge_worker_dirs('screenshots')
+    
+    if duration_report is not None:
+        duration_report.save(worker_count(session.config))
+    
+    if row_outcomes is not None:
+        row_outcomes.flush()
+    session.config.sql_rows.close()
+    
+    # Under xdist only the controller holds every test's timings
+    if timing_report.tests and not hasattr(session.config, "workerinput"):
+        json_path, csv_path = timing_report.write()
+        logging.getLogger('test_logger').info(f"Command timings written to {json_path} and {csv_path}")
+
+def pytest_runtest_logreport(report):
+    if stream_report is not None:
+        stream_report.add_report(report)
+    if duration_report is not None:
+        # xdist attaches the worker node to the reports it forwards to the controller
+        node = getattr(report, "node", None)
+        duration_report.add(report, node.gateway.id if node is not None else get_worker_id())
+    if row_outcomes is not None:
+        row_outcomes.add(report)
+    for name, rows in report.user_properties:
+        if name == "command_timing":
+            timing_report.add(report.nodeid, rows)
+
+def _timing_table(title, header, rows):
+    from py.xml import html
+    return html.div(
+        html.h3(title),
+        html.table(
+            html.tr([html.th(cell) for cell in header]),
+            [html.tr([html.td(str(cell)) for cell in row]) for row in rows]
+        ),
+        class_="timing"
+    )
+
+def _startup_over_budget(config):
+    budget = config.getoption("--startup-budget")
+    startup = startup_timer.startup_seconds()
+    return budget is not None and startup is not None and startup > budget
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    # Under xdist the workers collect, so only a single-process run has startup timings
+    timed = "collection_finished" in startup_timer.marks
+    if timed and (is_fast_lane(config) or config.getoption("--startup-budget") is not None):
+        terminalreporter.write_sep("=", "fast lane startup")
+        for line in startup_timer.summary_lines():
+            terminalreporter.write_line(line)
+        if _startup_over_budget(config):
+            terminalreporter.write_line(
+                f"startup budget of {config.getoption('--startup-budget')} s exceeded", red=True
+            )
+    
+    if row_outcomes is not None and row_outcomes.counts:
+        terminalreporter.write_sep("=", "sql rows")
+        terminalreporter.write_line(
+            ", ".join(f"{count} {outcome}" for outcome, count in sorted(row_outcomes.counts.items()))
+            + f" (outcomes written to {config.sql_rows.path})"
+        )
+        if any(row_outcomes.counts[outcome] for outcome in ("failed", "error")):
+            terminalreporter.write_line("re-run only the failed rows with --sql-rows=failed")
+    
+    if duration_report is None or not config.getoption("--durations-report"):
+        return
+    terminalreporter.write_sep("=", "duration history")
+    for line in duration_report.summary_lines(worker_count(config)):
+        terminalreporter.write_line(line)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    if not timing_report.tests:
+        return
+    prefix.append(str(_timing_table(
+        "Slowest steps",
+        ["Kind", "Step", "Locator", "Calls", "Total ms", "Max ms"],
+        timing_report.slowest_steps()
+    )))
+    prefix.append(str(_timing_table(
+        "Slowest locators",
+        ["Locator", "Calls", "Total ms"],
+        timing_report.slowest_locators()
+    )))
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # API tests run with their own cassette active through setup, call and teardown
+    cassettes = item.config.cassettes
+    if not cassettes.enabled or item.get_closest_marker("api") is None:
+        yield
+        return
+    token = cassettes.insert(item.nodeid)
+    yield
+    cassettes.eject(token)
+
+def pytest_runtest_logstart(nodeid, location):
+    startup_timer.mark("first_test")
+    # Drop anything logged between tests so it is not attributed to the next one
+    log_capture.drain()
+
+def _link_extra(item, title, path):
+    # Link relative to the HTML report so the report directory can be moved as a whole
+    html_path = item.config.getoption("htmlpath", None)
+    href = os.path.relpath(path, os.path.dirname(os.path.abspath(html_path))) if html_path else path
+    return {
+        "content": href,
+        "name": title,
+        "format_type": "url",
+        "extension": None
+    }
+
+def _renders_html(config):
+    # Without pytest-html (e.g. the fast lane with -p no:html) nothing renders the extras
+    return config.pluginmanager.hasplugin("html")
+
+def _log_extra(item, title, log_content):
+    if stream_report is not None:
+        return _link_extra(item, title, stream_report.add_artifact(item.nodeid, title, log_content, "log"))
+    if not _renders_html(item.config):
+        return {"content": log_content, "name": title, "format_type": "text", "extension": "txt"}
+    from py.xml import html
+    return {
+        "content": str(html.div(
+            html.h3(title),
+            html.pre(log_content),
+            class_="log"
+        )),
+        "name": title,
+        "format": "html",
+        "format_type": "raw",
+        "extension": "html"
+    }
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -52,36 +468,43 @@ def pytest_runtest_makereport(item, call):
     # Add timestamp to the report
     report.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    # Get the test log content
-    log_content = None
-    try:
-        with open('reports/test.log', 'r') as f:
-            log_content = f.read()
-    except:
-        log_content = "No log file found"
+    # Only the records emitted during this phase of this test
+    if not hasattr(item, "phase_logs"):
+        item.phase_logs = {}
+    item.phase_logs[report.when] = log_capture.drain()
+    
+    # Setup logs are reported with the call phase, or on their own if setup did not pass
+    if report.when == "setup" and not report.passed:
+        if item.phase_logs["setup"]:
+            report.extras = [_log_extra(item, "Test Logs", item.phase_logs["setup"])]
+    
+    if report.when == "teardown" and item.phase_logs["teardown"]:
+        report.extras = [_log_extra(item, "Teardown Logs", item.phase_logs["teardown"])]
+    
+    # Per-test timings travel with the teardown report so the xdist controller receives them too
+    timer = get_command_timer()
+    if report.when == "teardown" and timer is not None:
+        report.user_properties.append(("command_timing", timer.drain()))
     
     # Add logs to the report for all tests
     if report.when == "call":
         extras = []
         
         # Add log output
+        log_content = "\n".join(
+            item.phase_logs[when] for when in ("setup", "call") if item.phase_logs.get(when)
+        )
         if log_content:
-            extras.append({
-                "content": str(html.div(
-                    html.h3("Test Logs"),
-                    html.pre(log_content),
-                    class_="log"
-                )),
-                "name": "Test Logs",
-                "format": "html",
-                "format_type": "raw",
-                "extension": "html"
-            })
+            extras.append(_log_extra(item, "Test Logs", log_content))
         
         # Add API response details if it's an API test
-        if "test_empty_fields_api" in item.name and hasattr(item, "api_response"):
+        if hasattr(item, "api_response") and stream_report is not None:
+            path = stream_report.add_artifact(item.nodeid, "API Response", api_payload(item.api_response), "json")
+            extras.append(_link_extra(item, "API Response", path))
+        elif hasattr(item, "api_response") and _renders_html(item.config):
+            from py.xml import html
             try:
-                response_json = item.api_response.json()
+                response_json = mask_secrets(item.api_response.json())
                 # Format JSON with proper indentation and syntax highlighting
                 formatted_json = json.dumps(response_json, indent=2)
                 extras.append({
@@ -103,7 +526,7 @@ def pytest_runtest_makereport(item, call):
                                 html.tr([html.td("Request Headers"), html.td(
                                     html.pre(
                                         html.code(
-                                            json.dumps(dict(item.api_response.request.headers), indent=2),
+                                            json.dumps(mask_headers(item.api_response.request.headers), indent=2),
                                             class_="json"
                                         ),
                                         class_="json-container"
@@ -129,41 +552,154 @@ def pytest_runtest_makereport(item, call):
         
         # Use the new extras attribute instead of the deprecated extra
         report.extras = extras
+    
+    # Browser evidence is collected only for failures, while the test's driver is still open
+    if report.failed and report.when in ("setup", "call"):
+        driver = _item_driver(item)
+        if driver is not None:
+            report.extras = getattr(report, "extras", []) + _failure_bundle_extras(item, driver, report.when)
+
+def _item_driver(item):
+    """The WebDriver a test uses: a driver fixture, or self.driver of a BaseTest"""
+    for name in ("logged_in_driver", "driver"):
+        driver = getattr(item, "funcargs", {}).get(name)
+        if driver is not None:
+            return driver
+    # Read the instance attributes directly: BaseTest.driver would start a browser on access
+    attributes = getattr(getattr(item, "instance", None), "__dict__", {})
+    return attributes.get("driver") or attributes.get("_driver")
+
+def _failure_bundle_extras(item, driver, when):
+    try:
+        from utils.failure_bundle import collect_failure_bundle
+        paths = collect_failure_bundle(
+            driver, os.path.join(FAILURE_DIR, slugify_nodeid(item.nodeid)), test_name=item.nodeid, phase=when
+        )
+    except Exception as e:
+        logging.getLogger('test_logger').error(f"Could not collect failure bundle: {e}")
+        return []
+    extras = []
+    for name, path in paths.items():
+        if stream_report is not None:
+            path = stream_report.add_file(item.nodeid, f"Failure {name}", path)
+        extras.append(_link_extra(item, f"Failure {name.replace('_', ' ')}", path))
+    return extras
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig):
+    """
+    Create a pool of warm WebDriver instances shared by the tests of this session (one per xdist worker)
+    """
+    if is_fast_lane(pytestconfig):
+        pytest.fail("The API fast lane never starts a browser; mark this test ui instead of api")
+    from config.driver_pool import DriverPool
+    pool = DriverPool()
+    yield pool
+    pool.shutdown()
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(driver_pool):
     """
-    Create and return a WebDriver instance for each test
+    Return a clean WebDriver instance from the pool for each test
     """
-    driver = WebDriverConfig.get_chrome_driver()
+    driver = driver_pool.acquire()
     yield driver
-    
-    # Capture screenshot on test failure
-    if driver is not None:
-        try:
-            driver.save_screenshot('reports/screenshots/last_test.png')
-        except:
-            pass
-        driver.quit()
+    driver_pool.release(driver)
 
 @pytest.fixture(scope="session")
 def faker():
     """
     Create and return a Faker instance
     """
+    from faker import Faker
     return Faker()
 
+@pytest.fixture(scope="session")
+def user_database(identity_corpus):
+    """
+    Build the test_users schema and seed data once per session (in memory, or WAL file with TEST_DB_MODE=wal)
+    """
+    # Seed users get their own email namespace so they never clash with per-test identities
+    seed_corpus = IdentityCorpus(identity_corpus.path, namespace=f"{identity_corpus.namespace}.seed")
+    worker_id = get_worker_id()
+    seed_rows = seed_corpus.rows(seed_corpus.for_worker(worker_id, index) for index in range(5))
+    seed_corpus.close()
+    
+    database = UserDatabase(mode=os.getenv('TEST_DB_MODE', 'memory'), path=worker_file('test_users.db'))
+    database.create(seed_rows)
+    if os.getenv('TEST_DB_DEBUG', 'False').lower() == 'true':
+        conn = database.connect()
+        log_table_summary(conn)
+        conn.close()
+    yield database
+    database.close()
+
+@pytest.fixture(scope="function")
+def db_connection(user_database):
+    """
+    Return a connection to the session database inside a savepoint that is rolled back after the test
+    """
+    conn = user_database.open_savepoint()
+    yield conn
+    user_database.rollback(conn)
+
 @pytest.fixture
-def valid_user_data(faker):
+def sql_row(request, pytestconfig):
     """
-    Generate valid user data using Faker
+    Return the row this item was generated for by @pytest.mark.sql_rows, read from SQL_ROWS_DB when the test runs
     """
-    return {
-        "first_name": faker.first_name(),
-        "last_name": faker.last_name(),
-        "email": faker.email(),
-        "password": faker.password(length=10)
-    }
+    marker = request.node.get_closest_marker("sql_rows")
+    if marker is None or not hasattr(request, "param"):
+        pytest.fail("sql_row needs a @pytest.mark.sql_rows(table) marker on the test")
+    return pytestconfig.sql_rows.get_row(_sql_rows_table(marker), request.param)
+
+@pytest.fixture(scope="session")
+def identity_corpus():
+    """
+    Memory-map the precomputed identity corpus, building it on first use
+    """
+    path = os.getenv('IDENTITY_CORPUS', 'data/identities.bin')
+    if not os.path.exists(path):
+        build_corpus(
+            path,
+            count=int(os.getenv('IDENTITY_CORPUS_SIZE', 10000)),
+            seed=int(os.getenv('IDENTITY_CORPUS_SEED', 1234))
+        )
+    corpus = IdentityCorpus(path, namespace=get_run_namespace())
+    yield corpus
+    corpus.close()
+
+@pytest.fixture
+def valid_user_data(identity_corpus, request):
+    """
+    Return valid user data reserved for this test in the identity corpus
+    """
+    return identity_corpus.for_test(getattr(request.node, "test_index", 0))
+
+@pytest.fixture(scope="session")
+def session_user_data(identity_corpus):
+    """
+    Return one user shared by all logged-in tests of the session (one per xdist worker)
+    """
+    session_corpus = IdentityCorpus(identity_corpus.path, namespace=f"{identity_corpus.namespace}.session")
+    user = session_corpus.for_worker(get_worker_id(), 0)
+    session_corpus.close()
+    return user
+
+@pytest.fixture(scope="session")
+def auth_session(api_client):
+    """
+    Return an API-backed session that logs users in without the UI
+    """
+    return AuthSession(client=api_client)
+
+@pytest.fixture
+def logged_in_driver(driver, auth_session, session_user_data):
+    """
+    Return a driver already logged in as the session user, ready to open ContactListPage
+    """
+    auth_session.authenticate(driver, session_user_data)
+    return driver
 
 @pytest.fixture
 def empty_user_data():
@@ -177,16 +713,20 @@ def empty_user_data():
         "password": ""
     }
 
+@pytest.fixture(scope="session")
+def api_client(local_app, pytestconfig):
+    """
+    Return the pooled, retrying API client shared by the session (one per xdist worker)
+    """
+    client = get_api_client()
+    if pytestconfig.cassettes.enabled:
+        client.mount(CassetteAdapter(pytestconfig.cassettes, client.adapter))
+    yield client
+    client.close()
+
 @pytest.fixture
 def api_headers():
     """
     Return headers for API requests
     """
-    return {
-        'Accept': '*/*',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Content-Type': 'application/json',
-        'Origin': os.getenv('BASE_URL'),
-        'Referer': f"{os.getenv('BASE_URL')}/addUser",
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36'
-    } 
\ No newline at end of file
+    return APIConfig.get_default_headers()
@@ -0,0 +1,112 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from urllib3.exceptions import ConnectTimeoutError, ReadTimeoutError
+from config.api_config import APIClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers every request with the server's status, after its delay"""
+
+    def _answer(self):
+        self.server.attempts.append(self.command)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.server.delay:
+            threading.Event().wait(self.server.delay)
+        self.send_response(self.server.status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_POST = do_PUT = do_PATCH = _answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.daemon_threads = True
+    server.attempts = []
+    server.status = 503
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def client_for(server, **kwargs):
+    host, port = server.server_address[:2]
+    return APIClient(base_url=f"http://{host}:{port}", headers={}, backoff_factor=0, **kwargs)
+
+
+class TestAPIClient:
+    def test_retry_configuration(self):
+        client = APIClient(base_url='http://localhost', headers={}, retries=3, timeout=12)
+        retry = client.adapter.max_retries
+
+        assert retry.total == 3
+        assert set(retry.status_forcelist) == {500, 502, 503, 504}
+        assert 'GET' in retry.allowed_methods and 'PUT' in retry.allowed_methods
+        assert 'POST' not in retry.allowed_methods and 'PATCH' not in retry.allowed_methods
+        assert client.timeout == 12
+
+    def test_server_errors_are_retried_for_idempotent_methods_only(self, server):
+        client = client_for(server, retries=2)
+
+        assert client.get('/users/me').status_code == 503
+        assert client.post('/users', json={}).status_code == 503
+        assert client.patch('/contacts/1', json={}).status_code == 503
+
+        assert server.attempts == ['GET'] * 3 + ['POST', 'PATCH']
+
+    def test_post_is_not_replayed_after_a_read_timeout(self, server):
+        server.delay = 0.3
+        client = client_for(server, retries=2, timeout=0.1)
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.post('/users', json={})
+        assert server.attempts == ['POST']
+
+    def test_connect_errors_are_retried_for_post(self):
+        retry = APIClient(base_url='http://localhost', headers={}, retries=2).adapter.max_retries
+
+        # A connect that failed never reached the server, so replaying it is safe
+        assert retry.increment(method='POST', url='/users', error=ConnectTimeoutError()).total == 1
+        with pytest.raises(ReadTimeoutError):
+            retry.increment(method='POST', url='/users', error=ReadTimeoutError(None, '/users', 'read timed out'))
+
+    def test_timeout_is_applied_to_every_request(self, server):
+        server.status = 200
+        client = client_for(server, timeout=7)
+        seen = []
+        original = client.session.request
+        client.session.request = lambda method, url, **kwargs: seen.append(kwargs['timeout']) or original(method, url, **kwargs)
+
+        client.get('/users/me')
+        client.get('/users/me', timeout=2)
+
+        assert seen == [7, 2]
+        assert [timing['status'] for timing in client.timings] == [200, 200]
+
+    def test_detached_client_reads_the_environment_once(self, server, monkeypatch):
+        monkeypatch.setenv('HTTP_PROXY', 'http://proxy.invalid:3128')
+        for name in ('NO_PROXY', 'no_proxy', 'http_proxy'):
+            monkeypatch.delenv(name, raising=False)
+        assert APIClient(base_url='http://example.com', headers={}, trust_env=False).session.proxies == {
+            'http': 'http://proxy.invalid:3128'
+        }
+
+        monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+        client = client_for(server, retries=0, trust_env=False)
+        server.status = 200
+
+        def environ_read(*args, **kwargs):
+            raise AssertionError("os.environ read during a request")
+
+        monkeypatch.setattr('requests.sessions.get_environ_proxies', environ_read)
+        monkeypatch.setattr('requests.sessions.get_netrc_auth', environ_read)
+        assert client.get('/users/me').status_code == 200
@@ -0,0 +1,80 @@
+import pytest
+from benchmarks import __main__ as cli, harness
+from benchmarks.harness import (
+    SCHEMA_VERSION, Benchmark, SkipBenchmark, compare, mann_whitney_p, run_benchmarks, summarize
+)
+
+
+def document(**samples):
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'benchmarks': {name: {'samples': values, **summarize(values)} for name, values in samples.items()}
+    }
+
+
+class TestBenchmarkCompare:
+    def test_mann_whitney_separates_shifted_samples(self):
+        assert mann_whitney_p([1, 2, 3, 4, 5, 6], [11, 12, 13, 14, 15, 16]) < 0.01
+        assert mann_whitney_p([1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6]) == 1.0
+
+    def test_significant_slowdown_beyond_threshold_is_a_regression(self):
+        baseline = document(hook=[10.0, 10.2, 9.9, 10.1, 10.0, 10.3, 9.8, 10.1])
+        current = document(hook=[12.0, 12.1, 11.9, 12.2, 12.0, 12.3, 11.8, 12.1])
+        [row] = compare(baseline, current, threshold=0.10)
+        assert row.status == 'regression'
+        assert row.change == pytest.approx(0.2, abs=0.01)
+
+    def test_slowdown_within_threshold_or_noise_is_ok(self):
+        baseline = document(small=[10.0, 10.2, 9.9, 10.1, 10.0, 10.3], noisy=[5.0, 20.0, 6.0, 18.0])
+        current = document(small=[10.5, 10.6, 10.4, 10.7, 10.5, 10.6], noisy=[6.0, 21.0, 7.0, 19.0])
+        assert [row.status for row in compare(baseline, current, threshold=0.10)] == ['ok', 'ok']
+
+    def test_new_missing_and_skipped_benchmarks_are_reported(self):
+        baseline = document(old=[1.0, 1.1])
+        baseline['benchmarks']['browser'] = {'skipped': 'browser unavailable'}
+        current = document(new=[1.0, 1.1], browser=[5.0, 5.1])
+        statuses = {row.name: row.status for row in compare(baseline, current)}
+        assert statuses == {'old': 'missing', 'browser': 'skipped', 'new': 'new'}
+
+    def test_other_schema_versions_are_rejected(self):
+        with pytest.raises(ValueError):
+            compare({'schema_version': 0, 'benchmarks': {}}, document())
+
+    def test_benchmark_errors_are_reported(self):
+        baseline = document(hook=[1.0, 1.1])
+        current = {'schema_version': SCHEMA_VERSION, 'benchmarks': {'hook': {'error': 'AttributeError: failed'}}}
+        [row] = compare(baseline, current)
+        assert row.status == 'error'
+
+    def test_a_broken_benchmark_does_not_stop_the_others(self, monkeypatch):
+        def broken(ctx):
+            raise AttributeError("no attribute 'failed'")
+            yield
+
+        def working(ctx):
+            yield lambda: None
+
+        monkeypatch.setattr(harness, 'BENCHMARKS', {
+            'broken': Benchmark('broken', broken, 2, 0, ''),
+            'working': Benchmark('working', working, 2, 0, '')
+        })
+        results = run_benchmarks(log=lambda line: None)['benchmarks']
+        assert results['broken'] == {'error': "AttributeError: no attribute 'failed'"}
+        assert results['working']['n'] == 2
+
+    def test_a_baseline_with_skipped_benchmarks_is_not_stored(self, monkeypatch, tmp_path):
+        def browser(ctx):
+            raise SkipBenchmark("Chrome unavailable")
+            yield
+
+        def working(ctx):
+            yield lambda: None
+
+        monkeypatch.setattr(harness, 'BENCHMARKS', {
+            'browser': Benchmark('browser', browser, 2, 0, ''),
+            'working': Benchmark('working', working, 2, 0, '')
+        })
+        monkeypatch.setattr(cli, 'BASELINE_DIR', str(tmp_path / 'baselines'))
+
+        assert cli.main(['run', '--output-dir', str(tmp_path / 'results'), '--save-baseline', 'v9']) == 1
+        assert not (tmp_path / 'baselines' / 'v9.json').exists()
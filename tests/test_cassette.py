@@ -0,0 +1,87 @@
+import pytest
+from config.api_config import APIClient
+from utils.cassette import CassetteAdapter, CassetteLibrary, UnmatchedRequestError
+from utils.stub_server import ContactListStub
+
+
+@pytest.fixture
+def stub():
+    server = ContactListStub().start()
+    yield server
+    server.stop()
+
+
+def make_client(base_url, library):
+    client = APIClient(base_url=base_url, headers={'Content-Type': 'application/json'}, retries=0)
+    client.mount(CassetteAdapter(library, client.adapter))
+    return client
+
+
+def user_payload(namespace):
+    return {
+        "firstName": "Ada",
+        "lastName": "Lovelace",
+        "email": f"ada.{namespace}@example.com",
+        "password": "Secret123!"
+    }
+
+
+class TestCassette:
+    def test_replay_serves_recorded_responses_without_network(self, stub, tmp_path):
+        recorder = CassetteLibrary(directory=str(tmp_path), mode='record', namespace='run1')
+        client = make_client(stub.url, recorder)
+        token = recorder.insert('tests/test_x.py::test_signup')
+        recorded = client.post('/users', json=user_payload('run1'))
+        recorder.eject(token)
+        client.close()
+
+        cassette_file = tmp_path / 'tests' / 'test_x' / 'test_signup.json'
+        text = cassette_file.read_text()
+        assert 'Secret123!' not in text
+        assert recorded.json()['token'] not in text
+
+        # Another run with another namespace, against a port nothing listens on
+        player = CassetteLibrary(directory=str(tmp_path), mode='strict', namespace='run2')
+        client = make_client('http://127.0.0.1:9', player)
+        token = player.insert('tests/test_x.py::test_signup')
+        replayed = client.post('/users', json=user_payload('run2'))
+        player.eject(token)
+        client.close()
+
+        assert replayed.status_code == 201
+        assert replayed.json()['user']['email'] == 'ada.run2@example.com'
+
+    def test_strict_mode_fails_on_unmatched_request(self, tmp_path):
+        library = CassetteLibrary(directory=str(tmp_path), mode='strict', namespace='run')
+        client = make_client('http://127.0.0.1:9', library)
+        token = library.insert('tests/test_x.py::test_unrecorded')
+        with pytest.raises(UnmatchedRequestError):
+            client.get('/users/me')
+        library.eject(token)
+        client.close()
+
+    def test_requests_outside_a_test_bypass_cassettes(self, stub, tmp_path):
+        library = CassetteLibrary(directory=str(tmp_path), mode='strict', namespace='run')
+        client = make_client(stub.url, library)
+        assert client.post('/users/login', json={"email": "nobody@example.com", "password": "x"}).status_code == 401
+        client.close()
+
+    def test_requests_sent_ahead_are_kept_with_their_own_test(self, stub, tmp_path):
+        recorder = CassetteLibrary(directory=str(tmp_path), mode='record', namespace='run1')
+        client = make_client(stub.url, recorder)
+        # A fixture set up inside test_first sends the request of test_second ahead of time
+        first = recorder.insert('tests/test_x.py::test_first')
+        recorder.context_for('tests/test_x.py::test_second').run(client.post, '/users', json=user_payload('run1'))
+        recorder.eject(first)
+        recorder.eject(recorder.insert('tests/test_x.py::test_second'))
+        client.close()
+
+        assert not (tmp_path / 'tests' / 'test_x' / 'test_first.json').exists()
+        assert (tmp_path / 'tests' / 'test_x' / 'test_second.json').exists()
+
+        # Replaying test_second alone, under the node id xdist gives it with --dist loadgroup
+        player = CassetteLibrary(directory=str(tmp_path), mode='strict', namespace='run2')
+        client = make_client('http://127.0.0.1:9', player)
+        context = player.context_for('tests/test_x.py::test_second@matrix')
+        assert context.run(client.post, '/users', json=user_payload('run2')).status_code == 201
+        client.close()
@@ -0,0 +1,56 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from pages.element_cache import ElementCache, document_generation
+from utils import command_timing
+from utils.command_listeners import add_command_listener
+from utils.command_timing import CommandTimer, instrument_driver
+from utils.failure_bundle import get_command_history, record_command_history
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        if params and params.get('value') == '#missing':
+            raise NoSuchElementException('no such element')
+        return {'value': None}
+
+
+class TestCommandListeners:
+    def test_listeners_share_one_wrapper_and_run_in_order(self):
+        driver = FakeDriver()
+        calls = []
+        add_command_listener(driver, lambda command, params, status, ms: calls.append(('first', command, status)))
+        wrapped = driver.execute
+        add_command_listener(driver, lambda command, params, status, ms: calls.append(('second', command, status)))
+
+        assert driver.execute is wrapped
+        with pytest.raises(NoSuchElementException):
+            driver.execute('findElement', {'using': 'css selector', 'value': '#missing'})
+        assert driver.commands == ['findElement']
+        assert calls == [('first', 'findElement', 'NoSuchElementException'),
+                         ('second', 'findElement', 'NoSuchElementException')]
+
+    def test_timing_history_and_cache_register_on_the_same_hook(self, monkeypatch):
+        monkeypatch.setattr(command_timing, '_timer', CommandTimer())
+        driver = record_command_history(FakeDriver(), size=5)
+        wrapped = driver.execute
+        instrument_driver(driver)
+        ElementCache(driver)
+
+        assert driver.execute is wrapped
+        driver.execute('get', {'url': 'http://localhost/addUser'})
+        assert driver.commands == ['get']
+        assert [entry['command'] for entry in get_command_history(driver)] == ['get']
+        assert [row[1] for row in command_timing.get_command_timer().drain()] == ['get']
+        assert document_generation(driver) == 1
+
+    def test_drivers_without_execute_are_not_hooked(self):
+        class NoExecute:
+            pass
+        assert add_command_listener(NoExecute(), lambda *args: None) is False
@@ -0,0 +1,78 @@
+import csv
+import json
+import pytest
+from utils import command_timing
+from utils.command_timing import CommandTimer, TimingReport, instrument_driver, time_driver_start, timed_step
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {'value': None}
+
+
+class FakePage:
+    def __init__(self, driver):
+        self.driver = driver
+
+    @timed_step
+    def wait_for_element(self, locator):
+        return self.driver.execute('findElement', {'using': locator[0], 'value': locator[1]})
+
+    @timed_step
+    def click(self, locator):
+        self.wait_for_element(locator)
+        return self.driver.execute('clickElement', {'id': 'element-1'})
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    """
+    Install a fresh timer for this test only, leaving the session's timer alone
+    """
+    timer = CommandTimer()
+    monkeypatch.setattr(command_timing, '_timer', timer)
+    return timer
+
+
+class TestCommandTiming:
+    def test_disabled_timing_leaves_driver_untouched(self, monkeypatch):
+        monkeypatch.setattr(command_timing, '_timer', None)
+        driver = FakeDriver()
+        assert instrument_driver(driver) is driver
+        assert 'execute' not in vars(driver)
+        FakePage(driver).click(('id', 'submit'))
+        assert driver.commands == ['findElement', 'clickElement']
+
+    def test_records_driver_start_commands_and_outermost_steps(self, timer):
+        driver = time_driver_start(FakeDriver)
+        FakePage(driver).click(('id', 'submit'))
+
+        rows = {(kind, name, locator): count for kind, name, locator, count, total, peak in timer.drain()}
+        assert rows == {
+            ('driver', 'create', None): 1,
+            ('command', 'findElement', 'id=submit'): 1,
+            ('command', 'clickElement', None): 1,
+            ('step', 'FakePage.click', 'id=submit'): 1
+        }
+        assert timer.drain() == []
+
+    def test_report_aggregates_tests_and_writes_artifacts(self, tmp_path):
+        report = TimingReport()
+        report.add('test_a', [['step', 'Page.click', 'id=submit', 2, 30.0, 20.0]])
+        report.add('test_b', [
+            ['step', 'Page.click', 'id=submit', 1, 50.0, 50.0],
+            ['step', 'Page.input_text', 'id=email', 1, 5.0, 5.0]
+        ])
+
+        assert report.session_rows()[0] == ['step', 'Page.click', 'id=submit', 3, 80.0, 50.0]
+        assert report.slowest_locators(limit=1) == [['id=submit', 3, 80.0]]
+
+        json_path, csv_path = report.write(str(tmp_path))
+        with open(json_path) as f:
+            assert set(json.load(f)['tests']) == {'test_a', 'test_b'}
+        with open(csv_path) as f:
+            assert len(list(csv.reader(f))) == 3
@@ -0,0 +1,19 @@
+import pytest
+import logging
+from pages.contact_list_page import ContactListPage
+
+logger = logging.getLogger('test_logger')
+
+class TestContactList:
+    @pytest.mark.ui
+    @pytest.mark.positive
+    def test_contact_list_opens_for_logged_in_user(self, logged_in_driver):
+        """Test that a user logged in through the API lands on the Contact List page directly"""
+        logger.info("Starting contact list access test")
+        
+        contact_list_page = ContactListPage(logged_in_driver)
+        contact_list_page.open()
+        
+        assert contact_list_page.is_displayed(), "Contact List page was not displayed for a logged-in user"
+        
+        logger.info("Contact list access test completed successfully")
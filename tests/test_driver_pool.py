@@ -0,0 +1,95 @@
+from selenium.common.exceptions import WebDriverException
+from config.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    """Minimal stand-in for a WebDriver so the pool can be tested without a browser"""
+
+    def __init__(self):
+        self.handles = ['main']
+        self.current_handle = 'main'
+        self.switch_to = FakeSwitchTo(self)
+        self.crashed = False
+        self.quit_called = False
+        self.visited = []
+
+    @property
+    def window_handles(self):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        return list(self.handles)
+
+    def close(self):
+        self.handles.remove(self.current_handle)
+
+    def execute_script(self, script):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverPool:
+    def test_released_driver_is_reused_after_reset(self):
+        pool = DriverPool(factory=FakeDriver, max_size=1, max_uses=10)
+        driver = pool.acquire()
+        driver.handles.append('popup')
+
+        pool.release(driver)
+
+        assert pool.acquire() is driver
+        assert driver.handles == ['main']
+        assert driver.visited[-1] == 'about:blank'
+
+    def test_crashed_driver_is_recycled(self):
+        pool = DriverPool(factory=FakeDriver, max_size=1, max_uses=10)
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.crashed = True
+
+        replacement = pool.acquire()
+
+        assert replacement is not driver
+        assert driver.quit_called
+
+    def test_worn_out_driver_is_quit(self):
+        pool = DriverPool(factory=FakeDriver, max_size=1, max_uses=1)
+        driver = pool.acquire()
+
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.acquire() is not driver
+
+    def test_pooling_can_be_disabled(self):
+        pool = DriverPool(factory=FakeDriver, max_size=0, max_uses=10)
+        driver = pool.acquire()
+
+        pool.release(driver)
+
+        assert driver.quit_called
+
+    def test_shutdown_quits_unreleased_drivers(self):
+        pool = DriverPool(factory=FakeDriver, max_size=1, max_uses=10)
+        leaked = pool.acquire()
+
+        pool.shutdown()
+
+        assert leaked.quit_called
@@ -0,0 +1,133 @@
+from utils import duration_history
+from utils.duration_history import UNSEEN_DEFAULT, DurationHistory, predict, simulate_makespan
+from utils.duration_scheduler import DurationScheduling
+
+
+class FakeConfig:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name):
+        return None
+
+
+class FakeGateway:
+    def __init__(self, name):
+        self.id = name
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = FakeGateway(name)
+        self.shutting_down = False
+        self.received = []
+
+    def send_runtest_some(self, indices):
+        self.received.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakeReport:
+    def __init__(self, nodeid, when='call', duration=1.0):
+        self.nodeid = nodeid
+        self.when = when
+        self.duration = duration
+        self.outcome = 'passed'
+
+
+def run(durations):
+    return {nodeid: {"setup": 0.0, "call": seconds, "teardown": 0.0, "outcome": "passed"}
+            for nodeid, seconds in durations.items()}
+
+
+class TestDurationHistory:
+    def test_prediction_is_the_median_of_recent_runs(self, tmp_path):
+        history = DurationHistory(str(tmp_path / 'durations.db'))
+        for seconds in (1.0, 9.0, 2.0):
+            history.record_run(run({'tests/test_a.py::test_slow': seconds}))
+
+        assert history.known_durations() == {'tests/test_a.py::test_slow': 2.0}
+
+    def test_old_runs_are_pruned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(duration_history, 'KEPT_RUNS', 2)
+        history = DurationHistory(str(tmp_path / 'durations.db'))
+        history.record_run(run({'tests/test_a.py::test_gone': 1.0}))
+        history.record_run(run({'tests/test_a.py::test_kept': 1.0}))
+        history.record_run(run({'tests/test_a.py::test_kept': 3.0}))
+
+        assert history.known_durations() == {'tests/test_a.py::test_kept': 2.0}
+
+    def test_unseen_tests_get_module_then_overall_defaults(self):
+        known = {'tests/test_ui.py::test_one': 8.0, 'tests/test_ui.py::test_two': 6.0, 'tests/test_api.py::test_x': 0.2}
+
+        predictions, unseen = predict(['tests/test_ui.py::test_new', 'tests/test_new.py::test_y'], known)
+
+        assert predictions == {'tests/test_ui.py::test_new': 7.0, 'tests/test_new.py::test_y': 6.0}
+        assert unseen == {'tests/test_ui.py::test_new', 'tests/test_new.py::test_y'}
+        assert predict(['tests/test_x.py::test_z'], {})[0] == {'tests/test_x.py::test_z': UNSEEN_DEFAULT}
+
+    def test_longest_first_balances_workers(self):
+        predictions = {'slow': 6.0, 'mid_a': 3.0, 'mid_b': 3.0, 'fast_a': 1.0, 'fast_b': 1.0}
+
+        result = simulate_makespan(list(predictions), predictions, workers=2)
+
+        assert result.makespan == 7.0
+        assert sorted(result.loads) == [7.0, 7.0]
+
+
+class TestDurationScheduling:
+    def test_tests_are_handed_out_longest_first_to_the_first_free_worker(self):
+        seconds = [0.1, 9.0, 0.5, 4.0, 0.2]
+        collection = [f"tests/test_mixed.py::test_{index}" for index in range(len(seconds))]
+        scheduler = DurationScheduling(FakeConfig(2), known=dict(zip(collection, seconds)))
+        nodes = [FakeNode('gw0'), FakeNode('gw1')]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(node, collection)
+
+        scheduler.schedule()
+
+        # Each worker holds the test it runs and the next one
+        assert nodes[0].received == [1, 2]
+        assert nodes[1].received == [3, 4]
+        assert scheduler.pending == [0]
+
+        scheduler.mark_test_complete(nodes[1], 3)
+        assert nodes[1].received == [3, 4, 0]
+        assert not nodes[0].shutting_down
+
+        scheduler.mark_test_complete(nodes[0], 1)
+        assert nodes[0].shutting_down
+
+    def test_xdist_groups_are_handed_out_whole_longest_group_first(self):
+        # Under --dist loadgroup xdist suffixes grouped node ids with @group
+        collection = [
+            'tests/test_api.py::test_case[a]@matrix', 'tests/test_api.py::test_case[b]@matrix',
+            'tests/test_api.py::test_case[c]@matrix', 'tests/test_ui.py::test_slow', 'tests/test_ui.py::test_fast',
+        ]
+        known = {'tests/test_api.py::test_case[a]': 2.0, 'tests/test_api.py::test_case[b]': 2.0,
+                 'tests/test_api.py::test_case[c]': 2.0, 'tests/test_ui.py::test_slow': 5.0,
+                 'tests/test_ui.py::test_fast': 0.5}
+        scheduler = DurationScheduling(FakeConfig(2), known=known)
+        nodes = [FakeNode('gw0'), FakeNode('gw1')]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(node, collection)
+
+        scheduler.schedule()
+
+        # The 6 s group goes first and whole, to one worker
+        assert nodes[0].received == [0, 1, 2]
+        assert nodes[1].received == [3, 4]
+        assert scheduler.pending == []
+
+    def test_history_is_recorded_without_the_group_suffix(self, tmp_path):
+        report = duration_history.DurationReport(DurationHistory(str(tmp_path / 'durations.db')))
+        report.add(FakeReport('tests/test_api.py::test_case[a]@matrix'), 'gw0')
+
+        assert list(report.durations) == ['tests/test_api.py::test_case[a]']
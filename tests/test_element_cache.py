@@ -0,0 +1,94 @@
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+EMAIL = (By.ID, "email")
+
+
+class FakeElement:
+    def __init__(self, value=''):
+        self.value = value
+        self.stale = False
+
+    def get_attribute(self, name):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        return self.value
+
+    def clear(self):
+        self.get_attribute('value')
+        self.value = ''
+
+    def send_keys(self, text):
+        self.get_attribute('value')
+        self.value += text
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {'value': None}
+
+    def get(self, url):
+        self.execute('get', {'url': url})
+
+
+class CountingWaiter:
+    """Stands in for DomWaiter: hands out a new element per lookup"""
+
+    def __init__(self):
+        self.lookups = 0
+        self.elements = []
+
+    def until(self, condition, locator=None, expected=None, timeout=10):
+        self.lookups += 1
+        self.elements.append(FakeElement())
+        return self.elements[-1]
+
+
+def make_page():
+    page = BasePage(FakeDriver())
+    page.waiter = CountingWaiter()
+    return page
+
+
+class TestElementCache:
+    def test_repeated_interactions_reuse_the_element(self):
+        page = make_page()
+        page.input_text(EMAIL, "a@example.com")
+        page.input_text(EMAIL, "b@example.com")
+
+        assert page.get_element_value(EMAIL) == "b@example.com"
+        assert page.waiter.lookups == 1
+        assert page.element_cache.stats()['hits'] == 2
+        assert page.element_cache.stats()['misses'] == 1
+
+    def test_navigation_empties_the_cache(self):
+        page = make_page()
+        page.input_text(EMAIL, "a@example.com")
+        page.driver.get("http://localhost/addUser")
+        page.input_text(EMAIL, "b@example.com")
+
+        assert page.waiter.lookups == 2
+
+    def test_stale_reference_is_resolved_once_more(self):
+        page = make_page()
+        page.input_text(EMAIL, "a@example.com")
+        page.waiter.elements[0].stale = True
+
+        page.input_text(EMAIL, "b@example.com")
+
+        assert page.waiter.lookups == 2
+        assert page.get_element_value(EMAIL) == "b@example.com"
+
+    def test_presence_does_not_satisfy_a_clickable_lookup(self):
+        page = make_page()
+        page.wait_for_element(EMAIL)
+        assert page.element_cache.get(EMAIL, 'clickable') is None
+        assert page.element_cache.get(EMAIL, 'presence') is page.waiter.elements[0]
@@ -0,0 +1,72 @@
+import json
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from utils.failure_bundle import collect_failure_bundle, get_command_history, record_command_history
+
+
+class FakeDriver:
+    current_url = 'http://localhost/addUser'
+    title = 'Add User'
+    page_source = '<html><body><form id="add-user"></form></body></html>'
+
+    def execute(self, driver_command, params=None):
+        if params and params.get('value') == '#missing':
+            raise NoSuchElementException('no such element')
+        return {'value': None}
+
+    def get_screenshot_as_png(self):
+        return b'\x89PNG fake'
+
+    def get_log(self, log_type):
+        return [{'level': 'SEVERE', 'message': 'Uncaught TypeError'}]
+
+
+class TestFailureBundle:
+    def test_commands_are_recorded_without_typed_text(self):
+        driver = record_command_history(FakeDriver(), size=2)
+        driver.execute('get', {'url': 'http://localhost/addUser'})
+        driver.execute('findElement', {'using': 'css selector', 'value': '#firstName'})
+        driver.execute('sendKeysToElement', {'id': 'e1', 'text': 'secret', 'value': ['s', 'e', 'c']})
+
+        history = get_command_history(driver)
+        assert [entry['command'] for entry in history] == ['findElement', 'sendKeysToElement']
+        assert history[0]['target'] == 'css selector=#firstName'
+        assert history[1]['target'] is None
+
+    def test_failed_commands_keep_their_error(self):
+        driver = record_command_history(FakeDriver(), size=5)
+        try:
+            driver.execute('findElement', {'using': 'css selector', 'value': '#missing'})
+        except NoSuchElementException:
+            pass
+        assert get_command_history(driver)[-1]['status'] == 'NoSuchElementException'
+
+    def test_history_can_be_disabled(self):
+        driver = FakeDriver()
+        assert record_command_history(driver, size=0) is driver
+        driver.execute('get', {'url': 'http://localhost'})
+        assert get_command_history(driver) == []
+
+    def test_bundle_is_written(self, tmp_path):
+        driver = record_command_history(FakeDriver(), size=5)
+        driver.execute('get', {'url': 'http://localhost/addUser'})
+
+        paths = collect_failure_bundle(driver, str(tmp_path), 'tests/test_x.py::test_y', 'call')
+
+        assert set(paths) == {'screenshot', 'page_source', 'console', 'commands', 'bundle'}
+        bundle = json.loads((tmp_path / 'bundle.json').read_text())
+        assert bundle['url'] == 'http://localhost/addUser'
+        assert bundle['phase'] == 'call'
+        assert bundle['files']['screenshot'] == 'screenshot.png'
+        assert json.loads((tmp_path / 'console.json').read_text())[0]['level'] == 'SEVERE'
+        assert json.loads((tmp_path / 'commands.json').read_text())[0]['command'] == 'get'
+
+    def test_pieces_the_browser_cannot_deliver_are_skipped(self, tmp_path):
+        class NoLogDriver(FakeDriver):
+            def get_log(self, log_type):
+                raise WebDriverException('log type browser not found')
+
+        paths = collect_failure_bundle(NoLogDriver(), str(tmp_path))
+
+        assert 'console' not in paths
+        assert 'screenshot' in paths
+        assert 'console_error' in json.loads((tmp_path / 'bundle.json').read_text())
@@ -0,0 +1,46 @@
+import sys
+from utils.fast_lane import StartupTimer, has_api_tests, is_fast_lane, loaded_heavy_modules
+
+
+class FakeOption:
+    def __init__(self, markexpr):
+        self.markexpr = markexpr
+
+
+class FakeConfig:
+    def __init__(self, api_only=False, markexpr=''):
+        self.api_only = api_only
+        self.option = FakeOption(markexpr)
+
+    def getoption(self, name):
+        return self.api_only
+
+
+class TestFastLane:
+    def test_lane_is_selected_by_flag_or_api_marker(self):
+        assert is_fast_lane(FakeConfig(api_only=True))
+        assert is_fast_lane(FakeConfig(markexpr=' api '))
+        assert not is_fast_lane(FakeConfig(markexpr='api and not negative'))
+        assert not is_fast_lane(FakeConfig())
+
+    def test_modules_without_api_tests_are_recognized_from_source(self, tmp_path):
+        api_module = tmp_path / 'test_api.py'
+        api_module.write_text('import pytest\n\n@pytest.mark.api\ndef test_x():\n    pass\n')
+        ui_module = tmp_path / 'test_ui.py'
+        ui_module.write_text('import pytest\n\n@pytest.mark.ui\ndef test_y():\n    pass\n')
+
+        assert has_api_tests(api_module)
+        assert not has_api_tests(ui_module)
+
+    def test_startup_is_measured_until_the_first_test(self):
+        timer = StartupTimer(started=0.0)
+        timer.marks.update({'conftest_imported': 0.1, 'collection_started': 0.2, 'collection_finished': 0.5})
+        assert timer.startup_seconds() == 0.5
+        assert round(timer.span('collection_started', 'collection_finished'), 3) == 0.3
+
+        timer.marks['first_test'] = 0.6
+        assert timer.startup_seconds() == 0.6
+
+    def test_heavy_modules_are_reported_once_loaded(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'selenium.webdriver', object())
+        assert 'selenium.webdriver' in loaded_heavy_modules()
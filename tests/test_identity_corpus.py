@@ -0,0 +1,50 @@
+import pytest
+from utils.identity_corpus import IdentityCorpus, build_corpus
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    return build_corpus(str(tmp_path / "identities.bin"), count=200, seed=42)
+
+
+class TestIdentityCorpus:
+    def test_identities_are_unique_and_complete(self, corpus_path):
+        corpus = IdentityCorpus(corpus_path)
+        identities = [corpus[i] for i in range(len(corpus))]
+        corpus.close()
+
+        assert len({identity["email"] for identity in identities}) == 200
+        assert all(identity["first_name"] and identity["last_name"] for identity in identities)
+        assert all(len(identity["password"]) == 10 for identity in identities)
+
+    def test_same_seed_builds_the_same_corpus(self, tmp_path, corpus_path):
+        other_path = build_corpus(str(tmp_path / "other.bin"), count=200, seed=42)
+        first, second = IdentityCorpus(corpus_path), IdentityCorpus(other_path)
+
+        assert first[123] == second[123]
+        first.close()
+        second.close()
+
+    def test_namespace_changes_only_the_email(self, corpus_path):
+        plain, namespaced = IdentityCorpus(corpus_path), IdentityCorpus(corpus_path, namespace="run7")
+
+        assert namespaced[0]["first_name"] == plain[0]["first_name"]
+        assert namespaced[0]["email"] != plain[0]["email"]
+        assert "run7" in namespaced[0]["email"]
+        plain.close()
+        namespaced.close()
+
+    def test_worker_streams_do_not_overlap(self, corpus_path):
+        corpus = IdentityCorpus(corpus_path)
+        gw0 = {corpus.for_worker("gw0", i, worker_count=2)["email"] for i in range(50)}
+        gw1 = {corpus.for_worker("gw1", i, worker_count=2)["email"] for i in range(50)}
+        corpus.close()
+
+        assert not gw0 & gw1
+
+    def test_index_past_the_end_is_rejected(self, corpus_path):
+        corpus = IdentityCorpus(corpus_path)
+
+        with pytest.raises(IndexError):
+            corpus.for_test(50)
+        corpus.close()
@@ -0,0 +1,55 @@
+from utils.load_runner import LATENCY_BUCKETS_MS, latency_histogram, percentile, summarize
+
+
+def result(latency_ms, t=0.0, endpoint="POST /users", error=None):
+    return {"latency_ms": latency_ms, "t": t, "endpoint": endpoint, "error": error}
+
+
+class TestLoadSummary:
+    def test_percentiles_use_the_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile(list(range(1, 11)), 50) == 5
+        assert percentile(list(range(1, 11)), 55) == 6
+        assert percentile([7.5], 99) == 7.5
+        assert percentile([], 50) is None
+
+    def test_histogram_counts_each_latency_in_its_upper_bound_bucket(self):
+        counts = latency_histogram([0.4, 1, 1.5, 10, 10.1, 20000])
+
+        assert counts["<=1"] == 2
+        assert counts["<=2"] == 1
+        assert counts["<=10"] == 1
+        assert counts["<=20"] == 1
+        assert counts[f">{LATENCY_BUCKETS_MS[-1]}"] == 1
+        assert sum(counts.values()) == 6
+
+    def test_summary_per_endpoint_and_per_second(self):
+        results = [
+            result(10, t=0.1), result(20, t=0.5), result(30, t=1.2, error="HTTP 500"),
+            result(40, t=1.9, endpoint="POST /users/login"),
+        ]
+
+        summary = summarize(results, elapsed=2.0)
+
+        total = summary["total"]
+        assert total["requests"] == 4 and total["errors"] == 1
+        assert total["error_rate"] == 0.25
+        assert total["throughput_rps"] == 2.0
+        assert total["latency_ms"] == {"p50": 20, "p95": 40, "p99": 40, "max": 40, "mean": 25.0}
+        assert summary["endpoints"]["POST /users"]["latency_ms"]["p50"] == 20
+        assert summary["endpoints"]["POST /users/login"]["requests"] == 1
+        assert summary["throughput_timeline"] == [
+            {"second": 0, "requests": 2, "errors": 0},
+            {"second": 1, "requests": 2, "errors": 1},
+        ]
+        assert summary["error_kinds"] == {"HTTP 500": 1}
+
+    def test_empty_run(self):
+        summary = summarize([], elapsed=0)
+        assert summary["total"]["requests"] == 0
+        assert summary["total"]["latency_ms"]["p50"] is None
+        assert summary["total"]["throughput_rps"] == 0
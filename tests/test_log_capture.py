@@ -0,0 +1,48 @@
+import logging
+from utils.log_capture import PhaseLogCapture
+
+
+def make_logger(handler):
+    logger = logging.getLogger('log_capture_test')
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+class TestPhaseLogCapture:
+    def test_drain_returns_only_records_since_previous_drain(self):
+        capture = PhaseLogCapture()
+        logger = make_logger(capture)
+
+        logger.info("first test")
+        capture.drain()
+        logger.info("second test")
+        text = capture.drain()
+
+        assert "second test" in text
+        assert "first test" not in text
+        assert capture.drain() == ""
+
+    def test_ring_buffer_marks_dropped_records(self):
+        capture = PhaseLogCapture(max_records=3)
+        logger = make_logger(capture)
+
+        for i in range(5):
+            logger.info(f"record {i}")
+        text = capture.drain()
+
+        assert text.startswith("... 2 earlier log records truncated ...")
+        assert "record 1" not in text
+        assert "record 4" in text
+
+    def test_size_cap_keeps_the_most_recent_output(self):
+        capture = PhaseLogCapture(max_chars=100)
+        logger = make_logger(capture)
+
+        for i in range(20):
+            logger.info(f"record {i}")
+        text = capture.drain()
+
+        assert "characters truncated" in text.splitlines()[0]
+        assert text.endswith("record 19")
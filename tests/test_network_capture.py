@@ -0,0 +1,86 @@
+import json
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from utils.network_capture import NetworkCapture
+
+
+def log_entry(method, **params):
+    return {'level': 'INFO', 'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def request_sent(request_id, method, url, timestamp, post_data=None):
+    request = {'url': url, 'method': method, 'headers': {}}
+    if post_data is not None:
+        request['postData'] = post_data
+    return log_entry('Network.requestWillBeSent', requestId=request_id, request=request,
+                     timestamp=timestamp, type='Fetch')
+
+
+class FakeDriver:
+    """Hands out one batch of performance log entries per get_log call"""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.bodies = {}
+
+    def get_log(self, log_type):
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.getResponseBody':
+            return {'body': self.bodies[params['requestId']], 'base64Encoded': False}
+        raise WebDriverException('No post data available for the request')
+
+
+class TestNetworkCapture:
+    def test_exchange_is_assembled_from_network_events(self):
+        payload = json.dumps({'email': 'user@example.com'})
+        driver = FakeDriver([
+            request_sent('1', 'GET', 'http://localhost/addUser', 1.0),
+            request_sent('2', 'POST', 'http://localhost/users', 2.0, payload),
+            log_entry('Network.responseReceived', requestId='2', response={'status': 400, 'headers': {}}),
+            log_entry('Network.loadingFinished', requestId='2', timestamp=2.125),
+        ])
+        driver.bodies['2'] = '{"message": "Email address is already in use"}'
+
+        exchange = NetworkCapture(driver).wait_for('POST', '/users', timeout=1)
+
+        assert exchange.url == 'http://localhost/users'
+        assert exchange.request_json == {'email': 'user@example.com'}
+        assert exchange.status == 400
+        assert exchange.response_json['message'] == 'Email address is already in use'
+        assert exchange.duration_ms == 125.0
+
+    def test_wait_returns_once_the_response_has_finished(self):
+        driver = FakeDriver(
+            [request_sent('7', 'POST', 'http://localhost/users', 1.0, '{}')],
+            [],
+            [log_entry('Network.responseReceived', requestId='7', response={'status': 201, 'headers': {}}),
+             log_entry('Network.loadingFinished', requestId='7', timestamp=1.5)],
+        )
+        driver.bodies['7'] = '{}'
+
+        assert NetworkCapture(driver).wait_for('POST', '/users', timeout=2).status == 201
+
+    def test_mark_forgets_earlier_requests(self):
+        driver = FakeDriver(
+            [request_sent('1', 'POST', 'http://localhost/users', 1.0, '{}'),
+             log_entry('Network.loadingFinished', requestId='1', timestamp=1.1)],
+        )
+        capture = NetworkCapture(driver)
+        capture.mark()
+
+        assert capture.exchanges('POST', '/users') == []
+        with pytest.raises(TimeoutException):
+            capture.wait_for('POST', '/users', timeout=0.3)
+
+    def test_failed_requests_carry_their_error(self):
+        driver = FakeDriver([
+            request_sent('3', 'POST', 'http://localhost/users', 1.0, '{}'),
+            log_entry('Network.loadingFailed', requestId='3', timestamp=1.2, errorText='net::ERR_CONNECTION_REFUSED'),
+        ])
+
+        exchange = NetworkCapture(driver).wait_for('POST', '/users', timeout=1)
+
+        assert exchange.error == 'net::ERR_CONNECTION_REFUSED'
+        assert exchange.response_body is None
@@ -0,0 +1,42 @@
+import os
+from utils.screenshots import ScreenshotService
+
+
+class FakeDriver:
+    def __init__(self, png):
+        self.png = png
+
+    def get_screenshot_as_png(self):
+        return self.png
+
+
+class TestScreenshotService:
+    def test_names_do_not_collide_within_the_same_second(self, tmp_path):
+        service = ScreenshotService(directory=str(tmp_path))
+        driver = FakeDriver(b'frame')
+
+        paths = {service.capture(driver, 'step') for _ in range(20)}
+        service.shutdown()
+
+        assert len(paths) == 20
+        assert all(os.path.exists(path) for path in paths)
+
+    def test_identical_frames_are_stored_once(self, tmp_path):
+        service = ScreenshotService(directory=str(tmp_path), max_workers=1)
+
+        first = service.capture(FakeDriver(b'same'), 'first')
+        service.flush()
+        second = service.capture(FakeDriver(b'same'), 'second')
+        service.shutdown()
+
+        assert os.path.samefile(first, second)
+
+    def test_fixed_filename_is_overwritten_with_latest_frame(self, tmp_path):
+        service = ScreenshotService(directory=str(tmp_path), max_workers=1)
+
+        service.capture(FakeDriver(b'old'), 'last', filename='last.png')
+        path = service.capture(FakeDriver(b'new'), 'last', filename='last.png')
+        service.shutdown()
+
+        with open(path, 'rb') as f:
+            assert f.read() == b'new'
@@ -0,0 +1,99 @@
+import pytest
+from utils.identity_corpus import build_corpus, IdentityCorpus
+from utils.sql_rows import RowOutcomes, RowSource, build_source, iter_chunks, row_email
+
+
+class FakeReport:
+    def __init__(self, when, outcome='passed', row=('test_users', 1), nodeid='tests/test_x.py::test_row[row1]'):
+        self.when = when
+        self.outcome = outcome
+        self.failed = outcome == 'failed'
+        self.skipped = outcome == 'skipped'
+        self.duration = 0.5
+        self.nodeid = nodeid
+        self.user_properties = [("sql_row", row)] if row else []
+
+
+class CountingCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetches = []
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        self.fetches.append(len(chunk))
+        return chunk
+
+
+@pytest.fixture
+def source(tmp_path):
+    corpus_path = build_corpus(str(tmp_path / 'identities.bin'), count=50, seed=1)
+    corpus = IdentityCorpus(corpus_path)
+    path = build_source(str(tmp_path / 'rows.db'), 20, corpus)
+    corpus.close()
+    source = RowSource(path, chunk_size=7)
+    yield source
+    source.close()
+
+
+def finish(outcomes, row_id, call_outcome):
+    nodeid = f'tests/test_x.py::test_row[row{row_id}]'
+    for when, outcome in (('setup', 'passed'), ('call', call_outcome), ('teardown', 'passed')):
+        outcomes.add(FakeReport(when, outcome, row=('test_users', row_id), nodeid=nodeid))
+
+
+class TestRowSource:
+    def test_cursor_is_read_in_chunks(self):
+        cursor = CountingCursor(range(10))
+        assert list(iter_chunks(cursor, 4)) == list(range(10))
+        assert cursor.fetches == [4, 4, 2, 0]
+
+    def test_row_ids_are_streamed_and_rows_loaded_by_id(self, source):
+        row_ids = source.row_ids('test_users')
+
+        assert next(row_ids) == 1
+        assert list(row_ids) == list(range(2, 21))
+        assert list(source.row_ids('test_users', limit=3)) == [1, 2, 3]
+        row = source.get_row('test_users', 5)
+        assert row['id'] == 5 and row['email'].count('.') == 3  # first.last.index@example.com, no namespace
+
+    def test_failed_rows_are_selected_for_a_rerun(self, source):
+        outcomes = RowOutcomes(source, flush_every=2)
+        finish(outcomes, 1, 'passed')
+        finish(outcomes, 2, 'failed')
+        finish(outcomes, 3, 'passed')
+        outcomes.flush()
+
+        assert list(source.row_ids('test_users', 'failed')) == [2]
+        assert list(source.row_ids('test_users', 'pending')) == [2] + list(range(4, 21))
+        assert source.outcome_counts('test_users') == {'passed': 2, 'failed': 1}
+
+    def test_rerun_replaces_the_previous_outcome(self, source):
+        outcomes = RowOutcomes(source)
+        finish(outcomes, 4, 'failed')
+        outcomes.flush()
+        finish(outcomes, 4, 'passed')
+        outcomes.flush()
+
+        assert list(source.row_ids('test_users', 'failed')) == []
+
+    def test_setup_failure_is_an_error(self, source):
+        outcomes = RowOutcomes(source)
+        outcomes.add(FakeReport('setup', 'failed'))
+        outcomes.add(FakeReport('teardown'))
+        outcomes.add(FakeReport('setup', row=None))
+
+        assert outcomes.counts == {'error': 1}
+
+    def test_rows_register_with_the_run_namespace(self, monkeypatch):
+        monkeypatch.setenv('IDENTITY_NAMESPACE', 'run7')
+        monkeypatch.setattr('utils.identity_corpus._run_namespace', None)
+
+        assert row_email('ada.lovelace.5@example.com') == 'ada.lovelace.5.run7.rows@example.com'
+
+    def test_missing_source_has_no_rows(self, tmp_path):
+        assert list(RowSource(str(tmp_path / 'missing.db')).row_ids('test_users')) == []
+
+    def test_table_names_are_not_interpolated(self, source):
+        with pytest.raises(ValueError):
+            list(source.row_ids('test_users; DROP TABLE test_users'))
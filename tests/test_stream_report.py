@@ -0,0 +1,79 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+import requests
+from utils.stream_report import StreamingReporter, api_payload
+
+NODEID = "tests/test_example.py::TestExample::test_login[user-1]"
+
+
+def phase(when, outcome="passed", longrepr=None):
+    return SimpleNamespace(
+        nodeid=NODEID, when=when, outcome=outcome, duration=0.5, longrepr=longrepr,
+        sections=[], location=("tests/test_example.py", 10, "TestExample.test_login")
+    )
+
+
+def read_shard(directory, worker):
+    with open(directory / f"shard-{worker}.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestStreamingReporter:
+    def test_record_is_written_after_teardown_with_linked_artifacts(self, tmp_path):
+        reporter = StreamingReporter(directory=str(tmp_path), worker_id="gw1")
+        reporter.start("Report", {"Browser": "Chrome"}, ["gw0", "gw1"])
+        reporter.add_report(phase("setup"))
+        reporter.add_report(phase("call", "failed", "AssertionError: boom"))
+        reporter.add_artifact(NODEID, "Test Logs", "line 1\nline 2", "log")
+        assert not (tmp_path / "shard-gw1.jsonl").exists()
+
+        reporter.add_report(phase("teardown"))
+        reporter.close()
+
+        [record] = read_shard(tmp_path, "gw1")
+        assert record["outcome"] == "failed"
+        assert record["duration"] == 1.5
+        with open(tmp_path / record["detail"]) as f:
+            detail = json.load(f)
+        assert detail["phases"]["call"]["longrepr"] == "AssertionError: boom"
+        [artifact] = detail["artifacts"]
+        assert (tmp_path / artifact["path"]).read_text() == "line 1\nline 2"
+
+        with open(tmp_path / "manifest.json") as f:
+            manifest = json.load(f)
+        assert manifest["shards"] == ["shard-gw0.jsonl", "shard-gw1.jsonl"]
+        assert manifest["metadata"] == {"Browser": "Chrome"}
+
+    def test_setup_failure_is_an_error(self, tmp_path):
+        reporter = StreamingReporter(directory=str(tmp_path))
+        reporter.add_report(phase("setup", "failed", "fixture failed"))
+        reporter.add_report(phase("teardown"))
+        reporter.close()
+        assert read_shard(tmp_path, "master")[0]["outcome"] == "error"
+
+    def test_controller_does_not_write_records(self, tmp_path):
+        reporter = StreamingReporter(directory=str(tmp_path), write_records=False)
+        reporter.add_report(phase("setup"))
+        reporter.add_report(phase("teardown"))
+        assert not (tmp_path / "shard-master.jsonl").exists()
+
+    def test_api_payload_masks_passwords_and_tokens(self):
+        response = requests.Response()
+        response.status_code = 201
+        response.headers['Set-Cookie'] = 'token=abc'
+        response._content = json.dumps({"user": {"email": "a@example.com"}, "token": "abc"}).encode()
+        response.request = requests.Request(
+            'POST', 'http://localhost/users', headers={'Authorization': 'Bearer abc'},
+            json={"email": "a@example.com", "password": "Secret123"}
+        ).prepare()
+        response.elapsed = timedelta(milliseconds=5)
+
+        payload = api_payload(response)
+
+        assert payload["request"]["body"] == {"email": "a@example.com", "password": "***"}
+        assert payload["request"]["headers"]["Authorization"] == "***"
+        assert payload["response"]["body"] == {"user": {"email": "a@example.com"}, "token": "***"}
+        assert payload["response"]["headers"]["Set-Cookie"] == "***"
+        assert "abc" not in json.dumps(payload) and "Secret123" not in json.dumps(payload)
+
@@ -0,0 +1,113 @@
+import pytest
+import requests
+from utils.stub_server import ContactListStub, validate_contact, validate_user
+
+USER = {"firstName": "Ada", "lastName": "Lovelace", "email": "Ada@Example.com", "password": "Analytical1"}
+CONTACT = {"firstName": "Charles", "lastName": "Babbage", "email": "charles@example.com", "phone": "5550100"}
+
+
+@pytest.fixture
+def stub():
+    stub = ContactListStub().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def session(stub):
+    with requests.Session() as session:
+        yield session
+
+
+def signup(stub, session, user=USER):
+    response = session.post(f"{stub.url}/users", json=user)
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+class TestValidation:
+    def test_user_errors_carry_the_real_app_messages(self):
+        user, error = validate_user({"firstName": " ", "lastName": "L" * 21, "email": "nope", "password": "short"})
+
+        assert user is None
+        assert error["_message"] == "User validation failed"
+        assert error["errors"]["firstName"]["message"] == "Path `firstName` is required."
+        assert error["errors"]["lastName"]["kind"] == "maxlength"
+        assert error["errors"]["email"]["message"] == "Email is invalid"
+        assert error["errors"]["password"]["message"] == (
+            "Path `password` (`short`) is shorter than the minimum allowed length (7)."
+        )
+
+    def test_valid_user_is_trimmed_and_lowercased(self):
+        user, error = validate_user({**USER, "firstName": " Ada "})
+
+        assert error is None
+        assert user == {"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com", "password": "Analytical1"}
+
+    def test_contact_patch_checks_only_the_given_fields(self):
+        assert validate_contact({"phone": "5550100"}, partial=True) == ({"phone": "5550100"}, None)
+        _, error = validate_contact({"phone": "not a phone"}, partial=True)
+        assert error["errors"]["phone"]["message"] == "Phone number is invalid"
+        assert "firstName" in validate_contact({"phone": "5550100"})[1]["errors"]
+
+
+class TestStubServer:
+    def test_pages_have_the_element_ids_of_the_real_app(self, stub, session):
+        add_user = session.get(f"{stub.url}/addUser")
+        contact_list = session.get(f"{stub.url}/contactList")
+
+        assert add_user.status_code == 200
+        assert 'id="firstName"' in add_user.text and 'id="error"' in add_user.text
+        assert 'id="myTable"' in contact_list.text
+        assert session.get(f"{stub.url}/nowhere").status_code == 404
+
+    def test_signup_validates_and_rejects_duplicate_emails(self, stub, session):
+        invalid = session.post(f"{stub.url}/users", json={**USER, "password": "short"})
+        assert invalid.status_code == 400
+        assert invalid.json()["message"].startswith("User validation failed: password:")
+
+        signup(stub, session)
+        duplicate = session.post(f"{stub.url}/users", json={**USER, "email": "ada@example.com"})
+        assert duplicate.status_code == 400
+        assert duplicate.json() == {"message": "Email address is already in use"}
+
+    def test_token_auth_by_header_and_cookie(self, stub, session):
+        signup(stub, session)
+        assert session.get(f"{stub.url}/users/me").status_code == 401
+        assert session.post(f"{stub.url}/users/login", json={**USER, "password": "wrong"}).status_code == 401
+
+        token = session.post(f"{stub.url}/users/login", json=USER).json()["token"]
+        me = session.get(f"{stub.url}/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert me.status_code == 200
+        assert me.json()["email"] == "ada@example.com" and "password" not in me.json()
+        assert session.get(f"{stub.url}/users/me", headers={"Cookie": f"token={token}"}).status_code == 200
+
+        session.post(f"{stub.url}/users/logout", headers={"Authorization": f"Bearer {token}"})
+        assert session.get(f"{stub.url}/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+    def test_contacts_routes(self, stub, session):
+        auth = signup(stub, session)
+        contacts = f"{stub.url}/contacts"
+        assert session.post(contacts, json=CONTACT).status_code == 401
+
+        created = session.post(contacts, json=CONTACT, headers=auth).json()
+        url = f"{contacts}/{created['_id']}"
+        assert session.get(contacts, headers=auth).json() == [created]
+        assert session.get(url, headers=auth).json() == created
+
+        patched = session.patch(url, json={"phone": "5550199"}, headers=auth).json()
+        assert patched["phone"] == "5550199" and patched["lastName"] == "Babbage"
+        replaced = session.put(url, json={"firstName": "Charles", "lastName": "Babbage"}, headers=auth).json()
+        assert "phone" not in replaced
+        assert session.put(url, json={"firstName": ""}, headers=auth).status_code == 400
+
+        assert session.delete(url, headers=auth).text == "Contact deleted"
+        assert session.get(url, headers=auth).status_code == 404
+
+    def test_contacts_of_other_users_are_not_found(self, stub, session):
+        owner = signup(stub, session)
+        other = signup(stub, session, {**USER, "email": "grace@example.com"})
+        created = session.post(f"{stub.url}/contacts", json=CONTACT, headers=owner).json()
+
+        assert session.get(f"{stub.url}/contacts/{created['_id']}", headers=other).status_code == 404
+        assert session.get(f"{stub.url}/contacts", headers=other).json() == []
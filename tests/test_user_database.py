@@ -0,0 +1,30 @@
+import pytest
+from utils.user_database import UserDatabase, generate_seed_users
+
+
+@pytest.fixture(params=["memory", "wal"])
+def database(request, tmp_path):
+    database = UserDatabase(mode=request.param, path=str(tmp_path / "users.db"), name=f"users_{id(request)}")
+    database.create(generate_seed_users(count=3))
+    yield database
+    database.close()
+
+
+class TestUserDatabase:
+    def test_writes_inside_savepoint_are_rolled_back(self, database):
+        conn = database.open_savepoint()
+        conn.execute("DELETE FROM test_users")
+        assert conn.execute("SELECT COUNT(*) FROM test_users").fetchone()[0] == 0
+
+        database.rollback(conn)
+
+        check = database.connect()
+        assert check.execute("SELECT COUNT(*) FROM test_users").fetchone()[0] == 3
+        check.close()
+
+    def test_seed_emails_are_unique(self, database):
+        conn = database.connect()
+        emails = [row[0] for row in conn.execute("SELECT email FROM test_users")]
+        conn.close()
+
+        assert len(emails) == len(set(emails)) == 3
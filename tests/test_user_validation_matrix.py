@@ -0,0 +1,51 @@
+import pytest
+import logging
+import os
+from config.api_config import APIClient
+from utils.cassette import CassetteAdapter
+from utils.identity_corpus import get_run_namespace
+from utils.validation_matrix import build_validation_matrix, ValidationMatrixRunner
+
+logger = logging.getLogger('test_logger')
+
+NAMESPACE = get_run_namespace()
+CASES = build_validation_matrix(NAMESPACE)
+
+@pytest.fixture(scope="module")
+def validation_runner(local_app, pytestconfig, request):
+    """
+    Send the selected cases of the negative-validation matrix concurrently once per module
+    """
+    workers = int(os.getenv('VALIDATION_WORKERS', 8))
+    # Its own session: pytest rewrites os.environ while the requests run
+    client = APIClient(pool_size=workers, trust_env=False)
+    if pytestconfig.cassettes.enabled:
+        client.mount(CassetteAdapter(pytestconfig.cassettes, client.adapter))
+    runner = ValidationMatrixRunner(client, max_workers=workers)
+    # Each request runs with the cassette of its own test item, not the one that set up this fixture
+    nodeids = {item.callspec.params["case"].id: item.nodeid
+               for item in request.session.items if item.module is request.module}
+    runner.submit(
+        [case for case in CASES if case.id in nodeids],
+        context_for=lambda case: pytestconfig.cassettes.context_for(nodeids[case.id])
+    )
+    yield runner
+    runner.shutdown()
+
+class TestUserValidationMatrix:
+    @pytest.mark.api
+    @pytest.mark.negative
+    @pytest.mark.xdist_group(name="validation_matrix")
+    @pytest.mark.parametrize("case", [pytest.param(case, id=case.id) for case in CASES])
+    def test_user_validation(self, case, validation_runner, request):
+        """Test that POST /users rejects an invalid payload with the expected field errors"""
+        response = validation_runner.result(case.id, timeout=60)
+        
+        # Store response for reporting
+        request.node.api_response = response
+        logger.info(f"{case.id}: status {response.status_code}, body {response.text[:500]}")
+        
+        assert response.status_code == 400, f"Expected status code 400, but got {response.status_code}"
+        errors = response.json().get("errors", {})
+        assert set(errors) == case.expected_errors, \
+            f"Expected errors for {sorted(case.expected_errors)}, got {sorted(errors)}"
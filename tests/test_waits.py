@@ -0,0 +1,203 @@
+import time
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from pages.base_page import BasePage
+from pages.waits import DomWaiter, Outcome
+
+ERROR = (By.ID, "error")
+TABLE = (By.ID, "myTable")
+
+
+class FakeElement:
+    def __init__(self, text=''):
+        self.text = text
+
+    def is_displayed(self):
+        return True
+
+
+class FakeDriver:
+    """Page whose URL and elements change at given moments after creation"""
+
+    def __init__(self, url='http://localhost/addUser', changes=()):
+        self.start = time.monotonic()
+        self.url = url
+        self.elements = set()
+        self.texts = {}
+        self.changes = list(changes)
+        self.scripts = []
+        self.implicit_waits = []
+        self.script_timeouts = []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+    def _apply(self):
+        elapsed = time.monotonic() - self.start
+        while self.changes and self.changes[0][0] <= elapsed:
+            _, change = self.changes.pop(0)
+            change(self)
+
+    @property
+    def current_url(self):
+        self._apply()
+        return self.url
+
+    def find_element(self, by, value):
+        self._apply()
+        if (by, value) not in self.elements:
+            raise NoSuchElementException(value)
+        return FakeElement(self.texts.get((by, value), ''))
+
+
+def show_error(driver):
+    driver.elements.add(ERROR)
+
+
+def open_contact_list(driver):
+    driver.url = 'http://localhost/contactList'
+
+
+def fill_error(driver):
+    driver.texts[ERROR] = 'Email address is already in use'
+
+
+class TestDomWaiter:
+    def test_first_outcome_wins(self):
+        driver = FakeDriver(changes=[(0.1, show_error), (0.5, open_contact_list)])
+        waiter = DomWaiter(driver, use_observer=False)
+
+        outcome = waiter.until_any({
+            'success': ('url_contains', None, '/contactList'),
+            'error': ('visible', ERROR)
+        }, timeout=2)
+
+        assert outcome.name == 'error'
+        assert isinstance(outcome.value, FakeElement)
+
+    def test_empty_error_element_is_not_an_error_outcome(self):
+        # The error span is on the page from the start and only gets text when the server answers
+        driver = FakeDriver(changes=[(0.0, show_error), (0.2, open_contact_list)])
+        waiter = DomWaiter(driver, use_observer=False)
+        outcomes = {'error': ('has_text', ERROR), 'success': ('url_contains', None, '/contactList')}
+
+        assert waiter.until_any(outcomes, timeout=2).name == 'success'
+
+        driver = FakeDriver(changes=[(0.0, show_error), (0.1, fill_error)])
+        outcome = DomWaiter(driver, use_observer=False).until_any(outcomes, timeout=2)
+        assert outcome.name == 'error'
+        assert outcome.value.text == 'Email address is already in use'
+
+    def test_url_change_is_an_outcome(self):
+        driver = FakeDriver(changes=[(0.1, open_contact_list)])
+        waiter = DomWaiter(driver, use_observer=False)
+
+        outcome = waiter.until_any({
+            'error': ('visible', ERROR),
+            'left': ('url_changes', None, 'http://localhost/addUser')
+        }, timeout=2)
+
+        assert outcome == Outcome('left', True)
+
+    def test_all_conditions_are_waited_for_together(self):
+        driver = FakeDriver(changes=[(0.1, open_contact_list), (0.2, lambda d: d.elements.add(TABLE))])
+        waiter = DomWaiter(driver, use_observer=False)
+
+        start = time.monotonic()
+        values = waiter.until_all([('url_contains', None, '/contactList'), ('presence', TABLE)], timeout=2)
+
+        assert values[0] is True
+        assert isinstance(values[1], FakeElement)
+        assert time.monotonic() - start < 1
+
+    def test_timeout_when_nothing_happens(self):
+        waiter = DomWaiter(FakeDriver(), use_observer=False)
+        with pytest.raises(TimeoutException):
+            waiter.until_any({'error': ('visible', ERROR), 'success': ('url_contains', None, '/x')}, timeout=0.2)
+
+    def test_observer_runs_all_outcomes_in_one_script(self):
+        driver = FakeDriver()
+        calls = []
+
+        def execute_async_script(script, specs, mode, timeout):
+            calls.append((specs, mode))
+            return {'status': 'ok', 'index': 1, 'value': True}
+
+        driver.execute_async_script = execute_async_script
+
+        outcome = DomWaiter(driver, use_observer=True).until_any({
+            'error': ('visible', ERROR),
+            'success': ('url_contains', None, '/contactList')
+        }, timeout=5)
+
+        assert outcome.name == 'success'
+        assert calls == [([['id', 'error', 'visible', None], [None, None, 'url_contains', '/contactList']], 'any')]
+
+    def test_observer_timeout_raises_without_polling(self):
+        driver = FakeDriver(changes=[(0.0, show_error)])
+        driver.execute_async_script = lambda script, specs, mode, timeout: {'status': 'timeout', 'index': None, 'value': None}
+
+        # The element is there for the poll fallback, so a TimeoutException shows the observer's answer was used
+        with pytest.raises(TimeoutException, match="Condition 'visible' not met"):
+            DomWaiter(driver, use_observer=True).until('visible', ERROR, timeout=1)
+
+    def test_observer_is_retried_after_a_navigation(self):
+        driver = FakeDriver()
+        answers = [WebDriverException('document unloaded'), {'status': 'ok', 'index': 0, 'value': True}]
+
+        def execute_async_script(script, specs, mode, timeout):
+            answer = answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        driver.execute_async_script = execute_async_script
+
+        assert DomWaiter(driver, use_observer=True).until('url_contains', expected='/addUser', timeout=2) is True
+        assert answers == []
+
+    def test_wait_falls_back_to_polling_when_the_observer_keeps_failing(self):
+        driver = FakeDriver(changes=[(0.0, show_error)])
+        calls = []
+
+        def execute_async_script(script, specs, mode, timeout):
+            calls.append(mode)
+            raise WebDriverException('javascript error')
+
+        driver.execute_async_script = execute_async_script
+
+        element = DomWaiter(driver, use_observer=True).until('visible', ERROR, timeout=2)
+
+        assert isinstance(element, FakeElement)
+        assert len(calls) == DomWaiter.MAX_OBSERVER_ATTEMPTS
+
+    def test_long_waits_raise_the_script_timeout(self):
+        driver = FakeDriver()
+        driver.execute_async_script = lambda script, specs, mode, timeout: {'status': 'ok', 'index': 0, 'value': True}
+
+        DomWaiter(driver, use_observer=True).until('url_contains', expected='/addUser', timeout=60)
+
+        # The driver's default of 30 s would cut the script off before the wait's own timeout
+        [script_timeout] = driver.script_timeouts
+        assert script_timeout > 60
+
+    def test_implicit_wait_is_switched_off_once_per_driver(self):
+        driver = FakeDriver()
+        DomWaiter(driver, use_observer=False)
+        DomWaiter(driver, use_observer=False)
+
+        assert driver.implicit_waits == [0]
+
+    def test_page_url_wait_returns_false_on_timeout(self):
+        page = BasePage(FakeDriver(changes=[(0.1, open_contact_list)]))
+        page.waiter = DomWaiter(page.driver, use_observer=False)
+
+        assert page.wait_for_url_contains('/nowhere', timeout=0.2) is False
+        assert page.wait_for_url_contains('/contactList', timeout=2) is True
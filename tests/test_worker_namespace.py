@@ -0,0 +1,42 @@
+from utils.worker_namespace import merge_worker_dirs, merge_worker_files, worker_dir, worker_file
+
+
+class TestWorkerNamespace:
+    def test_paths_are_unchanged_outside_xdist(self, monkeypatch):
+        monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+        assert worker_file('reports/test.log') == 'reports/test.log'
+        assert worker_dir('screenshots') == 'screenshots'
+
+    def test_paths_are_namespaced_per_worker(self, monkeypatch):
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw3')
+        assert worker_file('reports/test.log') == 'reports/test.gw3.log'
+        assert worker_file('test_users.db') == 'test_users.gw3.db'
+        assert worker_dir('screenshots') == 'screenshots/gw3'
+
+    def test_worker_logs_are_merged_in_timestamp_order(self, tmp_path):
+        (tmp_path / 'test.log').write_text('2024-01-01 10:00:00,000 - INFO - earlier run\n')
+        (tmp_path / 'test.gw0.log').write_text(
+            '2024-01-01 10:00:01,000 - INFO - gw0 first\n'
+            '2024-01-01 10:00:03,000 - ERROR - gw0 failure\nTraceback line\n'
+        )
+        (tmp_path / 'test.gw1.log').write_text('2024-01-01 10:00:02,000 - INFO - gw1 only\n')
+
+        merged = merge_worker_files(str(tmp_path / 'test.log'))
+
+        assert len(merged) == 2
+        assert (tmp_path / 'test.log').read_text().splitlines() == [
+            '2024-01-01 10:00:00,000 - INFO - earlier run',
+            '2024-01-01 10:00:01,000 - INFO - gw0 first',
+            '2024-01-01 10:00:02,000 - INFO - gw1 only',
+            '2024-01-01 10:00:03,000 - ERROR - gw0 failure',
+            'Traceback line'
+        ]
+        assert not (tmp_path / 'test.gw0.log').exists()
+
+    def test_worker_directories_are_folded_into_the_base_directory(self, tmp_path):
+        for worker in ('gw0', 'gw1'):
+            (tmp_path / worker).mkdir()
+            (tmp_path / worker / 'shot.png').write_bytes(b'png')
+
+        assert merge_worker_dirs(str(tmp_path)) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['gw0_shot.png', 'gw1_shot.png']
@@ -0,0 +1,3 @@
+"""
+Helpers shared by page objects and tests.
+"""
\ No newline at end of file
@@ -0,0 +1,88 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+from config.api_config import get_api_client
+
+logger = logging.getLogger('test_logger')
+
+
+class AuthSession:
+    """Log users in through the API and hand their token to a WebDriver, skipping the UI forms
+
+    Tokens are cached at class level, i.e. once per process. Every pytest-xdist
+    worker is its own process, so each user logs in at most once per worker.
+    """
+
+    TOKEN_COOKIE = 'token'
+
+    _tokens = {}
+
+    def __init__(self, base_url=None, client=None):
+        self.client = client or get_api_client()
+        self.base_url = (base_url or self.client.base_url).rstrip('/')
+
+    def login(self, email, password):
+        """
+        Log in through POST /users/login
+        :return: token, or None if the credentials are not accepted
+        """
+        response = self.client.post(
+            f"{self.base_url}/users/login",
+            json={"email": email, "password": password}
+        )
+        if response.status_code != 200:
+            return None
+        return response.json()["token"]
+
+    def register(self, user):
+        """
+        Create a user through POST /users
+        :param user: dict with first_name, last_name, email and password
+        :return: token of the new user
+        """
+        response = self.client.post(
+            f"{self.base_url}/users",
+            json={
+                "firstName": user["first_name"],
+                "lastName": user["last_name"],
+                "email": user["email"],
+                "password": user["password"]
+            }
+        )
+        if response.status_code != 201:
+            raise AssertionError(
+                f"Could not create user {user['email']}: {response.status_code} {response.text}"
+            )
+        logger.info(f"Created user via API: {user['email']}")
+        return response.json()["token"]
+
+    def get_token(self, user):
+        """Return a cached token for the user, logging in (or signing up) on first use"""
+        key = (self.base_url, user["email"])
+        token = self._tokens.get(key)
+        if token is None:
+            token = self.login(user["email"], user["password"]) or self.register(user)
+            self._tokens[key] = token
+        return token
+
+    def invalidate(self, user):
+        """Forget the cached token of a user, e.g. after logging out"""
+        self._tokens.pop((self.base_url, user["email"]), None)
+
+    def authenticate(self, driver, user):
+        """
+        Make the browser logged in as the given user without touching the login form
+        :return: token injected into the browser
+        """
+        token = self.get_token(user)
+        try:
+            # Chrome can set a cookie for any URL without loading a page first
+            driver.execute_cdp_cmd('Network.setCookie', {
+                'name': self.TOKEN_COOKIE,
+                'value': token,
+                'url': self.base_url
+            })
+        except (AttributeError, WebDriverException):
+            # WebDriver only accepts cookies for the domain of the current document
+            driver.get(f"{self.base_url}/favicon.ico")
+            driver.add_cookie({'name': self.TOKEN_COOKIE, 'value': token, 'path': '/'})
+        return token
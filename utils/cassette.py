@@ -0,0 +1,256 @@
+"""
+Record/replay of HTTP traffic at the requests transport level.
+
+Modes (CASSETTE_MODE or --cassette-mode):
+- off: requests go to the network untouched
+- record: requests go to the network and every interaction is saved
+- replay: recorded responses are served from disk, unmatched requests go to the network and are recorded
+- strict: recorded responses are served from disk, unmatched requests fail the test
+
+Requests are matched on method, path and body. Passwords, tokens and the run's
+identity namespace are normalized first, so a cassette recorded in one run matches
+the requests of another. Identical requests are replayed in recorded order.
+
+A fixture that sends requests for tests that have not started yet (the
+validation matrix) runs each one in `context_for(nodeid)` of its test, so every
+test records and replays its own interactions whichever test set the fixture up.
+"""
+import contextvars
+import json
+import os
+import re
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from utils.worker_namespace import base_nodeid
+
+MODES = ('off', 'record', 'replay', 'strict')
+SECRET_KEYS = {'password', 'token'}
+SECRET_HEADERS = {'authorization', 'cookie', 'set-cookie'}
+MASK = '***'
+NAMESPACE_PLACEHOLDER = '{namespace}'
+
+_active_cassette = contextvars.ContextVar('active_cassette', default=None)
+
+
+class UnmatchedRequestError(AssertionError):
+    """Raised in strict mode when a request has no recorded response"""
+
+
+def mask_secrets(value):
+    """Replace secret values (passwords, tokens) in a decoded JSON document"""
+    if isinstance(value, dict):
+        return {
+            key: MASK if key in SECRET_KEYS and isinstance(item, str) and item else mask_secrets(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [mask_secrets(item) for item in value]
+    return value
+
+
+def mask_headers(headers):
+    """Headers with the authorization and cookie values replaced"""
+    return {name: MASK if name.lower() in SECRET_HEADERS else value for name, value in headers.items()}
+
+
+def _mask_body(body):
+    """Mask secrets in a JSON body; other bodies are kept as text"""
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    try:
+        return json.dumps(mask_secrets(json.loads(body)), sort_keys=True, separators=(',', ':'))
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """Interactions recorded for one test"""
+
+    def __init__(self, path, namespace):
+        self.path = path
+        self.namespace = namespace
+        self.interactions = []
+        self.dirty = False
+        self._unplayed = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, namespace):
+        cassette = cls(path, namespace)
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            cassette.interactions = data['interactions']
+            for interaction in cassette.interactions:
+                request = interaction['request']
+                key = request['method'], request['path'], request['body']
+                cassette._unplayed.setdefault(key, []).append(interaction['response'])
+        return cassette
+
+    def _normalize(self, body):
+        """Mask secrets and replace this run's namespace with a placeholder"""
+        body = _mask_body(body)
+        if body and self.namespace:
+            body = body.replace(self.namespace, NAMESPACE_PLACEHOLDER)
+        return body
+
+    def _describe(self, prepared):
+        split = urlsplit(prepared.url)
+        path = f"{split.path}?{split.query}" if split.query else split.path
+        return {'method': prepared.method, 'path': path, 'body': self._normalize(prepared.body)}
+
+    def play(self, prepared):
+        """Pop the next recorded response for a request, or None"""
+        request = self._describe(prepared)
+        key = request['method'], request['path'], request['body']
+        with self._lock:
+            responses = self._unplayed.get(key)
+            if not responses:
+                return None
+            response = dict(responses.pop(0))
+        response['body'] = response['body'].replace(NAMESPACE_PLACEHOLDER, self.namespace)
+        return response
+
+    def record(self, prepared, response):
+        interaction = {
+            'request': self._describe(prepared),
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': mask_headers(response.headers),
+                'body': self._normalize(response.content) if response.content else ''
+            }
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self.dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {'version': 1, 'namespace': self.namespace, 'interactions': list(self.interactions)}
+            self.dirty = False
+        if not data['interactions']:
+            # A test that sent nothing keeps no cassette
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+
+class CassetteLibrary:
+    """Loads the cassette of the running test and saves recordings"""
+
+    def __init__(self, directory='cassettes', mode='off', namespace=''):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {', '.join(MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.namespace = namespace
+        self._cassettes = []
+        # path -> cassette opened by context_for before its test started
+        self._prepared = {}
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def path_for(self, nodeid):
+        """cassettes/<test file>/<test name>.json"""
+        module, _, name = base_nodeid(nodeid).partition('::')
+        module = os.path.splitext(module)[0]
+        name = re.sub(r'[^A-Za-z0-9_.+-]+', '_', name).strip('_') or 'module'
+        return os.path.join(self.directory, module, f"{name}.json")
+
+    def _open(self, path):
+        if self.mode == 'record':
+            cassette = Cassette(path, self.namespace)
+            cassette.dirty = True  # an empty recording still replaces the old file
+        else:
+            cassette = Cassette.load(path, self.namespace)
+        self._cassettes.append(cassette)
+        return cassette
+
+    def insert(self, nodeid):
+        """Make the cassette of a test the active one for this thread and the threads it starts"""
+        path = self.path_for(nodeid)
+        cassette = self._prepared.pop(path, None) or self._open(path)
+        return _active_cassette.set(cassette)
+
+    def context_for(self, nodeid):
+        """
+        A copy of the current context with the cassette of a test active, for requests sent on behalf of
+        a test that has not started yet; the test's own insert picks up the same cassette
+        """
+        context = contextvars.copy_context()
+        if self.enabled:
+            path = self.path_for(nodeid)
+            if path not in self._prepared:
+                self._prepared[path] = self._open(path)
+            context.run(_active_cassette.set, self._prepared[path])
+        return context
+
+    def eject(self, token):
+        cassette = _active_cassette.get()
+        _active_cassette.reset(token)
+        if cassette is not None:
+            cassette.save()
+
+    def save_all(self):
+        """Save recordings completed by background threads after their test finished"""
+        for cassette in self._cassettes:
+            cassette.save()
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter that serves or records interactions around a real adapter"""
+
+    def __init__(self, library, adapter):
+        super().__init__()
+        self.library = library
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        cassette = _active_cassette.get()
+        if cassette is None or not self.library.enabled:
+            return self.adapter.send(request, **kwargs)
+
+        if self.library.mode in ('replay', 'strict'):
+            recorded = cassette.play(request)
+            if recorded is not None:
+                return self._build_response(request, recorded)
+            if self.library.mode == 'strict':
+                raise UnmatchedRequestError(
+                    f"No recorded response for {request.method} {request.url} in {cassette.path}"
+                )
+
+        response = self.adapter.send(request, **kwargs)
+        cassette.record(request, response)
+        return response
+
+    def _build_response(self, request, recorded):
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response._content = recorded['body'].encode('utf-8')
+        response.headers['Content-Length'] = str(len(response._content))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        response.connection = self
+        return response
+
+    def close(self):
+        self.adapter.close()
@@ -0,0 +1,45 @@
+"""
+One hook on WebDriver.execute that per-command observers register with.
+
+Command timing, the failure bundle's command history and the element cache's
+navigation tracking all need to see every command a driver sends. The driver's
+execute is replaced once, here; the wrapper times the command once and then calls
+the listeners in the order they were added, whatever order the features were
+enabled in.
+"""
+import time
+import weakref
+
+# Driver -> listeners called after each of its commands
+_listeners = weakref.WeakKeyDictionary()
+
+
+def add_command_listener(driver, listener):
+    """
+    Call listener(driver_command, params, status, elapsed_ms) after every command the driver sends
+    status is 'ok', or the class name of the exception the command raised.
+    :return: False if the driver has no execute to hook
+    """
+    listeners = _listeners.get(driver)
+    if listeners is None:
+        execute = getattr(driver, 'execute', None)
+        if execute is None:
+            return False
+        listeners = _listeners[driver] = []
+
+        def hooked_execute(driver_command, params=None):
+            start = time.perf_counter()
+            status = 'ok'
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                status = type(e).__name__
+                raise
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                for notify in listeners:
+                    notify(driver_command, params, status, elapsed_ms)
+
+        driver.execute = hooked_execute
+    listeners.append(listener)
+    return True
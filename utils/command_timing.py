@@ -0,0 +1,195 @@
+"""
+Wall-time instrumentation of WebDriver commands and page object steps.
+
+Enable with COMMAND_TIMING=True or pytest --command-timing. Three kinds of spans are timed:
+- driver: browser startup
+- command: every WebDriver command sent by the driver (find_element, click, execute_script, ...)
+- step: page object methods decorated with timed_step (click, input_text, wait_for_*)
+
+Each test's spans are aggregated per (kind, name, locator) and shipped with its teardown
+report, so the same numbers reach the controller process under pytest-xdist. The session
+totals are written to reports/timing/ as JSON and CSV.
+
+When timing is disabled, drivers are not wrapped and timed_step costs one global lookup.
+"""
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from utils.command_listeners import add_command_listener
+
+# Aggregate columns shipped per test: kind, name, locator, count, total ms, max ms
+COLUMNS = ('kind', 'name', 'locator', 'count', 'total_ms', 'max_ms')
+
+_timer = None
+_step_depth = threading.local()
+
+
+class CommandTimer:
+    """Collects span timings for the currently running test"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, locator, elapsed_ms):
+        key = (kind, name, locator)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = [1, elapsed_ms, elapsed_ms]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed_ms
+                stats[2] = max(stats[2], elapsed_ms)
+
+    def drain(self):
+        """
+        Return the aggregates collected since the previous drain
+        :return: list of [kind, name, locator, count, total_ms, max_ms]
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return [
+            [kind, name, locator, count, round(total, 3), round(peak, 3)]
+            for (kind, name, locator), (count, total, peak) in stats.items()
+        ]
+
+
+def enable_command_timing():
+    global _timer
+    if _timer is None:
+        _timer = CommandTimer()
+    return _timer
+
+
+def disable_command_timing():
+    global _timer
+    _timer = None
+
+
+def get_command_timer():
+    """Return the active timer, or None when timing is disabled"""
+    return _timer
+
+
+def _format_locator(locator):
+    if isinstance(locator, tuple) and len(locator) == 2:
+        return f"{locator[0]}={locator[1]}"
+    return None
+
+
+def timed_step(func):
+    """Time a page object method, keyed by class, method name and locator argument
+
+    Only the outermost step is recorded: click() includes the wait it performs.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        timer = _timer
+        if timer is None or getattr(_step_depth, 'value', 0):
+            return func(self, *args, **kwargs)
+        _step_depth.value = 1
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _step_depth.value = 0
+            timer.record(
+                'step',
+                f"{type(self).__name__}.{func.__name__}",
+                _format_locator(args[0]) if args else None,
+                (time.perf_counter() - start) * 1000
+            )
+    return wrapper
+
+
+def _record_command(driver_command, params, status, elapsed_ms):
+    timer = _timer
+    if timer is not None:
+        locator = None
+        if params and 'using' in params:
+            locator = f"{params['using']}={params.get('value')}"
+        timer.record('command', driver_command, locator, elapsed_ms)
+
+
+def instrument_driver(driver):
+    """Time every command the driver sends; does nothing when timing is disabled"""
+    if _timer is None or getattr(driver, '_command_timing', False):
+        return driver
+    if add_command_listener(driver, _record_command):
+        driver._command_timing = True
+    return driver
+
+
+def time_driver_start(factory):
+    """Call a driver factory, timing browser startup and instrumenting the new driver"""
+    timer = _timer
+    if timer is None:
+        return factory()
+    start = time.perf_counter()
+    driver = factory()
+    timer.record('driver', 'create', None, (time.perf_counter() - start) * 1000)
+    return instrument_driver(driver)
+
+
+class TimingReport:
+    """Per-test and session aggregates collected from test reports"""
+
+    def __init__(self):
+        self.tests = {}
+
+    def add(self, nodeid, rows):
+        self.tests.setdefault(nodeid, []).extend(rows)
+
+    def session_rows(self):
+        """Aggregates over all tests, slowest total first"""
+        totals = {}
+        for rows in self.tests.values():
+            for kind, name, locator, count, total, peak in rows:
+                stats = totals.setdefault((kind, name, locator), [0, 0.0, 0.0])
+                stats[0] += count
+                stats[1] += total
+                stats[2] = max(stats[2], peak)
+        rows = [
+            [kind, name, locator, count, round(total, 3), round(peak, 3)]
+            for (kind, name, locator), (count, total, peak) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    def slowest_locators(self, limit=10):
+        """Total page object step time per locator"""
+        totals = {}
+        for kind, name, locator, count, total, peak in self.session_rows():
+            if locator and kind == 'step':
+                stats = totals.setdefault(locator, [0, 0.0])
+                stats[0] += count
+                stats[1] += total
+        rows = [[locator, count, round(total, 3)] for locator, (count, total) in totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:limit]
+
+    def slowest_steps(self, limit=10):
+        return [row for row in self.session_rows() if row[0] in ('step', 'driver')][:limit]
+
+    def write(self, directory='reports/timing'):
+        """
+        Write command_timing.json (session and per-test) and command_timing.csv (session)
+        :return: (json path, csv path)
+        """
+        os.makedirs(directory, exist_ok=True)
+        session_rows = self.session_rows()
+        json_path = os.path.join(directory, 'command_timing.json')
+        with open(json_path, 'w') as f:
+            json.dump({
+                'columns': COLUMNS,
+                'session': session_rows,
+                'tests': self.tests
+            }, f, indent=1)
+        csv_path = os.path.join(directory, 'command_timing.csv')
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(session_rows)
+        return json_path, csv_path
@@ -0,0 +1,203 @@
+"""
+Per-test duration history and duration-aware scheduling for pytest-xdist.
+
+Every run stores the setup, call and teardown duration of each test in a small
+SQLite file (DURATION_HISTORY, data/durations.db by default). The next xdist run
+predicts each test's cost from its recent runs and hands tests to workers
+longest-first: a worker gets its next test the moment it finishes one, so slow UI
+tests start early and the fast API tests fill the gaps at the end instead of a
+slow test starting last and leaving the other workers idle. The scheduler itself
+is in utils.duration_scheduler, which is only imported under xdist.
+
+Tests without history get the median of the known tests of their module, or of
+all known tests, or UNSEEN_DEFAULT seconds when the history is empty.
+"""
+import heapq
+import os
+import sqlite3
+import statistics
+from collections import namedtuple
+from datetime import datetime
+from utils.worker_namespace import base_nodeid
+
+# Predicted seconds of a test when nothing is known about it or its module
+UNSEEN_DEFAULT = 1.0
+# Runs of a test its prediction is based on
+RECENT_RUNS = 5
+# Runs kept in the store
+KEPT_RUNS = 20
+
+PHASES = ("setup", "call", "teardown")
+
+Makespan = namedtuple('Makespan', ['makespan', 'loads'])
+
+
+def _module(nodeid):
+    return nodeid.split("::", 1)[0]
+
+
+class DurationHistory:
+    """SQLite store of the phase durations of past runs"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('DURATION_HISTORY', 'data/durations.db')
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.executescript('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                finished TEXT NOT NULL,
+                workers INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS durations (
+                run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+                nodeid TEXT NOT NULL,
+                setup REAL NOT NULL DEFAULT 0,
+                call REAL NOT NULL DEFAULT 0,
+                teardown REAL NOT NULL DEFAULT 0,
+                outcome TEXT
+            );
+            CREATE INDEX IF NOT EXISTS durations_nodeid ON durations (nodeid, run_id);
+        ''')
+        return connection
+
+    def record_run(self, durations, workers=1):
+        """
+        Store one run
+        :param durations: nodeid -> {"setup": s, "call": s, "teardown": s, "outcome": str}
+        """
+        if not durations:
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                run_id = connection.execute(
+                    'INSERT INTO runs (finished, workers) VALUES (?, ?)',
+                    (datetime.now().isoformat(timespec='seconds'), workers)
+                ).lastrowid
+                connection.executemany(
+                    'INSERT INTO durations (run_id, nodeid, setup, call, teardown, outcome) VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (run_id, nodeid, *(phases.get(when, 0.0) for when in PHASES), phases.get("outcome"))
+                        for nodeid, phases in durations.items()
+                    ]
+                )
+                connection.execute(
+                    'DELETE FROM durations WHERE run_id <= ?', (run_id - KEPT_RUNS,)
+                )
+                connection.execute('DELETE FROM runs WHERE id <= ?', (run_id - KEPT_RUNS,))
+        finally:
+            connection.close()
+
+    def known_durations(self):
+        """
+        Median total duration of the recent runs of every test
+        :return: nodeid -> seconds
+        """
+        if not os.path.exists(self.path):
+            return {}
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                'SELECT nodeid, setup + call + teardown FROM durations ORDER BY run_id DESC'
+            ).fetchall()
+        finally:
+            connection.close()
+        recent = {}
+        for nodeid, total in rows:
+            runs = recent.setdefault(nodeid, [])
+            if len(runs) < RECENT_RUNS:
+                runs.append(total)
+        return {nodeid: statistics.median(runs) for nodeid, runs in recent.items()}
+
+
+def predict(nodeids, known):
+    """
+    Predicted seconds per test
+    :param known: nodeid -> seconds, from DurationHistory.known_durations
+    :return: (nodeid -> seconds, set of tests without history)
+    """
+    by_module = {}
+    for nodeid, seconds in known.items():
+        by_module.setdefault(_module(nodeid), []).append(seconds)
+    overall = statistics.median(known.values()) if known else UNSEEN_DEFAULT
+
+    predictions = {}
+    unseen = set()
+    for nodeid in nodeids:
+        if nodeid in known:
+            predictions[nodeid] = known[nodeid]
+            continue
+        unseen.add(nodeid)
+        module = by_module.get(_module(nodeid))
+        predictions[nodeid] = statistics.median(module) if module else overall
+    return predictions, unseen
+
+
+def longest_first(nodeids, predictions):
+    """Tests by predicted duration, longest first; ties keep collection order"""
+    return sorted(nodeids, key=lambda nodeid: -predictions[nodeid])
+
+
+def simulate_makespan(nodeids, predictions, workers):
+    """
+    Makespan of handing tests longest-first to whichever worker becomes free first
+    :return: Makespan(makespan, per-worker loads)
+    """
+    workers = max(workers, 1)
+    heap = [(0.0, index) for index in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in longest_first(nodeids, predictions):
+        load, index = heapq.heappop(heap)
+        loads[index] = load + predictions[nodeid]
+        heapq.heappush(heap, (loads[index], index))
+    return Makespan(max(loads), loads)
+
+
+class DurationReport:
+    """Collects the phase durations of a run and compares them with the predictions"""
+
+    def __init__(self, history=None):
+        self.history = history or DurationHistory()
+        # Loaded before the run records anything, so predictions and scheduling see the same history
+        self.known = self.history.known_durations()
+        self.durations = {}
+        self.worker_loads = {}
+
+    def add(self, report, worker_id):
+        # Without the @group suffix of --dist loadgroup, so the history is shared by every dist mode
+        phases = self.durations.setdefault(base_nodeid(report.nodeid), {})
+        phases[report.when] = report.duration
+        if report.when == "call" or report.outcome != "passed":
+            phases.setdefault("outcome", report.outcome)
+        self.worker_loads[worker_id] = self.worker_loads.get(worker_id, 0.0) + report.duration
+
+    def save(self, workers):
+        self.history.record_run(self.durations, workers)
+
+    def summary_lines(self, workers, top=10):
+        """Terminal lines: predicted vs actual makespan and the largest prediction errors"""
+        nodeids = list(self.durations)
+        predictions, unseen = predict(nodeids, self.known)
+        predicted = simulate_makespan(nodeids, predictions, workers)
+        actual = {nodeid: sum(phases.get(when, 0.0) for when in PHASES) for nodeid, phases in self.durations.items()}
+        actual_makespan = max(self.worker_loads.values(), default=0.0)
+
+        lines = [
+            f"{len(nodeids)} tests on {workers} worker(s), {len(unseen)} without history",
+            f"predicted makespan: {predicted.makespan:8.2f} s",
+            f"actual makespan:    {actual_makespan:8.2f} s",
+            "worker loads (s): predicted " + ", ".join(f"{load:.2f}" for load in sorted(predicted.loads, reverse=True))
+            + " | actual " + ", ".join(
+                f"{worker} {load:.2f}" for worker, load in sorted(self.worker_loads.items(), key=lambda item: -item[1])
+            ),
+        ]
+        misses = sorted(nodeids, key=lambda nodeid: -abs(actual[nodeid] - predictions[nodeid]))[:top]
+        if misses:
+            lines.append("largest prediction errors (predicted -> actual):")
+            for nodeid in misses:
+                marker = " (no history)" if nodeid in unseen else ""
+                lines.append(f"  {predictions[nodeid]:7.2f} s -> {actual[nodeid]:7.2f} s  {nodeid}{marker}")
+        return lines
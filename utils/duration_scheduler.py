@@ -0,0 +1,74 @@
+"""
+xdist scheduler that dispatches tests longest-first by their recorded durations.
+"""
+from xdist.scheduler import LoadScheduling
+from utils.duration_history import predict
+from utils.worker_namespace import base_nodeid
+
+
+class DurationScheduling(LoadScheduling):
+    """xdist load scheduling that hands out tests longest-first, one at a time
+
+    A worker only holds the test it runs and the next one (xdist needs the next
+    test to finish the current one's teardown), so every test goes to the first
+    worker that frees up, which is longest-processing-time-first list scheduling.
+
+    Under --dist loadgroup the tests of one xdist_group (node ids ending in
+    "@group") are a single unit: they go to one worker together, and the group is
+    placed in the order by the sum of its tests' predictions.
+    """
+
+    def __init__(self, config, log=None, known=None):
+        """
+        :param known: nodeid -> seconds, from DurationHistory.known_durations
+        """
+        super().__init__(config, log)
+        self.known = known or {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        tests = [base_nodeid(nodeid) for nodeid in self.collection]
+        predictions, _ = predict(tests, self.known)
+        self._groups = [nodeid[len(test) + 1:] or None for nodeid, test in zip(self.collection, tests)]
+        units = {}
+        for index, group in enumerate(self._groups):
+            units.setdefault(group or index, []).append(index)
+        ordered = sorted(units.values(), key=lambda unit: -sum(predictions[tests[index]] for index in unit))
+        self.pending[:] = [index for unit in ordered for index in unit]
+        if not self.collection:
+            return
+        for _ in range(2):
+            for node in self.nodes:
+                if len(self.node2pending[node]) < 2:
+                    self._send_unit(node)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            while self.pending and len(self.node2pending[node]) < 2:
+                self._send_unit(node)
+        else:
+            node.shutdown()
+        self.log("num items waiting for node:", len(self.pending))
+
+    def _send_unit(self, node):
+        """Send the next pending test, or all pending tests of its xdist_group"""
+        group = self._groups[self.pending[0]]
+        size = 1
+        if group is not None:
+            while size < len(self.pending) and self._groups[self.pending[size]] == group:
+                size += 1
+        self._send_tests(node, size)
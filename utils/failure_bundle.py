@@ -0,0 +1,106 @@
+"""
+Evidence collected from the browser when a test fails.
+
+A bundle holds a screenshot, the page source, the current URL and title, the browser
+console log and the last WebDriver commands the driver sent. Nothing is collected for
+passing tests; the only standing cost is appending each command to a short ring buffer.
+"""
+import json
+import logging
+import os
+import weakref
+from collections import deque
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+from utils.command_listeners import add_command_listener
+
+logger = logging.getLogger('test_logger')
+
+# Driver -> deque of its most recent commands
+_histories = weakref.WeakKeyDictionary()
+
+
+def _summarize(driver_command, params):
+    """Keep locators, URLs and script heads; typed text is never recorded"""
+    if not params:
+        return None
+    if 'using' in params:
+        return f"{params['using']}={params.get('value')}"
+    if 'url' in params:
+        return params['url']
+    if 'script' in params:
+        return params['script'].strip()[:80]
+    return None
+
+
+def record_command_history(driver, size=None):
+    """
+    Remember the last commands sent through a driver
+    :param size: number of commands kept (default: FAILURE_COMMAND_HISTORY, 0 disables)
+    """
+    size = int(os.getenv('FAILURE_COMMAND_HISTORY', 50)) if size is None else size
+    if not size or driver in _histories:
+        return driver
+    history = deque(maxlen=size)
+
+    def record(driver_command, params, status, elapsed_ms):
+        history.append({
+            "time": datetime.now().isoformat(timespec='milliseconds'),
+            "command": driver_command,
+            "target": _summarize(driver_command, params),
+            "status": status,
+            "ms": round(elapsed_ms, 1)
+        })
+
+    if add_command_listener(driver, record):
+        _histories[driver] = history
+    return driver
+
+
+def get_command_history(driver):
+    return list(_histories.get(driver, ()))
+
+
+def collect_failure_bundle(driver, directory, test_name=None, phase=None):
+    """
+    Write the failure evidence of a driver to a directory
+    :return: dict of artifact name -> file path (pieces the browser cannot deliver are skipped)
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    summary = {
+        "test": test_name,
+        "phase": phase,
+        "collected": datetime.now().isoformat(timespec='seconds')
+    }
+    # The command history must be read before the bundle adds commands of its own
+    history = get_command_history(driver)
+
+    def collect(name, filename, produce):
+        try:
+            content = produce()
+        except WebDriverException as e:
+            summary[f"{name}_error"] = e.msg
+            return
+        path = os.path.join(directory, filename)
+        with open(path, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+        paths[name] = path
+
+    try:
+        summary["url"] = driver.current_url
+        summary["title"] = driver.title
+    except WebDriverException as e:
+        summary["url_error"] = e.msg
+    collect("screenshot", "screenshot.png", driver.get_screenshot_as_png)
+    collect("page_source", "page_source.html", lambda: driver.page_source)
+    collect("console", "console.json", lambda: json.dumps(driver.get_log('browser'), indent=2))
+    if history:
+        collect("commands", "commands.json", lambda: json.dumps(history, indent=2))
+
+    path = os.path.join(directory, "bundle.json")
+    with open(path, 'w') as f:
+        json.dump({**summary, "files": {name: os.path.basename(p) for name, p in paths.items()}}, f, indent=2)
+    paths["bundle"] = path
+    logger.info(f"Failure bundle for {test_name} written to {directory}")
+    return paths
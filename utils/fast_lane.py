@@ -0,0 +1,68 @@
+"""
+Browser-free fast lane for API tests.
+
+`pytest --api-only` (or `-m api`) runs only tests marked api. In that lane test
+modules that contain no api test are not imported at all, conftest loads the
+browser, page-object and report-rendering modules only when a test needs them, and
+no WebDriver is created. StartupTimer measures how long it takes to get to the
+first test so the lane can be gated on it.
+"""
+import re
+import sys
+import time
+
+# Modules the fast lane should never need to import
+# py._xmlgen is what py.xml loads on first use (py.xml itself is a lazy alias)
+HEAVY_MODULES = ('selenium.webdriver', 'pages', 'faker', 'py._xmlgen', 'xdist.scheduler')
+
+API_MARKER = re.compile(r'\bmark\.api\b')
+
+
+def is_fast_lane(config):
+    """--api-only, or a marker expression of just 'api'"""
+    return bool(config.getoption("--api-only")) or (config.option.markexpr or '').strip() == 'api'
+
+
+def has_api_tests(path):
+    """Tell from the source alone whether a test module contains api-marked tests"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return bool(API_MARKER.search(f.read()))
+    except OSError:
+        return True
+
+
+def loaded_heavy_modules():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class StartupTimer:
+    """Seconds from loading conftest to collection and to the first test"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+        self.collected = 0
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def span(self, start, end):
+        if start not in self.marks or end not in self.marks:
+            return None
+        return self.marks[end] - self.marks[start]
+
+    def startup_seconds(self):
+        """Conftest loaded -> first test started (or collection finished when nothing ran)"""
+        return self.marks.get("first_test", self.marks.get("collection_finished"))
+
+    def summary_lines(self):
+        collection = self.span("collection_started", "collection_finished")
+        startup = self.startup_seconds()
+        heavy = loaded_heavy_modules()
+        return [
+            f"conftest imports:  {self.marks.get('conftest_imported', 0.0):6.3f} s",
+            f"collection:        {collection or 0.0:6.3f} s ({self.collected} tests)",
+            f"until first test:  {startup or 0.0:6.3f} s (from conftest load)",
+            f"heavy modules loaded: {', '.join(heavy) if heavy else 'none'}",
+        ]
@@ -0,0 +1,171 @@
+"""
+Precomputed corpus of unique test identities.
+
+Build once (the session fixture does it automatically when the file is missing):
+
+    python -m utils.identity_corpus --count 100000 --seed 1234 --output data/identities.bin
+
+The file holds fixed-width records, so readers memory-map it and jump straight to
+record N without parsing anything. Emails are made unique per record at build time
+and per run with a namespace suffix applied at read time.
+"""
+import argparse
+import mmap
+import os
+import random
+import string
+import struct
+from datetime import datetime
+
+MAGIC = b'IDCORP01'
+HEADER = struct.Struct('<8sIQ')  # magic, record count, seed
+RECORD = struct.Struct('<32s32s64s16s')  # first name, last name, email local part, password
+FIELDS = ('first_name', 'last_name', 'email', 'password')
+NAME_POOL_SIZE = 1000
+SPECIAL_CHARS = '!@#$%^&*'
+
+_run_namespace = None
+
+
+def _random_password(rng, length=10):
+    """Password with at least one upper, lower, digit and special character"""
+    chars = [
+        rng.choice(string.ascii_uppercase),
+        rng.choice(string.ascii_lowercase),
+        rng.choice(string.digits),
+        rng.choice(SPECIAL_CHARS)
+    ]
+    chars += rng.choices(string.ascii_letters + string.digits, k=length - len(chars))
+    rng.shuffle(chars)
+    return ''.join(chars)
+
+
+def _ascii(value, size):
+    return value.encode('ascii', 'ignore')[:size]
+
+
+def build_corpus(path, count, seed=1234):
+    """
+    Generate count unique identities in one pass and write them to path
+    :return: path of the written corpus
+    """
+    # Imported here: runs that only read an existing corpus never load Faker
+    from faker import Faker
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+
+    # Faker is only used to build small name pools; records are drawn from them in bulk
+    first_names = [fake.first_name() for _ in range(NAME_POOL_SIZE)]
+    last_names = [fake.last_name() for _ in range(NAME_POOL_SIZE)]
+    firsts = rng.choices(first_names, k=count)
+    lasts = rng.choices(last_names, k=count)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # xdist workers may build concurrently
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, count, seed))
+        for index in range(count):
+            first, last = firsts[index], lasts[index]
+            # The hex index keeps every local part unique inside the corpus
+            local = f"{first}.{last}.{index:x}".lower()
+            f.write(RECORD.pack(
+                _ascii(first, 32), _ascii(last, 32), _ascii(local, 64), _ascii(_random_password(rng), 16)
+            ))
+    os.replace(tmp_path, path)
+    return path
+
+
+class IdentityCorpus:
+    """Read-only, memory-mapped view of a corpus file"""
+
+    SLOTS_PER_TEST = 4
+
+    def __init__(self, path, namespace='', domain='example.com'):
+        """
+        :param namespace: suffix added to every email, e.g. a run id, so runs never reuse addresses
+        """
+        self.path = path
+        self.namespace = namespace
+        self.domain = domain
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.seed = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an identity corpus")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Return identity number index as a user data dict"""
+        if not 0 <= index < self.count:
+            raise IndexError(
+                f"Identity {index} is outside the corpus of {self.count}; build a larger corpus"
+            )
+        values = [
+            field.rstrip(b'\0').decode('ascii')
+            for field in RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        ]
+        identity = dict(zip(FIELDS, values))
+        identity['email'] = namespaced_email(f"{identity['email']}@{self.domain}", self.namespace)
+        return identity
+
+    def for_test(self, test_index, slot=0):
+        """
+        Identity reserved for a test
+        :param test_index: position of the test in the collected items (identical on every xdist worker)
+        :param slot: which of the test's SLOTS_PER_TEST identities to return
+        """
+        if not 0 <= slot < self.SLOTS_PER_TEST:
+            raise IndexError(f"Slot {slot} out of range, tests have {self.SLOTS_PER_TEST} identity slots")
+        return self[test_index * self.SLOTS_PER_TEST + slot]
+
+    def for_worker(self, worker_id, index, worker_count=None):
+        """
+        n-th identity of an xdist worker's stream; streams of different workers never overlap
+        :param worker_id: 'gw0', 'gw1', ... or 'master'
+        """
+        if worker_count is None:
+            worker_count = int(os.getenv('PYTEST_XDIST_WORKER_COUNT', 1))
+        worker_number = int(worker_id[2:]) if worker_id.startswith('gw') else 0
+        return self[index * worker_count + worker_number]
+
+    def rows(self, identities):
+        """Convert identity dicts to (first_name, last_name, email, password) tuples"""
+        return [tuple(identity[field] for field in FIELDS) for identity in identities]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def namespaced_email(email, namespace):
+    """user@example.com -> user.<namespace>@example.com (unchanged without a namespace)"""
+    if not namespace:
+        return email
+    local, _, domain = email.partition('@')
+    return f"{local}.{namespace}@{domain}"
+
+
+def get_run_namespace():
+    """Email namespace of this run: IDENTITY_NAMESPACE, or a timestamp taken once per process"""
+    global _run_namespace
+    if _run_namespace is None:
+        _run_namespace = os.getenv('IDENTITY_NAMESPACE') or datetime.now().strftime('%Y%m%d%H%M%S')
+    return _run_namespace
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a precomputed test identity corpus")
+    parser.add_argument('--count', type=int, default=int(os.getenv('IDENTITY_CORPUS_SIZE', 10000)))
+    parser.add_argument('--seed', type=int, default=int(os.getenv('IDENTITY_CORPUS_SEED', 1234)))
+    parser.add_argument('--output', default=os.getenv('IDENTITY_CORPUS', 'data/identities.bin'))
+    args = parser.parse_args()
+    build_corpus(args.output, args.count, args.seed)
+    print(f"Wrote {args.count} identities to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
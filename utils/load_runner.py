@@ -0,0 +1,312 @@
+"""
+Load and throughput benchmark for the Contact List signup and login endpoints.
+
+Closed loop (N virtual users, each sending the next request when the previous one returns):
+
+    python -m utils.load_runner --stub --scenario signup --users 20 --duration 30
+
+Open loop (fixed arrival rate, latency measured from the scheduled start time):
+
+    python -m utils.load_runner --base-url https://thinking-tester-contact-list.herokuapp.com --scenario login --rps 10
+
+Payloads have the same shape as the UI registration test. Users come from a SQLite
+database with a test_users table (--users-db) or from the identity corpus. Results are
+written as JSON to reports/load/.
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from config.api_config import APIClient, APIConfig
+from utils.identity_corpus import IdentityCorpus, build_corpus
+from utils.stub_server import ContactListStub
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+class IdentitySource:
+    """Thread-safe stream of unique users for signups"""
+
+    def __init__(self, users_db=None, corpus_path=None, namespace=None):
+        self.namespace = namespace or datetime.now().strftime('load%Y%m%d%H%M%S')
+        self._lock = threading.Lock()
+        self._index = 0
+        self._rows = None
+        self._corpus = None
+        if users_db:
+            conn = sqlite3.connect(users_db)
+            self._rows = conn.execute(
+                'SELECT first_name, last_name, email, password FROM test_users ORDER BY id'
+            ).fetchall()
+            conn.close()
+            if not self._rows:
+                raise ValueError(f"No rows in test_users of {users_db}")
+        else:
+            corpus_path = corpus_path or os.getenv('IDENTITY_CORPUS', 'data/identities.bin')
+            if not os.path.exists(corpus_path):
+                build_corpus(corpus_path, int(os.getenv('IDENTITY_CORPUS_SIZE', 10000)))
+            self._corpus = IdentityCorpus(corpus_path, namespace=self.namespace)
+
+    def next(self):
+        """Return the next user dict; emails never repeat within a run"""
+        with self._lock:
+            index = self._index
+            self._index += 1
+        if self._corpus is not None:
+            size = len(self._corpus)
+            user = self._corpus[index % size]
+            return user if index < size else self._suffixed(user, index // size)
+        first_name, last_name, email, password = self._rows[index % len(self._rows)]
+        user = {"first_name": first_name, "last_name": last_name, "email": email, "password": password}
+        return self._suffixed(user, f"{self.namespace}.{index}")
+
+    def _suffixed(self, user, suffix):
+        local, _, domain = user["email"].partition("@")
+        return {**user, "email": f"{local}.{suffix}@{domain}"}
+
+
+def registration_payload(user):
+    """Same payload shape the UI registration test sends to POST /users"""
+    return {
+        "firstName": user["first_name"],
+        "lastName": user["last_name"],
+        "email": user["email"],
+        "password": user["password"]
+    }
+
+
+class Scenario:
+    """Builds the request for each iteration; returns (endpoint, expected status, call)"""
+
+    def __init__(self, name, client, identities, login_users=20):
+        self.name = name
+        self.client = client
+        self.identities = identities
+        self._login_users = []
+        self._counter = 0
+        self._lock = threading.Lock()
+        if name in ('login', 'mixed'):
+            self._warm_up(login_users)
+
+    def _warm_up(self, count):
+        """Create the accounts the login scenario logs in with (not measured)"""
+        for _ in range(count):
+            user = self.identities.next()
+            response = self.client.post('/users', json=registration_payload(user))
+            if response.status_code != 201:
+                raise RuntimeError(f"Warm-up signup failed: {response.status_code} {response.text[:200]}")
+            self._login_users.append(user)
+
+    def next_request(self):
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+        if self.name == 'signup' or (self.name == 'mixed' and counter % 2):
+            payload = registration_payload(self.identities.next())
+            return '/users', 201, lambda: self.client.post('/users', json=payload)
+        user = self._login_users[counter % len(self._login_users)]
+        payload = {"email": user["email"], "password": user["password"]}
+        return '/users/login', 200, lambda: self.client.post('/users/login', json=payload)
+
+
+class LoadRunner:
+    """Drives a scenario in closed-loop or open-loop mode and records every request"""
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.results = []
+        self._lock = threading.Lock()
+        self._start = None
+
+    def _execute(self, scheduled_at=None):
+        endpoint, expected, call = self.scenario.next_request()
+        started = time.perf_counter()
+        status, error = None, None
+        try:
+            status = call().status_code
+            if status != expected:
+                error = f"unexpected status {status}"
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+        # Open loop measures from the scheduled start so queueing delay is not hidden
+        begin = scheduled_at if scheduled_at is not None else started
+        with self._lock:
+            self.results.append({
+                "t": round(begin - self._start, 4),
+                "endpoint": endpoint,
+                "status": status,
+                "latency_ms": round((finished - begin) * 1000, 3),
+                "error": error
+            })
+
+    def run_closed_loop(self, users, duration):
+        """users virtual users each send requests back to back for duration seconds"""
+        self._start = time.perf_counter()
+        deadline = self._start + duration
+
+        def user_loop():
+            while time.perf_counter() < deadline:
+                self._execute()
+
+        threads = [threading.Thread(target=user_loop, name=f'vu-{i}') for i in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - self._start
+
+    def run_open_loop(self, rps, duration, max_in_flight=200):
+        """Start rps requests per second for duration seconds, regardless of response times"""
+        self._start = time.perf_counter()
+        total = int(rps * duration)
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='arrival') as executor:
+            for i in range(total):
+                scheduled_at = self._start + i / rps
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._execute, scheduled_at)
+        return time.perf_counter() - self._start
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    # The smallest value with at least p% of the values at or below it
+    rank = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def latency_histogram(latencies):
+    """Request counts per latency bucket; keys are upper bounds in ms"""
+    counts = {f"<={bound}": 0 for bound in LATENCY_BUCKETS_MS}
+    counts[f">{LATENCY_BUCKETS_MS[-1]}"] = 0
+    for latency in latencies:
+        for bound in LATENCY_BUCKETS_MS:
+            if latency <= bound:
+                counts[f"<={bound}"] += 1
+                break
+        else:
+            counts[f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+    return counts
+
+
+def summarize_group(results, elapsed):
+    latencies = sorted(result["latency_ms"] for result in results)
+    errors = sum(1 for result in results if result["error"])
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4) if results else 0,
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None
+        },
+        "latency_histogram": latency_histogram(latencies)
+    }
+
+
+def summarize(results, elapsed):
+    """Overall and per-endpoint statistics plus a per-second throughput timeline"""
+    by_endpoint = {}
+    for result in results:
+        by_endpoint.setdefault(result["endpoint"], []).append(result)
+
+    timeline = {}
+    for result in results:
+        second = timeline.setdefault(int(result["t"]), {"requests": 0, "errors": 0})
+        second["requests"] += 1
+        second["errors"] += 1 if result["error"] else 0
+
+    error_kinds = {}
+    for result in results:
+        if result["error"]:
+            error_kinds[result["error"]] = error_kinds.get(result["error"], 0) + 1
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": summarize_group(results, elapsed),
+        "endpoints": {endpoint: summarize_group(group, elapsed) for endpoint, group in by_endpoint.items()},
+        "throughput_timeline": [{"second": second, **timeline[second]} for second in sorted(timeline)],
+        "error_kinds": error_kinds
+    }
+
+
+def print_summary(summary):
+    print(f"Elapsed: {summary['elapsed_s']} s")
+    for name, stats in [("total", summary["total"])] + list(summary["endpoints"].items()):
+        latency = stats["latency_ms"]
+        print(
+            f"{name:>14}: {stats['requests']} req, {stats['throughput_rps']} req/s, "
+            f"errors {stats['error_rate']:.2%}, p50 {latency['p50']} ms, "
+            f"p95 {latency['p95']} ms, p99 {latency['p99']} ms"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test POST /users and POST /users/login")
+    parser.add_argument('--base-url', default=None, help="target service (default: BASE_URL)")
+    parser.add_argument('--stub', action='store_true', help="start the local stand-in server and target it")
+    parser.add_argument('--scenario', choices=['signup', 'login', 'mixed'], default='signup')
+    parser.add_argument('--users', type=int, default=10, help="closed loop: concurrent virtual users")
+    parser.add_argument('--rps', type=float, default=None, help="open loop: arrival rate (overrides --users)")
+    parser.add_argument('--duration', type=float, default=10, help="seconds")
+    parser.add_argument('--max-in-flight', type=int, default=200, help="open loop: concurrent request cap")
+    parser.add_argument('--login-users', type=int, default=20, help="accounts created for the login scenario")
+    parser.add_argument('--users-db', default=None, help="SQLite file with a test_users table")
+    parser.add_argument('--output-dir', default='reports/load')
+    args = parser.parse_args(argv)
+
+    stub = ContactListStub().start() if args.stub else None
+    base_url = stub.url if stub else (args.base_url or APIConfig.get_base_url())
+    concurrency = args.max_in_flight if args.rps else args.users
+    client = APIClient(base_url=base_url, retries=0, pool_size=concurrency)
+
+    try:
+        identities = IdentitySource(users_db=args.users_db)
+        runner = LoadRunner(Scenario(args.scenario, client, identities, args.login_users))
+        if args.rps:
+            mode = {"type": "open", "rps": args.rps}
+            elapsed = runner.run_open_loop(args.rps, args.duration, args.max_in_flight)
+        else:
+            mode = {"type": "closed", "users": args.users}
+            elapsed = runner.run_closed_loop(args.users, args.duration)
+    finally:
+        client.close()
+        if stub:
+            stub.stop()
+
+    summary = summarize(runner.results, elapsed)
+    summary.update({
+        "base_url": base_url,
+        "scenario": args.scenario,
+        "mode": mode,
+        "duration_s": args.duration,
+        "timestamp": datetime.now().isoformat(timespec='seconds')
+    })
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output = os.path.join(
+        args.output_dir, f"load_{args.scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    with open(output, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print_summary(summary)
+    print(f"Results written to {output}")
+    return summary
+
+
+if __name__ == '__main__':
+    main()
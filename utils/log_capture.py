@@ -0,0 +1,55 @@
+import logging
+import threading
+from collections import deque
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class PhaseLogCapture(logging.Handler):
+    """Keeps the log records emitted since the last drain in a bounded in-memory ring buffer
+
+    The report hook drains the buffer after every test phase, so each report only
+    carries the records of its own phase instead of the whole cumulative log file.
+    """
+
+    def __init__(self, max_records=500, max_chars=20000, level=logging.NOTSET):
+        """
+        :param max_records: records kept per slice; older ones are dropped
+        :param max_chars: size cap of a formatted slice; the head is cut off beyond it
+        """
+        super().__init__(level)
+        self.max_records = max_records
+        self.max_chars = max_chars
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+        self._records = deque(maxlen=max_records)
+        self._dropped = 0
+        self._buffer_lock = threading.Lock()
+
+    def emit(self, record):
+        """Store the record, counting the ones pushed out of the ring buffer"""
+        with self._buffer_lock:
+            if len(self._records) == self.max_records:
+                self._dropped += 1
+            self._records.append(record)
+
+    def drain(self):
+        """
+        Return the records emitted since the previous drain as formatted text and empty the buffer
+        :return: log text, or an empty string if nothing was logged
+        """
+        with self._buffer_lock:
+            records = list(self._records)
+            dropped = self._dropped
+            self._records.clear()
+            self._dropped = 0
+
+        lines = []
+        if dropped:
+            lines.append(f"... {dropped} earlier log records truncated ...")
+        lines.extend(self.format(record) for record in records)
+        text = "\n".join(lines)
+
+        if len(text) > self.max_chars:
+            cut = len(text) - self.max_chars
+            text = f"... {cut} characters truncated ...\n" + text[cut:]
+        return text
@@ -0,0 +1,206 @@
+"""
+Requests the browser itself sent, read from Chrome's performance log.
+
+With NETWORK_CAPTURE=True, WebDriverConfig turns on Chrome performance logging for
+network events. The capture turns the Network.* events of that log into one
+NetworkExchange per request, so a test can assert on the exact request a page
+issued instead of repeating it through the API client:
+
+    capture = get_network_capture(driver)
+    capture.mark()
+    page.submit_form()
+    exchange = capture.wait_for('POST', '/users')
+    assert exchange.request_json['email'] == email
+"""
+import json
+import logging
+import os
+import weakref
+from urllib.parse import urlparse
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger('test_logger')
+
+# Driver -> its NetworkCapture
+_captures = weakref.WeakKeyDictionary()
+
+
+def network_capture_enabled():
+    return os.getenv('NETWORK_CAPTURE', 'True').lower() == 'true'
+
+
+def _json_or_none(body):
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class NetworkExchange:
+    """One request issued by the browser and the response it received"""
+
+    def __init__(self, request_id, url, method, request_headers, request_body, started):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.request_headers = request_headers
+        self.request_body = request_body
+        self.started = started
+        self.finished = None
+        self.status = None
+        self.response_headers = {}
+        self.response_body = None
+        self.resource_type = None
+        self.error = None
+
+    @property
+    def path(self):
+        return urlparse(self.url).path
+
+    @property
+    def complete(self):
+        return self.finished is not None
+
+    @property
+    def duration_ms(self):
+        """Time from sending the request to the last byte of the response (CDP timestamps)"""
+        if self.finished is None:
+            return None
+        return round((self.finished - self.started) * 1000, 1)
+
+    @property
+    def request_json(self):
+        return _json_or_none(self.request_body)
+
+    @property
+    def response_json(self):
+        return _json_or_none(self.response_body)
+
+    def to_dict(self):
+        return {
+            "method": self.method,
+            "url": self.url,
+            "request_body": self.request_json if self.request_json is not None else self.request_body,
+            "status": self.status,
+            "response_body": self.response_json if self.response_json is not None else self.response_body,
+            "duration_ms": self.duration_ms,
+            "error": self.error
+        }
+
+    def __repr__(self):
+        return f"<NetworkExchange {self.method} {self.url} -> {self.status or self.error}>"
+
+
+class NetworkCapture:
+    """Network exchanges of one driver since the last mark()"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._exchanges = {}
+
+    def poll(self):
+        """Read the performance log entries Chrome has buffered since the last poll"""
+        try:
+            entries = self.driver.get_log('performance')
+        except WebDriverException as e:
+            raise RuntimeError(f"Network capture needs Chrome performance logging (NETWORK_CAPTURE=True): {e.msg}")
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message['method'].startswith('Network.'):
+                self._handle(message['method'], message['params'])
+
+    def _handle(self, method, params):
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            request = params['request']
+            # A redirect reuses the request id; the exchange follows it to the final URL
+            self._exchanges[request_id] = NetworkExchange(
+                request_id, request['url'], request['method'], request.get('headers', {}),
+                request.get('postData'), params['timestamp']
+            )
+            self._exchanges[request_id].resource_type = params.get('type')
+            return
+        exchange = self._exchanges.get(request_id)
+        if exchange is None:
+            return
+        if method == 'Network.responseReceived':
+            exchange.status = params['response']['status']
+            exchange.response_headers = params['response'].get('headers', {})
+        elif method == 'Network.loadingFinished':
+            exchange.finished = params['timestamp']
+        elif method == 'Network.loadingFailed':
+            exchange.finished = params['timestamp']
+            exchange.error = params.get('errorText')
+
+    def mark(self):
+        """Forget everything seen so far; later waits only match requests sent after this call"""
+        self.poll()
+        self._exchanges.clear()
+
+    def exchanges(self, method=None, path=None):
+        """
+        Exchanges since the last mark(), oldest first
+        :param path: URL path (/users) or full URL to match
+        """
+        self.poll()
+        return [
+            exchange for exchange in self._exchanges.values()
+            if (method is None or exchange.method == method.upper())
+            and (path is None or path in (exchange.path, exchange.url))
+        ]
+
+    def wait_for(self, method, path, timeout=10):
+        """
+        Wait until the browser has finished a request and return it with its bodies
+        :param path: URL path (/users) or full URL to match
+        :return: NetworkExchange (the first matching one since the last mark())
+        """
+        def finished_exchange(driver):
+            matches = [exchange for exchange in self.exchanges(method, path) if exchange.complete]
+            return matches[0] if matches else False
+
+        try:
+            exchange = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(finished_exchange)
+        except TimeoutException:
+            seen = ', '.join(f"{exchange.method} {exchange.path}" for exchange in self._exchanges.values())
+            raise TimeoutException(f"No {method} {path} request finished after {timeout} seconds (seen: {seen or 'none'})")
+        self._load_bodies(exchange)
+        logger.info(f"Captured {exchange.method} {exchange.url} -> {exchange.status} in {exchange.duration_ms} ms")
+        return exchange
+
+    def _load_bodies(self, exchange):
+        """Fetch bodies that are not part of the log events from the browser"""
+        try:
+            if exchange.request_body is None and exchange.method not in ('GET', 'HEAD'):
+                exchange.request_body = self.driver.execute_cdp_cmd(
+                    'Network.getRequestPostData', {'requestId': exchange.request_id}
+                )['postData']
+        except WebDriverException:
+            pass
+        if exchange.error is None and exchange.response_body is None:
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': exchange.request_id})
+                exchange.response_body = body['body']
+            except WebDriverException as e:
+                logger.warning(f"Response body of {exchange.url} is not available: {e.msg}")
+
+
+def get_network_capture(driver):
+    """The NetworkCapture of a driver, created on first use"""
+    capture = _captures.get(driver)
+    if capture is None:
+        capture = _captures[driver] = NetworkCapture(driver)
+    return capture
+
+
+def discard_network_log(driver):
+    """Drop the buffered log of a driver, e.g. before it serves the next test"""
+    if not network_capture_enabled():
+        return
+    try:
+        get_network_capture(driver).mark()
+    except (RuntimeError, AttributeError, WebDriverException):
+        pass
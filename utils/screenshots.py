@@ -0,0 +1,157 @@
+import hashlib
+import io
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from dotenv import load_dotenv
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, it is only needed for downscaling
+    Image = None
+
+load_dotenv()
+
+logger = logging.getLogger('test_logger')
+
+
+class ScreenshotService:
+    """Grabs screenshots on the test thread and encodes/writes them on a background thread pool
+
+    The test thread only pays for get_screenshot_as_png(). Hashing, deduplication of
+    identical frames, optional downscaling and the disk write run in the background
+    behind a bounded queue: when max_queue screenshots are pending, capture() blocks
+    until one is written, so memory use stays bounded. Call flush() before reading
+    the files (the session fixture does it at session end).
+    """
+
+    def __init__(self, directory='screenshots', max_workers=2, max_queue=32, max_width=None):
+        """
+        :param directory: default output directory
+        :param max_workers: background writer threads
+        :param max_queue: screenshots allowed in flight before capture() blocks
+        :param max_width: downscale wider screenshots to this width (requires Pillow)
+        """
+        self.directory = directory
+        self.max_width = max_width
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='screenshot')
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._pending = set()
+        self._written = {}
+        self._paths = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def capture(self, driver, name, directory=None, filename=None):
+        """
+        Take a screenshot and queue it for writing
+        :param name: short label used in the generated filename
+        :param filename: exact file name to write instead of a generated, collision-free one
+        :return: path the screenshot will be written to
+        """
+        png = driver.get_screenshot_as_png()
+        path = os.path.join(directory or self.directory, filename or self._unique_name(name))
+
+        self._slots.acquire()
+        future = self._executor.submit(self._write, png, path)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return path
+
+    def flush(self, timeout=None):
+        """Block until every queued screenshot is on disk"""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending, timeout=timeout)
+
+    def shutdown(self):
+        """Flush and stop the background threads"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _unique_name(self, name):
+        """Microsecond timestamp plus a per-process sequence number, so names never collide"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        return f"{timestamp}_{next(self._sequence):04d}_{name}.png"
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def _write(self, png, path):
+        """Runs on a background thread: dedupe, downscale and write one screenshot"""
+        try:
+            digest = hashlib.sha1(png).hexdigest()
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+            with self._lock:
+                # The file at this path is about to be replaced, so it can no longer serve as a dedup source
+                replaced = self._paths.pop(path, None)
+                if replaced and self._written.get(replaced) == path:
+                    del self._written[replaced]
+                original = self._written.get(digest)
+
+            if original and os.path.exists(original):
+                # Identical frame: link to the file already written instead of storing it again
+                if os.path.exists(path):
+                    os.remove(path)
+                try:
+                    os.link(original, path)
+                    return
+                except OSError:
+                    pass
+
+            data = self._downscale(png) if self.max_width else png
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._written[digest] = path
+                self._paths[path] = digest
+        except Exception as e:
+            logger.error(f"Failed to write screenshot {path}: {str(e)}")
+
+    def _downscale(self, png):
+        """Shrink the screenshot to max_width, keeping the aspect ratio"""
+        if Image is None:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if image.width <= self.max_width:
+            return png
+        height = round(image.height * self.max_width / image.width)
+        output = io.BytesIO()
+        image.resize((self.max_width, height)).save(output, format='PNG', optimize=True)
+        return output.getvalue()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_screenshot_service():
+    """Return the process-wide screenshot service, configured from the environment"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            max_width = os.getenv('SCREENSHOT_MAX_WIDTH')
+            _service = ScreenshotService(
+                max_workers=int(os.getenv('SCREENSHOT_WORKERS', 2)),
+                max_queue=int(os.getenv('SCREENSHOT_QUEUE_SIZE', 32)),
+                max_width=int(max_width) if max_width else None
+            )
+        return _service
+
+
+def shutdown_screenshot_service():
+    """Write out all pending screenshots and stop the service (session end barrier)"""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.shutdown()
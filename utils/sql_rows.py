@@ -0,0 +1,261 @@
+"""
+Data-driven tests over the rows of a SQLite table.
+
+A test marked `@pytest.mark.sql_rows("test_users")` that takes the `sql_row`
+fixture becomes one test item per row of that table in SQL_ROWS_DB
+(data/registration_users.db by default). Collection streams only the row ids
+through a cursor, CHUNK_SIZE rows at a time, and every item loads its own row
+when it runs, so memory stays flat however large the table is. Under xdist the
+rows are dealt round-robin into one xdist_group per worker.
+
+The outcome of every row is written back to the row_outcomes table of the same
+file, so `--sql-rows=failed` re-runs just the rows that failed last time. The
+file stores emails without a run namespace; tests that register a row add the
+run's namespace (rows_namespace) when they run, so a re-run in a later run
+registers fresh addresses and the source never has to be rebuilt.
+
+Build a source from the identity corpus with `python -m utils.sql_rows --count 5000`.
+"""
+import argparse
+import os
+import re
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from utils.identity_corpus import FIELDS, IdentityCorpus, build_corpus, get_run_namespace, namespaced_email
+from utils.user_database import SCHEMA
+
+# Rows fetched from the cursor per round trip
+CHUNK_SIZE = 500
+# Finished rows buffered before their outcomes are written back
+FLUSH_EVERY = 200
+
+SELECTIONS = ('all', 'failed', 'pending')
+FAILED_OUTCOMES = ('failed', 'error')
+
+OUTCOMES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS row_outcomes (
+        source TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        outcome TEXT NOT NULL,
+        nodeid TEXT,
+        duration REAL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (source, row_id)
+    )
+'''
+
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def rows_namespace():
+    """Email namespace of rows in this run, apart from the per-test and seed identities of the same corpus"""
+    return f"{get_run_namespace()}.rows"
+
+
+def row_email(email):
+    """The address a row's user registers with in this run"""
+    return namespaced_email(email, rows_namespace())
+
+
+def _table(name):
+    # Table names cannot be bound as parameters, so only plain identifiers are accepted
+    if not IDENTIFIER.match(name):
+        raise ValueError(f"Invalid table name: {name!r}")
+    return name
+
+
+def iter_chunks(cursor, chunk_size=CHUNK_SIZE):
+    """Yield the rows of an executed cursor, fetching chunk_size rows at a time"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+class RowSource:
+    """SQLite file with the data tables of data-driven tests and the last outcome of each row"""
+
+    def __init__(self, path=None, chunk_size=None):
+        self.path = path or os.getenv('SQL_ROWS_DB', 'data/registration_users.db')
+        self.chunk_size = chunk_size or int(os.getenv('SQL_ROWS_CHUNK_SIZE', CHUNK_SIZE))
+        self._connection = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _connect(self):
+        if self._connection is None:
+            # xdist workers read rows while the controller writes outcomes
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.row_factory = sqlite3.Row
+        return self._connection
+
+    def prepare(self):
+        """Switch the file to WAL, so readers never wait for outcome writes, and create row_outcomes"""
+        connection = self._connect()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(OUTCOMES_SCHEMA)
+        connection.commit()
+
+    def _has_outcomes(self):
+        return self._connect().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'row_outcomes'"
+        ).fetchone() is not None
+
+    def row_ids(self, table, selection='all', limit=None):
+        """
+        Generator of the row ids of a table, in id order
+        :param selection: 'all', 'failed' (last outcome failed or error) or 'pending' (not passed yet)
+        :param limit: stop after this many rows
+        """
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown row selection: {selection}")
+        if not self.exists():
+            return
+        table = _table(table)
+        query = f'SELECT t.rowid FROM {table} t'
+        params = []
+        if selection != 'all':
+            if not self._has_outcomes():
+                # Nothing has run yet: no row failed, every row is pending
+                if selection == 'failed':
+                    return
+                selection = 'all'
+            elif selection == 'failed':
+                query += ' JOIN row_outcomes o ON o.source = ? AND o.row_id = t.rowid WHERE o.outcome IN (?, ?)'
+                params = [table, *FAILED_OUTCOMES]
+            else:
+                query += (' LEFT JOIN row_outcomes o ON o.source = ? AND o.row_id = t.rowid'
+                          ' WHERE o.outcome IS NULL OR o.outcome != ?')
+                params = [table, 'passed']
+        query += ' ORDER BY t.rowid'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor = self._connect().execute(query, params)
+        try:
+            for (row_id,) in iter_chunks(cursor, self.chunk_size):
+                yield row_id
+        finally:
+            cursor.close()
+
+    def get_row(self, table, row_id):
+        """One row as a dict of its columns"""
+        row = self._connect().execute(
+            f'SELECT * FROM {_table(table)} WHERE rowid = ?', (row_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No row {row_id} in {table} of {self.path}")
+        return dict(row)
+
+    def record(self, outcomes):
+        """
+        Write back row outcomes, replacing the previous outcome of each row
+        :param outcomes: iterable of (table, row_id, outcome, nodeid, duration, updated_at) tuples
+        """
+        connection = self._connect()
+        with connection:
+            connection.executemany('''
+                INSERT OR REPLACE INTO row_outcomes (source, row_id, outcome, nodeid, duration, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', outcomes)
+
+    def outcome_counts(self, table):
+        """Last outcome of the rows of a table: outcome -> number of rows"""
+        if not self._has_outcomes():
+            return {}
+        return dict(self._connect().execute(
+            'SELECT outcome, COUNT(*) FROM row_outcomes WHERE source = ? GROUP BY outcome', (table,)
+        ).fetchall())
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class RowOutcomes:
+    """Folds the phase reports of each row's test into one outcome and writes them back in batches"""
+
+    def __init__(self, source, flush_every=FLUSH_EVERY):
+        self.source = source
+        self.flush_every = flush_every
+        self.counts = Counter()
+        self._running = {}
+        self._finished = []
+
+    def add(self, report):
+        row = dict(report.user_properties).get("sql_row")
+        if row is None:
+            return
+        outcome, duration = self._running.pop(report.nodeid, ("passed", 0.0))
+        if report.failed and outcome not in FAILED_OUTCOMES:
+            outcome = "failed" if report.when == "call" else "error"
+        elif report.skipped and outcome == "passed":
+            outcome = "skipped"
+        duration += report.duration
+        if report.when != "teardown":
+            self._running[report.nodeid] = (outcome, duration)
+            return
+
+        table, row_id = row
+        self._finished.append(
+            (table, row_id, outcome, report.nodeid, duration, datetime.now().isoformat(timespec='seconds'))
+        )
+        self.counts[outcome] += 1
+        if len(self._finished) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._finished:
+            self.source.record(self._finished)
+            self._finished = []
+
+
+def build_source(path, count, corpus):
+    """
+    Write a test_users table of count corpus identities to a new SQLite file
+    Rows are streamed into executemany, nothing is held in memory.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute(SCHEMA)
+            connection.executemany(
+                'INSERT INTO test_users (first_name, last_name, email, password) VALUES (?, ?, ?, ?)',
+                (tuple(corpus[index][field] for field in FIELDS) for index in range(count))
+            )
+    finally:
+        connection.close()
+    RowSource(path).prepare()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite source of the data-driven registration tests")
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--output', default=os.getenv('SQL_ROWS_DB', 'data/registration_users.db'))
+    parser.add_argument('--corpus', default=os.getenv('IDENTITY_CORPUS', 'data/identities.bin'))
+    args = parser.parse_args()
+    if not os.path.exists(args.corpus):
+        build_corpus(
+            args.corpus,
+            count=max(args.count, int(os.getenv('IDENTITY_CORPUS_SIZE', 10000))),
+            seed=int(os.getenv('IDENTITY_CORPUS_SEED', 1234))
+        )
+    # No namespace: tests add this run's one with row_email, so the file can be reused across runs
+    corpus = IdentityCorpus(args.corpus)
+    try:
+        build_source(args.output, args.count, corpus)
+    finally:
+        corpus.close()
+    print(f"Wrote {args.count} users to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
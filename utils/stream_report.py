@@ -0,0 +1,322 @@
+"""
+Streaming test report: one JSON record per test, written the moment the test finishes.
+
+Layout of the report directory (reports/stream by default):
+
+    manifest.json          title, metadata and the shard files of the run
+    index.html             static viewer
+    shard-<worker>.jsonl   one summary line per test; every xdist worker writes its own shard
+    tests/<test>.json      detail of one test (failure text, captured output), loaded on demand
+    artifacts/<test>/...   logs, API payloads and screenshots, linked from the detail
+
+Nothing is kept in memory after a test is written, so report size does not grow with
+run length. The viewer fetches its files, so serve the directory over HTTP:
+
+    python -m http.server --directory reports/stream
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from utils.cassette import mask_headers, mask_secrets
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Test report</title>
+<style>
+body { font-family: sans-serif; margin: 20px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 4px 8px; border-bottom: 1px solid #ddd; vertical-align: top; }
+tr.test { cursor: pointer; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped { color: #f9a825; }
+pre { background: #f6f8fa; padding: 8px; overflow: auto; max-height: 400px; }
+#summary span { margin-right: 16px; }
+img { max-width: 100%; }
+</style>
+</head>
+<body>
+<h1 id="title">Test report</h1>
+<table id="metadata"></table>
+<p id="summary"></p>
+<p>
+    <label>Outcome <select id="outcome"><option value="">all</option><option>failed</option>
+    <option>error</option><option>passed</option><option>skipped</option></select></label>
+    <label>Filter <input id="filter" type="text"></label>
+</p>
+<table>
+    <thead><tr><th>Outcome</th><th>Test</th><th>Duration (s)</th><th>Worker</th><th>Finished</th></tr></thead>
+    <tbody id="results"></tbody>
+</table>
+<script>
+var records = [];
+
+function text(tag, value, className) {
+    var el = document.createElement(tag);
+    el.textContent = value;
+    if (className) el.className = className;
+    return el;
+}
+
+function showDetail(row, record) {
+    var next = row.nextSibling;
+    if (next && next.className === 'detail') {
+        next.remove();
+        return;
+    }
+    var detailRow = document.createElement('tr');
+    detailRow.className = 'detail';
+    var cell = document.createElement('td');
+    cell.colSpan = 5;
+    cell.textContent = 'Loading...';
+    detailRow.appendChild(cell);
+    row.after(detailRow);
+    fetch(record.detail).then(function (response) { return response.json(); }).then(function (detail) {
+        cell.textContent = '';
+        Object.keys(detail.phases).forEach(function (when) {
+            var phase = detail.phases[when];
+            cell.appendChild(text('h4', when + ': ' + phase.outcome + ' (' + phase.duration.toFixed(3) + ' s)'));
+            if (phase.longrepr) cell.appendChild(text('pre', phase.longrepr));
+            phase.sections.forEach(function (section) {
+                cell.appendChild(text('h5', section[0]));
+                cell.appendChild(text('pre', section[1]));
+            });
+        });
+        detail.artifacts.forEach(function (artifact) {
+            var block = document.createElement('div');
+            var link = text('a', artifact.name);
+            link.href = artifact.path;
+            link.target = '_blank';
+            block.appendChild(link);
+            if (/\\.(png|jpg|jpeg)$/.test(artifact.path)) {
+                var img = document.createElement('img');
+                img.loading = 'lazy';
+                img.src = artifact.path;
+                block.appendChild(img);
+            } else {
+                var show = text('button', 'show');
+                show.onclick = function () {
+                    fetch(artifact.path).then(function (r) { return r.text(); }).then(function (body) {
+                        show.replaceWith(text('pre', body));
+                    });
+                };
+                block.appendChild(document.createTextNode(' '));
+                block.appendChild(show);
+            }
+            cell.appendChild(block);
+        });
+    });
+}
+
+function render() {
+    var outcome = document.getElementById('outcome').value;
+    var filter = document.getElementById('filter').value.toLowerCase();
+    var body = document.getElementById('results');
+    body.textContent = '';
+    records.forEach(function (record) {
+        if (outcome && record.outcome !== outcome) return;
+        if (filter && record.nodeid.toLowerCase().indexOf(filter) < 0) return;
+        var row = document.createElement('tr');
+        row.className = 'test';
+        row.appendChild(text('td', record.outcome, record.outcome));
+        row.appendChild(text('td', record.nodeid));
+        row.appendChild(text('td', record.duration.toFixed(3)));
+        row.appendChild(text('td', record.worker));
+        row.appendChild(text('td', record.finished));
+        row.onclick = function () { showDetail(row, record); };
+        body.appendChild(row);
+    });
+    var counts = {};
+    records.forEach(function (record) { counts[record.outcome] = (counts[record.outcome] || 0) + 1; });
+    var summary = document.getElementById('summary');
+    summary.textContent = '';
+    summary.appendChild(text('span', records.length + ' tests'));
+    Object.keys(counts).sort().forEach(function (key) {
+        summary.appendChild(text('span', counts[key] + ' ' + key, key));
+    });
+}
+
+fetch('manifest.json').then(function (response) { return response.json(); }).then(function (manifest) {
+    document.title = manifest.title;
+    document.getElementById('title').textContent = manifest.title;
+    var metadata = document.getElementById('metadata');
+    Object.keys(manifest.metadata).forEach(function (key) {
+        var row = document.createElement('tr');
+        row.appendChild(text('th', key));
+        row.appendChild(text('td', String(manifest.metadata[key])));
+        metadata.appendChild(row);
+    });
+    return Promise.all(manifest.shards.map(function (shard) {
+        return fetch(shard).then(function (response) { return response.ok ? response.text() : ''; });
+    }));
+}).then(function (shards) {
+    shards.forEach(function (shard) {
+        shard.split('\\n').forEach(function (line) {
+            if (line) records.push(JSON.parse(line));
+        });
+    });
+    render();
+});
+document.getElementById('outcome').onchange = render;
+document.getElementById('filter').oninput = render;
+</script>
+</body>
+</html>
+"""
+
+
+def slugify_nodeid(nodeid):
+    """File-system safe, collision-free name for a test"""
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', nodeid).strip('_')[:100]
+    return f"{name}-{hashlib.sha1(nodeid.encode()).hexdigest()[:8]}"
+
+
+def api_payload(response):
+    """Request and response of a requests.Response as a JSON-serializable dict, with secrets masked"""
+    request = response.request
+    body = request.body.decode('utf-8', 'replace') if isinstance(request.body, bytes) else request.body
+    try:
+        body = mask_secrets(json.loads(body)) if body else body
+    except ValueError:
+        pass
+    try:
+        response_body = mask_secrets(response.json())
+    except ValueError:
+        response_body = response.text
+    return {
+        "request": {
+            "method": request.method,
+            "url": request.url,
+            "headers": mask_headers(request.headers),
+            "body": body
+        },
+        "response": {
+            "status_code": response.status_code,
+            "headers": mask_headers(response.headers),
+            "body": response_body,
+            "elapsed_ms": round(response.elapsed.total_seconds() * 1000, 3)
+        }
+    }
+
+
+class StreamingReporter:
+    """Writes test records and artifacts of one process to the report directory"""
+
+    def __init__(self, directory='reports/stream', worker_id='master', write_records=True):
+        """
+        :param worker_id: shard name (the xdist worker id, or master)
+        :param write_records: False on the xdist controller, whose workers write the records
+        """
+        self.directory = directory
+        self.worker_id = worker_id
+        self.write_records = write_records
+        self._phases = {}
+        self._artifacts = {}
+        self._shard = None
+        self._lock = threading.Lock()
+
+    def start(self, title, metadata, workers):
+        """Reset the directory and write the viewer and the manifest (controller only)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, 'index.html'), 'w') as f:
+            f.write(VIEWER_HTML)
+        self._manifest = {
+            "title": title,
+            "metadata": metadata,
+            "started": datetime.now().isoformat(timespec='seconds'),
+            "finished": None,
+            "shards": [f"shard-{worker}.jsonl" for worker in workers]
+        }
+        self._write_json('manifest.json', self._manifest)
+
+    def finish(self, exitstatus):
+        """Mark the run as finished in the manifest (controller only)"""
+        self._manifest["finished"] = datetime.now().isoformat(timespec='seconds')
+        self._manifest["exitstatus"] = int(exitstatus)
+        self._write_json('manifest.json', self._manifest)
+
+    def _write_json(self, relative_path, data):
+        path = os.path.join(self.directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1, default=str)
+
+    def add_artifact(self, nodeid, name, content, extension='txt'):
+        """
+        Store text or bytes as a file linked from the test's record
+        :return: absolute path of the file
+        """
+        filename = f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}.{extension}"
+        relative_path = os.path.join('artifacts', slugify_nodeid(nodeid), filename)
+        path = os.path.join(self.directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(content, (dict, list)):
+            content = json.dumps(content, indent=2, default=str)
+        with open(path, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+        self._link(nodeid, name, relative_path)
+        return os.path.abspath(path)
+
+    def add_file(self, nodeid, name, source_path):
+        """Copy an existing file (e.g. a screenshot) into the test's artifacts"""
+        extension = os.path.splitext(source_path)[1].lstrip('.') or 'bin'
+        with open(source_path, 'rb') as f:
+            return self.add_artifact(nodeid, name, f.read(), extension)
+
+    def _link(self, nodeid, name, relative_path):
+        with self._lock:
+            self._artifacts.setdefault(nodeid, []).append({"name": name, "path": relative_path})
+
+    def add_report(self, report):
+        """Collect one phase report; the test's record is written after its teardown"""
+        if not self.write_records:
+            return
+        phases = self._phases.setdefault(report.nodeid, {})
+        phases[report.when] = {
+            "outcome": report.outcome,
+            "duration": report.duration,
+            "longrepr": str(report.longrepr) if report.longrepr else None,
+            "sections": [list(section) for section in report.sections]
+        }
+        if report.when == "teardown":
+            self._write_record(report.nodeid, report.location, self._phases.pop(report.nodeid))
+
+    def _outcome(self, phases):
+        if phases.get("setup", {}).get("outcome") == "failed" or phases["teardown"]["outcome"] == "failed":
+            return "error"
+        for when in ("setup", "call"):
+            if phases.get(when, {}).get("outcome") in ("failed", "skipped"):
+                return phases[when]["outcome"]
+        return "passed"
+
+    def _write_record(self, nodeid, location, phases):
+        with self._lock:
+            artifacts = self._artifacts.pop(nodeid, [])
+        detail_path = os.path.join('tests', f"{slugify_nodeid(nodeid)}.json")
+        self._write_json(detail_path, {"nodeid": nodeid, "phases": phases, "artifacts": artifacts})
+
+        record = {
+            "nodeid": nodeid,
+            "outcome": self._outcome(phases),
+            "duration": round(sum(phase["duration"] for phase in phases.values()), 4),
+            "worker": self.worker_id,
+            "finished": datetime.now().isoformat(timespec='seconds'),
+            "location": list(location),
+            "artifacts": len(artifacts),
+            "detail": detail_path
+        }
+        if self._shard is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._shard = open(os.path.join(self.directory, f"shard-{self.worker_id}.jsonl"), 'a')
+        self._shard.write(json.dumps(record) + "\n")
+        self._shard.flush()
+
+    def close(self):
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
@@ -0,0 +1,175 @@
+"""
+HTML pages served by the local Contact List stand-in.
+
+Element IDs and messages match the real app, so the page objects work unchanged.
+"""
+
+LAYOUT = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<header><h1>{title}</h1></header>
+<div class="main-content">
+{content}
+</div>
+<script>
+function getToken() {{
+    var match = document.cookie.match(/(?:^|;\\s*)token=([^;]*)/);
+    return match ? match[1] : null;
+}}
+function setToken(token) {{
+    document.cookie = 'token=' + token + '; path=/';
+}}
+function showError(message) {{
+    document.getElementById('error').textContent = message;
+}}
+{script}
+</script>
+</body>
+</html>
+"""
+
+LOGIN_CONTENT = """
+<p>Log In:</p>
+<form id="add-user">
+    <p><input id="email" type="text" placeholder="Email"></p>
+    <p><input id="password" type="password" placeholder="Password"></p>
+    <p><span id="error"></span></p>
+    <button id="submit" type="submit">Submit</button>
+</form>
+<p>Not yet a user? Click here to sign up!</p>
+<button id="signup" type="button">Sign up</button>
+"""
+
+LOGIN_SCRIPT = """
+document.getElementById('add-user').addEventListener('submit', function (event) {
+    event.preventDefault();
+    fetch('/users/login', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            email: document.getElementById('email').value,
+            password: document.getElementById('password').value
+        })
+    }).then(function (response) {
+        if (response.status !== 200) {
+            showError('Incorrect username or password');
+            return;
+        }
+        return response.json().then(function (body) {
+            setToken(body.token);
+            location.assign('/contactList');
+        });
+    });
+});
+document.getElementById('signup').addEventListener('click', function () {
+    location.assign('/addUser');
+});
+"""
+
+ADD_USER_CONTENT = """
+<p>Sign up to begin adding your contacts!</p>
+<form id="add-user">
+    <p><input id="firstName" type="text" placeholder="First Name"></p>
+    <p><input id="lastName" type="text" placeholder="Last Name"></p>
+    <p><input id="email" type="text" placeholder="Email"></p>
+    <p><input id="password" type="password" placeholder="Password"></p>
+    <p><span id="error"></span></p>
+    <button id="submit" type="submit">Submit</button>
+    <button id="cancel" type="button">Cancel</button>
+</form>
+"""
+
+ADD_USER_SCRIPT = """
+document.getElementById('add-user').addEventListener('submit', function (event) {
+    event.preventDefault();
+    fetch('/users', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            firstName: document.getElementById('firstName').value,
+            lastName: document.getElementById('lastName').value,
+            email: document.getElementById('email').value,
+            password: document.getElementById('password').value
+        })
+    }).then(function (response) {
+        return response.json().then(function (body) {
+            if (response.status === 201) {
+                setToken(body.token);
+                location.assign('/contactList');
+            } else {
+                showError(body.message);
+            }
+        });
+    });
+});
+document.getElementById('cancel').addEventListener('click', function () {
+    location.assign('/');
+});
+"""
+
+CONTACT_LIST_CONTENT = """
+<button id="logout" type="button">Logout</button>
+<p>Click on any contact to view the Contact Details</p>
+<button id="add-contact" type="button">Add a New Contact</button>
+<table id="myTable" class="contactTable">
+    <tr>
+        <th>Name</th><th>Birthdate</th><th>Email</th><th>Phone</th>
+        <th>Address</th><th>City, State/Province, Postal Code</th><th>Country</th>
+    </tr>
+</table>
+"""
+
+CONTACT_LIST_SCRIPT = """
+function authHeaders() {
+    return {'Authorization': 'Bearer ' + getToken(), 'Content-Type': 'application/json'};
+}
+fetch('/contacts', {headers: authHeaders()}).then(function (response) {
+    if (response.status === 401) {
+        location.assign('/');
+        return;
+    }
+    return response.json().then(function (contacts) {
+        var table = document.getElementById('myTable');
+        contacts.forEach(function (contact) {
+            var row = table.insertRow(-1);
+            row.className = 'contactTableBodyRow';
+            [
+                contact.firstName + ' ' + contact.lastName,
+                contact.birthdate || '',
+                contact.email || '',
+                contact.phone || '',
+                [contact.street1, contact.street2].filter(Boolean).join(' '),
+                [contact.city, contact.stateProvince, contact.postalCode].filter(Boolean).join(' '),
+                contact.country || ''
+            ].forEach(function (text) {
+                row.insertCell(-1).textContent = text;
+            });
+        });
+    });
+});
+document.getElementById('logout').addEventListener('click', function () {
+    fetch('/users/logout', {method: 'POST', headers: authHeaders()}).then(function () {
+        document.cookie = 'token=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT';
+        location.assign('/');
+    });
+});
+document.getElementById('add-contact').addEventListener('click', function () {
+    location.assign('/addContact');
+});
+"""
+
+
+def render(title, content, script):
+    return LAYOUT.format(title=title, content=content, script=script).encode()
+
+
+PAGES = {
+    '/': render('Contact List App', LOGIN_CONTENT, LOGIN_SCRIPT),
+    '/login': render('Contact List App', LOGIN_CONTENT, LOGIN_SCRIPT),
+    '/addUser': render('Add User', ADD_USER_CONTENT, ADD_USER_SCRIPT),
+    '/contactList': render('Contact List', CONTACT_LIST_CONTENT, CONTACT_LIST_SCRIPT),
+}
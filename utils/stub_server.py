@@ -0,0 +1,438 @@
+"""
+Local stand-in for the Contact List app.
+
+Serves the login, add user and contact list pages with the real element IDs and
+implements the user and contact endpoints with the same validation rules and error
+messages as the real app, keeping all data in memory. Start it standalone with:
+
+    python -m utils.stub_server --port 8080
+"""
+import argparse
+import json
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.stub_pages import PAGES
+
+EMAIL_PATTERN = re.compile(r"^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+@[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)+$")
+PHONE_PATTERN = re.compile(r"^[0-9]{1,15}$")
+BIRTHDATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+CONTACT_FIELDS = (
+    "firstName", "lastName", "birthdate", "email", "phone", "street1", "street2",
+    "city", "stateProvince", "postalCode", "country"
+)
+
+
+def _validator_error(path, value, kind, message):
+    return {
+        "name": "ValidatorError",
+        "message": message,
+        "properties": {"message": message, "type": kind, "path": path, "value": value},
+        "kind": kind,
+        "path": path,
+        "value": value
+    }
+
+
+def _cast_error(path, value):
+    return {
+        "stringValue": json.dumps(value),
+        "valueType": type(value).__name__,
+        "kind": "string",
+        "value": value,
+        "path": path,
+        "reason": None,
+        "name": "CastError",
+        "message": f"Cast to string failed for value {json.dumps(value)} (type {type(value).__name__}) at path \"{path}\""
+    }
+
+
+def _check_string(errors, data, path, minlength=None, maxlength=None):
+    """Mongoose-style checks for a trimmed, required string field"""
+    value = data.get(path)
+    if value is not None and not isinstance(value, (str, int, float)):
+        errors[path] = _cast_error(path, value)
+        return None
+    value = "" if value is None else str(value).strip()
+    if not value:
+        errors[path] = _validator_error(path, value, "required", f"Path `{path}` is required.")
+    elif maxlength and len(value) > maxlength:
+        errors[path] = _validator_error(
+            path, value, "maxlength",
+            f"Path `{path}` (`{value}`) is longer than the maximum allowed length ({maxlength})."
+        )
+    elif minlength and len(value) < minlength:
+        errors[path] = _validator_error(
+            path, value, "minlength",
+            f"Path `{path}` (`{value}`) is shorter than the minimum allowed length ({minlength})."
+        )
+    return value
+
+
+def validate_user(data, name="User"):
+    """
+    Validate a user payload the way the real app does
+    :return: (cleaned user dict, error response body or None)
+    """
+    errors = {}
+    first_name = _check_string(errors, data, "firstName", maxlength=20)
+    last_name = _check_string(errors, data, "lastName", maxlength=20)
+
+    email = data.get("email")
+    email = str(email).strip().lower() if isinstance(email, str) else ""
+    if not EMAIL_PATTERN.match(email) or len(email) > 254 or len(email.split("@")[0]) > 64:
+        errors["email"] = _validator_error("email", email, "user defined", "Email is invalid")
+
+    password = _check_string(errors, data, "password", minlength=7, maxlength=100)
+
+    if errors:
+        return None, _validation_failed(name, errors)
+    return {"firstName": first_name, "lastName": last_name, "email": email, "password": password}, None
+
+
+def _validation_failed(name, errors):
+    details = ", ".join(f"{path}: {error['message']}" for path, error in errors.items())
+    return {
+        "errors": errors,
+        "_message": f"{name} validation failed",
+        "message": f"{name} validation failed: {details}"
+    }
+
+
+def validate_contact(data, partial=False):
+    """
+    Validate a contact payload the way the real app does
+    :param partial: PATCH semantics, only the given fields are checked
+    :return: (cleaned contact dict, error response body or None)
+    """
+    errors = {}
+    contact = {}
+    for path in ("firstName", "lastName"):
+        if not partial or path in data:
+            contact[path] = _check_string(errors, data, path, maxlength=20)
+
+    optional = {
+        "birthdate": (BIRTHDATE_PATTERN.match, "Birthdate is invalid"),
+        "email": (lambda value: EMAIL_PATTERN.match(value) and len(value) <= 254, "Email is invalid"),
+        "phone": (PHONE_PATTERN.match, "Phone number is invalid"),
+        "postalCode": (lambda value: len(value) <= 10, "Postal code is invalid"),
+    }
+    for path in CONTACT_FIELDS[2:]:
+        if path not in data or data[path] in (None, ""):
+            continue
+        value = str(data[path]).strip()
+        if path == "email":
+            value = value.lower()
+        check, message = optional.get(path, (lambda value: len(value) <= 40, f"Path `{path}` is invalid"))
+        if not check(value):
+            errors[path] = _validator_error(path, value, "user defined", message)
+        contact[path] = value
+
+    if errors:
+        return None, _validation_failed("Contact", errors)
+    return contact, None
+
+
+class ContactListState:
+    """In-memory users and tokens, shared by all request threads"""
+
+    def __init__(self):
+        self.users = {}
+        self.tokens = {}
+        self.contacts = {}
+        self.lock = threading.Lock()
+
+    def public_user(self, user):
+        return {key: value for key, value in user.items() if key != "password"}
+
+    def issue_token(self, email):
+        token = secrets.token_hex(32)
+        self.tokens[token] = email
+        return token
+
+
+class ContactListHandler(BaseHTTPRequestHandler):
+    """Routes requests to handler methods through the ROUTES table"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real server
+    # Send headers and body as one segment; split writes hit the 40 ms delayed-ACK stall
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    ROUTES = {
+        ('POST', '/users'): 'add_user',
+        ('POST', '/users/login'): 'login',
+        ('POST', '/users/logout'): 'logout',
+        ('GET', '/users/me'): 'get_me',
+        ('GET', '/contacts'): 'list_contacts',
+        ('POST', '/contacts'): 'add_contact',
+        ('GET', '/favicon.ico'): 'favicon',
+    }
+    # Routes with a trailing /<id> segment
+    ITEM_ROUTES = {
+        ('GET', '/contacts'): 'get_contact',
+        ('PUT', '/contacts'): 'update_contact',
+        ('PATCH', '/contacts'): 'patch_contact',
+        ('DELETE', '/contacts'): 'delete_contact',
+    }
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        # Silence the default per-request stderr logging
+        pass
+
+    def _dispatch(self, method):
+        self._body = None
+        try:
+            self._route(method)
+        finally:
+            # A handler that answers early (e.g. 401) leaves the body unread; on a keep-alive
+            # connection it would be parsed as the next request
+            self.read_body()
+
+    def _route(self, method):
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        if method == 'GET' and path in PAGES:
+            self.send_body(200, PAGES[path], content_type='text/html; charset=utf-8')
+            return
+        handler = self.ROUTES.get((method, path))
+        if handler is not None:
+            getattr(self, handler)()
+            return
+        collection, _, item_id = path.rpartition('/')
+        handler = self.ITEM_ROUTES.get((method, collection))
+        if handler is not None:
+            getattr(self, handler)(item_id)
+            return
+        self.send_json(404, {"error": "Not found"})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def read_body(self):
+        """The request body, read from the connection once"""
+        if self._body is None:
+            length = int(self.headers.get('Content-Length') or 0)
+            self._body = self.rfile.read(length) if length else b''
+        return self._body
+
+    def read_json(self):
+        body = self.read_body()
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def send_body(self, status, body=b'', content_type='application/json; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_json(self, status, data=None):
+        self.send_body(status, b'' if data is None else json.dumps(data).encode())
+
+    def current_token(self):
+        """Token sent as a Bearer Authorization header or as the token cookie"""
+        auth = self.headers.get('Authorization', '')
+        if auth.startswith('Bearer '):
+            return auth[len('Bearer '):]
+        for cookie in self.headers.get('Cookie', '').split(';'):
+            name, _, value = cookie.strip().partition('=')
+            if name == 'token':
+                return value
+        return None
+
+    def current_email(self):
+        """Email of the authenticated user, or None"""
+        with self.state.lock:
+            return self.state.tokens.get(self.current_token())
+
+    def require_user(self):
+        email = self.current_email()
+        if email is None:
+            self.send_json(401, {"error": "Please authenticate."})
+        return email
+
+    def add_user(self):
+        user, error = validate_user(self.read_json())
+        if error:
+            self.send_json(400, error)
+            return
+        with self.state.lock:
+            duplicate = user["email"] in self.state.users
+            if not duplicate:
+                user = {"_id": secrets.token_hex(12), **user, "__v": 1}
+                self.state.users[user["email"]] = user
+                body = {"user": self.state.public_user(user), "token": self.state.issue_token(user["email"])}
+        if duplicate:
+            self.send_json(400, {"message": "Email address is already in use"})
+            return
+        self.send_json(201, body)
+
+    def login(self):
+        data = self.read_json()
+        email = str(data.get("email", "")).strip().lower()
+        with self.state.lock:
+            user = self.state.users.get(email)
+            if user is None or user["password"] != data.get("password"):
+                user = None
+            else:
+                body = {"user": self.state.public_user(user), "token": self.state.issue_token(email)}
+        if user is None:
+            self.send_json(401)
+            return
+        self.send_json(200, body)
+
+    def logout(self):
+        if self.require_user() is None:
+            return
+        with self.state.lock:
+            self.state.tokens.pop(self.current_token(), None)
+        self.send_json(200)
+
+    def get_me(self):
+        email = self.require_user()
+        if email is None:
+            return
+        with self.state.lock:
+            body = self.state.public_user(self.state.users[email])
+        self.send_json(200, body)
+
+    def favicon(self):
+        self.send_body(204, content_type='image/x-icon')
+
+    def list_contacts(self):
+        email = self.require_user()
+        if email is None:
+            return
+        with self.state.lock:
+            body = [contact for contact in self.state.contacts.values() if contact["owner"] == email]
+        self.send_json(200, body)
+
+    def add_contact(self):
+        email = self.require_user()
+        if email is None:
+            return
+        contact, error = validate_contact(self.read_json())
+        if error:
+            self.send_json(400, error)
+            return
+        contact = {"_id": secrets.token_hex(12), **contact, "owner": email, "__v": 0}
+        with self.state.lock:
+            self.state.contacts[contact["_id"]] = contact
+        self.send_json(201, contact)
+
+    def _owned_contact(self, contact_id):
+        """Return the contact if it belongs to the authenticated user, sending the error response otherwise"""
+        email = self.require_user()
+        if email is None:
+            return None
+        with self.state.lock:
+            contact = self.state.contacts.get(contact_id)
+        if contact is None or contact["owner"] != email:
+            self.send_json(404)
+            return None
+        return contact
+
+    def get_contact(self, contact_id):
+        contact = self._owned_contact(contact_id)
+        if contact is not None:
+            self.send_json(200, contact)
+
+    def update_contact(self, contact_id, partial=False):
+        contact = self._owned_contact(contact_id)
+        if contact is None:
+            return
+        changes, error = validate_contact(self.read_json(), partial=partial)
+        if error:
+            self.send_json(400, error)
+            return
+        if partial:
+            updated = {**contact, **changes}
+        else:
+            updated = {key: contact[key] for key in ("_id", "owner", "__v")}
+            updated.update(changes)
+        with self.state.lock:
+            self.state.contacts[contact_id] = updated
+        self.send_json(200, updated)
+
+    def patch_contact(self, contact_id):
+        self.update_contact(contact_id, partial=True)
+
+    def delete_contact(self, contact_id):
+        if self._owned_contact(contact_id) is None:
+            return
+        with self.state.lock:
+            self.state.contacts.pop(contact_id, None)
+        self.send_body(200, b'Contact deleted', content_type='text/html; charset=utf-8')
+
+
+class ContactListStub:
+    """Runs the stand-in server on a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0, handler=ContactListHandler):
+        """
+        :param port: 0 picks a free port
+        """
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.server.state = ContactListState()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='contact-list-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Contact List stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    stub = ContactListStub(args.host, args.port)
+    print(f"Contact List stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
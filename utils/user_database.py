@@ -0,0 +1,127 @@
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+logger = logging.getLogger('test_logger')
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS test_users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+class UserDatabase:
+    """SQLite database with the test_users schema and seed data, built once per session
+
+    Two storage modes are supported:
+    - memory: shared-cache in-memory database, kept alive by a keeper connection
+    - wal: on-disk database in WAL journal mode (inspectable after the run)
+    Every test gets its own connection wrapped in a SAVEPOINT that is rolled back
+    on teardown, so tests never see each other's writes. Tests must not call
+    commit() on that connection, it would release the savepoint.
+    """
+
+    def __init__(self, mode='memory', path='test_users.db', name='test_users'):
+        self.mode = mode
+        self.path = path
+        if mode == 'memory':
+            self.uri = f"file:{name}?mode=memory&cache=shared"
+        elif mode == 'wal':
+            self.uri = f"file:{path}"
+        else:
+            raise ValueError(f"Unknown test database mode: {mode}")
+        self._keeper = None
+
+    def create(self, rows):
+        """
+        Create the schema and insert the seed rows
+        :param rows: iterable of (first_name, last_name, email, password) tuples
+        """
+        if self.mode == 'wal' and os.path.exists(self.path):
+            os.remove(self.path)
+        self._keeper = self.connect()
+        if self.mode == 'wal':
+            self._keeper.execute("PRAGMA journal_mode=WAL")
+        self._keeper.execute(SCHEMA)
+        self._keeper.executemany('''
+            INSERT INTO test_users (first_name, last_name, email, password)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        self._keeper.commit()
+        return self
+
+    def connect(self):
+        """Open a new connection to the database"""
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+
+    def open_savepoint(self, name='test_case'):
+        """
+        Open a connection inside a savepoint
+        :return: connection; pass it to rollback() when the test is done
+        """
+        conn = self.connect()
+        conn.isolation_level = None  # transactions are controlled explicitly below
+        conn.execute(f"SAVEPOINT {name}")
+        return conn
+
+    def rollback(self, conn, name='test_case'):
+        """Undo everything done on a savepoint connection and close it"""
+        try:
+            if conn.in_transaction:
+                conn.execute(f"ROLLBACK TO {name}")
+                conn.execute(f"RELEASE {name}")
+        finally:
+            conn.close()
+
+    def close(self):
+        """Drop the database"""
+        if self._keeper is not None:
+            self._keeper.close()
+            self._keeper = None
+        if self.mode == 'wal':
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+            logger.info("Database file cleaned up")
+
+
+def generate_seed_users(count=5, faker=None):
+    """Generate Faker users with emails that are unique for this run"""
+    from faker import Faker
+    fake = faker or Faker()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return [
+        (
+            fake.first_name(),
+            fake.last_name(),
+            f"{fake.user_name()}_{timestamp}_{i}@example.com",  # Add timestamp and index to email
+            fake.password(length=10)
+        )
+        for i in range(count)
+    ]
+
+
+def log_table_summary(conn):
+    """Log the test_users structure, row count and sample rows (debug aid)"""
+    cursor = conn.cursor()
+    logger.info("Verifying SQL table creation and data...")
+
+    cursor.execute("PRAGMA table_info(test_users)")
+    logger.info("Table structure:")
+    for col in cursor.fetchall():
+        logger.info(f"Column: {col[1]}, Type: {col[2]}, NotNull: {col[3]}, Default: {col[4]}")
+
+    cursor.execute("SELECT COUNT(*) FROM test_users")
+    logger.info(f"Number of rows in table: {cursor.fetchone()[0]}")
+
+    cursor.execute("SELECT * FROM test_users LIMIT 3")
+    logger.info("Sample data:")
+    for row in cursor.fetchall():
+        logger.info(f"ID: {row[0]}, Name: {row[1]} {row[2]}, Email: {row[3]}, Created: {row[5]}")
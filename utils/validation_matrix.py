@@ -0,0 +1,116 @@
+import contextvars
+import itertools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# payload: request body; expected_errors: keys expected in the response's "errors" object
+ValidationCase = namedtuple('ValidationCase', ['id', 'payload', 'expected_errors'])
+
+MISSING = object()
+
+# Invalid values per field, keyed by the kind of mistake. Each case breaks exactly one field.
+INVALID_VALUES = {
+    "firstName": {
+        "missing": MISSING,
+        "empty": "",
+        "blank": "   ",
+        "malformed": {"$gt": ""},
+        "oversized": "F" * 21,
+    },
+    "lastName": {
+        "missing": MISSING,
+        "empty": "",
+        "blank": "   ",
+        "malformed": {"$gt": ""},
+        "oversized": "L" * 21,
+    },
+    "email": {
+        "missing": MISSING,
+        "empty": "",
+        "malformed": "not-an-email",
+        "no_domain": "user@",
+        "oversized": f"{'e' * 300}@example.com",
+    },
+    "password": {
+        "missing": MISSING,
+        "empty": "",
+        "malformed": "short",
+        "oversized": "P" * 101,
+    },
+}
+
+
+def valid_payload(case_id, namespace):
+    """A payload that passes validation; the email is unique per case and per run"""
+    return {
+        "firstName": "Matrix",
+        "lastName": "Case",
+        "email": f"matrix.{case_id}.{namespace}@example.com".lower(),
+        "password": "Valid123!"
+    }
+
+
+def build_validation_matrix(namespace='run'):
+    """
+    Generate one case per field and kind of invalid value
+    :param namespace: suffix for the otherwise valid emails, so reruns do not collide
+    :return: list of ValidationCase
+    """
+    cases = []
+    for field, variants in INVALID_VALUES.items():
+        for kind, value in variants.items():
+            case_id = f"{field}-{kind}"
+            payload = valid_payload(case_id, namespace)
+            if value is MISSING:
+                del payload[field]
+            else:
+                payload[field] = value
+            cases.append(ValidationCase(case_id, payload, {field}))
+
+    # Two broken fields at once must report both
+    for first, second in itertools.combinations(INVALID_VALUES, 2):
+        case_id = f"{first}+{second}-empty"
+        payload = valid_payload(case_id, namespace)
+        payload[first] = ""
+        payload[second] = ""
+        cases.append(ValidationCase(case_id, payload, {first, second}))
+    return cases
+
+
+class ValidationMatrixRunner:
+    """Fires all cases at POST /users concurrently over a bounded thread pool
+
+    Results are futures keyed by case id, so each pytest item only waits for its
+    own response while the whole matrix runs in parallel in the background.
+    The requests keep running while pytest rewrites os.environ between tests, so
+    the runner needs a client of its own built with trust_env=False, not the
+    process-wide get_api_client() one.
+    """
+
+    def __init__(self, client, max_workers=8):
+        """
+        :param client: APIClient used only by this runner, with trust_env=False
+        """
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='validation')
+        self._futures = {}
+
+    def submit(self, cases, context_for=None):
+        """
+        Start sending every case
+        :param context_for: case -> contextvars.Context its request runs in (default: a copy of the caller's)
+        """
+        for case in cases:
+            context = context_for(case) if context_for else contextvars.copy_context()
+            self._futures[case.id] = self._executor.submit(
+                context.run, self.client.post, '/users', json=case.payload
+            )
+        return self
+
+    def result(self, case_id, timeout=None):
+        """Wait for the response of one case"""
+        return self._futures[case_id].result(timeout=timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.client.close()
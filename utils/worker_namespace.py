@@ -0,0 +1,94 @@
+"""
+Per-worker namespacing of files and directories for pytest-xdist runs.
+
+Outside xdist every helper returns its input unchanged, so a plain pytest run keeps
+writing to the usual paths. Under xdist each worker gets its own database file, log
+file and artifact directories; the controller merges them back at session end.
+"""
+import glob
+import heapq
+import os
+import re
+import shutil
+
+# A log record starts with the asctime of LOG_FORMAT; other lines continue the previous record
+RECORD_START = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ')
+
+
+def get_worker_id():
+    """xdist worker id (gw0, gw1, ...), or master outside xdist"""
+    return os.getenv('PYTEST_XDIST_WORKER', 'master')
+
+
+def is_xdist_worker():
+    return 'PYTEST_XDIST_WORKER' in os.environ
+
+
+def base_nodeid(nodeid):
+    """Node id without the "@group" suffix xdist adds to xdist_group tests under --dist loadgroup"""
+    if nodeid.rfind('@') > nodeid.rfind(']'):
+        return nodeid.rpartition('@')[0]
+    return nodeid
+
+
+def worker_file(path):
+    """reports/test.log -> reports/test.gw0.log on worker gw0"""
+    if not is_xdist_worker():
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{get_worker_id()}{extension}"
+
+
+def worker_dir(path):
+    """screenshots -> screenshots/gw0 on worker gw0"""
+    if not is_xdist_worker():
+        return path
+    return os.path.join(path, get_worker_id())
+
+
+def _records(path):
+    """Yield (timestamp, text) per log record of a file"""
+    record = []
+    with open(path) as f:
+        for line in f:
+            if RECORD_START.match(line) and record:
+                yield record[0][:23], ''.join(record)
+                record = []
+            record.append(line)
+    if record:
+        yield record[0][:23], ''.join(record)
+
+
+def merge_worker_files(path):
+    """
+    Append the worker copies of a log file to it in timestamp order and delete them
+    :return: list of merged worker files
+    """
+    root, extension = os.path.splitext(path)
+    sources = sorted(glob.glob(f"{root}.gw*{extension}"))
+    if not sources:
+        return []
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as target:
+        for _, text in heapq.merge(*(_records(source) for source in sources), key=lambda record: record[0]):
+            target.write(text)
+    for source in sources:
+        os.remove(source)
+    return sources
+
+
+def merge_worker_dirs(path):
+    """
+    Move the files of every worker directory into the base directory, prefixed with the worker id
+    :return: number of files moved
+    """
+    moved = 0
+    for directory in sorted(glob.glob(os.path.join(path, 'gw*'))):
+        if not os.path.isdir(directory):
+            continue
+        worker_id = os.path.basename(directory)
+        for name in os.listdir(directory):
+            os.replace(os.path.join(directory, name), os.path.join(path, f"{worker_id}_{name}"))
+            moved += 1
+        shutil.rmtree(directory, ignore_errors=True)
+    return moved